@@ -0,0 +1,124 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from intent_router import classify
+
+# ✅ 챗봇 답변 캐시 (정규화한 질문 → 답변), LRU + TTL
+MAX_ENTRIES = 256
+TTL = 24 * 3600
+
+# 기본은 정확히 같은 질문만 재사용 (안전 질문은 "발생 시"/"발생 후"처럼 한두 글자 차이로 답이 달라짐)
+SIMILARITY_THRESHOLD = None
+# 유사 질문을 허용할 때 쓸 수 있는 가장 낮은 문자 2-gram 자카드 유사도 (의도도 같아야 함)
+MIN_SIMILARITY = 0.9
+
+_entries = OrderedDict()
+_stats = {"hits": 0, "similar_hits": 0, "misses": 0, "evictions": 0}
+_lock = threading.Lock()
+_prewarm_thread = None
+
+
+def normalize(question):
+    """공백·문장부호·대소문자 차이를 없앤 질문 키"""
+    return re.sub(r"[\W_]+", "", question).lower()
+
+
+def _ngrams(key, n=2):
+    return {key[i:i + n] for i in range(max(len(key) - n + 1, 1))}
+
+
+def similarity(a, b):
+    """두 질문 키의 문자 2-gram 자카드 유사도 (0~1)"""
+    grams_a, grams_b = _ngrams(a), _ngrams(b)
+    return len(grams_a & grams_b) / len(grams_a | grams_b)
+
+
+# ✅ 1. 조회 / 저장
+def get(question, namespace="", threshold=SIMILARITY_THRESHOLD):
+    """
+    캐시된 답변 (없으면 None)
+    threshold를 주면 정확히 같은 질문이 없을 때 같은 namespace 안에서
+    의도(intent_router.classify)가 같고 유사도가 threshold(최소 MIN_SIMILARITY) 이상인 질문의 답변 사용
+    """
+    key = (namespace, normalize(question))
+    now = time.time()
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and now - entry["stored_at"] <= TTL:
+            _entries.move_to_end(key)
+            _stats["hits"] += 1
+            return entry["answer"]
+
+        if threshold is not None:
+            intents = classify(question)[0]
+            best_key, best_score = None, max(threshold, MIN_SIMILARITY)
+            for other, entry in _entries.items():
+                if other[0] != namespace or now - entry["stored_at"] > TTL or entry["intents"] != intents:
+                    continue
+                score = similarity(key[1], other[1])
+                if score >= best_score:
+                    best_key, best_score = other, score
+            if best_key is not None:
+                _entries.move_to_end(best_key)
+                _stats["similar_hits"] += 1
+                return _entries[best_key]["answer"]
+
+        _stats["misses"] += 1
+        return None
+
+
+def put(question, answer, namespace=""):
+    """답변 저장 (빈 답변은 저장하지 않음, 가득 차면 가장 오래 쓰지 않은 항목부터 제거)"""
+    if not isinstance(answer, str) or not answer.strip():
+        return
+    key = (namespace, normalize(question))
+    intents = classify(question)[0]
+    with _lock:
+        _entries[key] = {"answer": answer, "stored_at": time.time(), "intents": intents}
+        _entries.move_to_end(key)
+
+        now = time.time()
+        for expired in [k for k, entry in _entries.items() if now - entry["stored_at"] > TTL]:
+            del _entries[expired]
+            _stats["evictions"] += 1
+        while len(_entries) > MAX_ENTRIES:
+            _entries.popitem(last=False)
+            _stats["evictions"] += 1
+
+
+def get_stats():
+    """적중 / 유사 적중 / 실패 / 제거 횟수와 현재 항목 수"""
+    with _lock:
+        return dict(_stats, size=len(_entries))
+
+
+def clear():
+    with _lock:
+        _entries.clear()
+        for name in _stats:
+            _stats[name] = 0
+
+
+# ✅ 2. 예시 질문 미리 채우기 (백그라운드, 프로세스당 한 번)
+def prewarm(questions, generate, namespace=""):
+    """캐시에 없는 질문만 generate(question) → 답변으로 채움"""
+    global _prewarm_thread
+
+    def run():
+        for question in questions:
+            key = (namespace, normalize(question))
+            with _lock:
+                if key in _entries:
+                    continue
+            try:
+                put(question, generate(question), namespace)
+            except Exception:  # 미리 채우기 실패는 무시 (실제 질문 때 다시 생성)
+                continue
+
+    with _lock:
+        if _prewarm_thread is not None:
+            return
+        _prewarm_thread = threading.Thread(target=run, name="answer-prewarm", daemon=True)
+        _prewarm_thread.start()
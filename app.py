@@ -8,8 +8,11 @@ from home import run_home
 from jijin import run_jijin
 from map import run_map
 from new import run_new
+from perf_page import run_perf
 from snagdam import run_sangdam
 
+import perf
+
 def main():
     # ✅ Streamlit Option Menu 사
     with st.sidebar:
@@ -33,9 +36,14 @@ def main():
         st.markdown("<div class='sidebar-title'>📌 지진 예측 AI</div>", unsafe_allow_html=True)
         st.markdown("<div class='sidebar-container'>", unsafe_allow_html=True)
         
+        # ✅ 성능 페이지는 주소에 ?perf=1 을 붙였을 때만 메뉴에 표시
+        options = ["🏠 홈", "🔍 지진 예측", "대비 방법 및 상담","앱개발과정"]
+        if "perf" in st.query_params:
+            options.append("성능")
+
         menu = option_menu(
             menu_title="메뉴 선택",
-            options=["🏠 홈", "🔍 지진 예측", "대비 방법 및 상담","앱개발과정"],
+            options=options,
             icons=["house", "stethoscope", "bar-chart-line", "chat-text", "shield", "phone"],
             menu_icon="cast",
             default_index=0,
@@ -58,18 +66,20 @@ def main():
         
         st.markdown("</div>", unsafe_allow_html=True)
     
-    # ✅ 선택된 메뉴 실행
-    if menu == "🏠 홈":
-        run_home()
-    elif menu == "🔍 지진 예측":
-        run_jijin()
-    
-   
-    elif menu == "대비 방법 및 상담":
-        run_deabi()
+    # ✅ 선택된 메뉴 실행 (페이지 전체 소요 시간 측정)
+    with perf.timed(f"page.{menu}"):
+        if menu == "🏠 홈":
+            run_home()
+        elif menu == "🔍 지진 예측":
+            run_jijin()
+        elif menu == "대비 방법 및 상담":
+            run_deabi()
+
+        elif menu == "앱개발과정":
+            run_map()
 
-    elif menu == "앱개발과정":
-        run_map()
+        elif menu == "성능":
+            run_perf()
   
       
 
@@ -0,0 +1,98 @@
+import gzip
+import json
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE_DIR = os.path.join(ROOT, "benchmarks", "fixtures")
+
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # 앱 모듈은 저장소 루트 기준 상대 경로로 모델·데이터를 읽음
+
+import model_registry  # noqa: E402
+
+# 배포용 모델 파일이 없으면 저장소에 들어 있는 모델로 측정
+if not os.path.exists(model_registry.ARTIFACT_PATHS["model"]) and os.path.exists("earthquake_model1.joblib"):
+    model_registry.ARTIFACT_PATHS["model"] = "earthquake_model1.joblib"
+
+
+def read_fixture(name):
+    opener = gzip.open if name.endswith(".gz") else open
+    with opener(os.path.join(FIXTURE_DIR, name), "rb") as f:
+        return f.read()
+
+
+class RecordedResponse:
+    """기록된 응답 본문을 requests.Response처럼 돌려주는 객체"""
+
+    def __init__(self, content, status_code=200, headers=None):
+        self.content = content
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class RecordedSession:
+    """모든 요청에 같은 기록 응답을 돌려주는 세션 (requests.get / Session.get 자리에 사용)"""
+
+    def __init__(self, content):
+        self.content = content
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        return RecordedResponse(self.content)
+
+
+@pytest.fixture(scope="session")
+def usgs_geojson():
+    return read_fixture("usgs.geojson.gz")
+
+
+@pytest.fixture(scope="session")
+def shelter_page():
+    return read_fixture("shelters.json.gz")
+
+
+@pytest.fixture(scope="session")
+def naver_html():
+    return read_fixture("naver_news.html")
+
+
+@pytest.fixture(scope="session")
+def google_rss():
+    return read_fixture("google_news_rss.xml")
+
+
+@pytest.fixture(scope="session")
+def earthquakes():
+    return pd.read_csv(os.path.join(ROOT, "global_earthquakes.csv"))
+
+
+@pytest.fixture(scope="session")
+def shelters(shelter_page):
+    from shelter_store import normalize
+
+    return normalize(json.loads(shelter_page)["body"], "DSSP-IF-00706").reset_index(drop=True)
@@ -0,0 +1,105 @@
+"""
+벤치마크 실행 + 기준값(JSON) 비교
+
+각 벤치마크의 중앙값이 기준값보다 threshold 이상 느려지면 실패(종료 코드 1)
+
+사용 예:
+    python benchmarks/run.py                  # 기준값과 비교
+    python benchmarks/run.py --update         # 현재 결과를 기준값으로 저장
+    python benchmarks/run.py --threshold 0.5 -k shelter
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+
+# 기준값 대비 허용하는 중앙값 증가율 (0.25 = 25% 느려지면 실패)
+THRESHOLD = float(os.environ.get("BENCHMARK_THRESHOLD", "0.25"))
+
+
+def run_benchmarks(pytest_args=()):
+    """pytest-benchmark를 실행해 {이름: 통계} 반환"""
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "results.json")
+        command = [sys.executable, "-m", "pytest", BENCH_DIR, "-q", "-p", "no:cacheprovider",
+                   f"--benchmark-json={json_path}", *pytest_args]
+        code = subprocess.call(command)
+        if code != 0 or not os.path.exists(json_path):
+            raise SystemExit(f"벤치마크 실행 실패 (종료 코드 {code})")
+        with open(json_path, encoding="utf-8") as f:
+            results = json.load(f)
+
+    return {
+        bench["name"]: {key: bench["stats"][key] for key in ("min", "median", "mean", "stddev", "rounds")}
+        for bench in results["benchmarks"]
+    }
+
+
+def save_baseline(stats, path=BASELINE_PATH):
+    baseline = {
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "processor": platform.processor() or platform.machine(), "cpus": os.cpu_count()},
+        "benchmarks": stats,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2, ensure_ascii=False, sort_keys=True)
+        f.write("\n")
+
+
+def compare(stats, baseline, threshold=THRESHOLD):
+    """(이름, 기준 중앙값, 현재 중앙값, 비율, 상태) 목록과 회귀 여부"""
+    rows = []
+    regressed = False
+    for name, current in sorted(stats.items()):
+        base = baseline.get(name)
+        if base is None:
+            rows.append((name, None, current["median"], None, "새 항목"))
+            continue
+        ratio = current["median"] / base["median"]
+        status = "회귀" if ratio > 1 + threshold else "통과"
+        regressed |= status == "회귀"
+        rows.append((name, base["median"], current["median"], ratio, status))
+    return rows, regressed
+
+
+def _ms(seconds):
+    return "-" if seconds is None else f"{seconds * 1000:10.3f}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="벤치마크 실행 및 기준값 비교")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="허용 증가율 (기본 0.25)")
+    parser.add_argument("--update", action="store_true", help="현재 결과를 기준값으로 저장")
+    args, pytest_args = parser.parse_known_args()
+
+    stats = run_benchmarks(pytest_args)
+    if args.update or not os.path.exists(args.baseline):
+        if os.path.exists(args.baseline):
+            # 일부(-k)만 실행한 경우 나머지 항목은 기존 기준값 유지
+            with open(args.baseline, encoding="utf-8") as f:
+                stats = {**json.load(f)["benchmarks"], **stats}
+        save_baseline(stats, args.baseline)
+        print(f"기준값 저장: {args.baseline} ({len(stats)}개)")
+        raise SystemExit(0)
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)["benchmarks"]
+    rows, regressed = compare(stats, baseline, args.threshold)
+
+    print(f"\n{'벤치마크':<28}{'기준(ms)':>12}{'현재(ms)':>12}{'비율':>8}  상태")
+    for name, base, current, ratio, status in rows:
+        print(f"{name:<30}{_ms(base):>12}{_ms(current):>12}{'-' if ratio is None else f'{ratio:7.2f}x':>8}  {status}")
+
+    if regressed:
+        print(f"\n❌ 기준값보다 {args.threshold:.0%} 넘게 느려진 항목이 있습니다.")
+        raise SystemExit(1)
+    print("\n✅ 모든 항목이 기준값 범위 안입니다.")
@@ -0,0 +1,36 @@
+import folium
+import numpy as np
+from folium.plugins import HeatMap
+
+import heat_grid
+
+
+def _render(heat_data):
+    real_time_map = folium.Map(location=[36.5, 127.8], zoom_start=6, tiles="OpenStreetMap")
+    HeatMap(heat_data, radius=12, blur=6, min_opacity=0.4).add_to(real_time_map)
+    return real_time_map.get_root().render()
+
+
+def test_heatmap_payload(benchmark, earthquakes):
+    """eda.py와 같은 방식으로 셀 단위 HeatMap 데이터를 만들고 지도 HTML까지 렌더링 (격자 캐시 없이)"""
+    lats, lons, mags = (earthquakes[column].to_numpy() for column in ("lat", "lon", "magnitude"))
+
+    def build():
+        heat_grid._cache.clear()
+        return _render(heat_grid.heat_data(lats, lons, mags))
+
+    html = benchmark(build)
+    assert "heatLayer" in html
+
+
+def test_heat_grid_100k(benchmark, earthquakes):
+    """10만 건 카탈로그 격자 집계 (지진 위치 주변에 흩뿌린 점)"""
+    rng = np.random.default_rng(42)
+    picks = rng.integers(len(earthquakes), size=100_000)
+    lats = np.clip(earthquakes["lat"].to_numpy()[picks] + rng.normal(0, 1, picks.size), -89.9, 89.9)
+    lons = (earthquakes["lon"].to_numpy()[picks] + rng.normal(0, 1, picks.size) + 180) % 360 - 180
+    mags = earthquakes["magnitude"].to_numpy()[picks]
+
+    center_lats, _, _, counts = benchmark(heat_grid.bin_points, lats, lons, mags)
+    assert counts.sum() == picks.size
+    assert center_lats.size < 10_000
@@ -0,0 +1,15 @@
+import news
+import news_feed
+from conftest import RecordedSession
+
+
+def test_naver_news_parse(benchmark, monkeypatch, naver_html):
+    monkeypatch.setattr(news.requests, "get", RecordedSession(naver_html).get)
+    articles = benchmark(news.get_naver_earthquake_news)
+    assert len(articles) == 15
+
+
+def test_google_news_parse(benchmark, monkeypatch, google_rss):
+    monkeypatch.setattr(news_feed.requests, "get", RecordedSession(google_rss).get)
+    articles = benchmark(news.get_google_earthquake_news)
+    assert len(articles) == 15
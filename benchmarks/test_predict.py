@@ -0,0 +1,26 @@
+import joblib
+
+import model_registry
+from predictor import predict_many
+
+
+def test_predict_single(benchmark):
+    from new import predict_earthquake
+
+    predict_earthquake(37.5665, 126.9780)  # 모델 로드·컴파일은 측정에서 제외
+    benchmark(predict_earthquake, 37.5665, 126.9780)
+
+
+def test_predict_batch(benchmark, earthquakes):
+    lats, lons, depths = (earthquakes[column].to_numpy() for column in ("lat", "lon", "depth"))
+    predict_many(lats[:1], lons[:1], depths[:1])
+    probs = benchmark(predict_many, lats, lons, depths)
+    assert len(probs) == len(earthquakes)
+
+
+def test_model_load(benchmark):
+    def load():
+        return joblib.load(model_registry.ARTIFACT_PATHS["model"]), joblib.load(model_registry.ARTIFACT_PATHS["scaler"])
+
+    model, scaler = benchmark.pedantic(load, rounds=5, warmup_rounds=1)
+    assert hasattr(model, "predict_proba")
@@ -0,0 +1,47 @@
+import json
+
+import shelter_clusters
+import shelter_index
+from geodist import geodesic_km
+from shelter_store import normalize
+
+SEOUL = (37.5665, 126.9780)
+
+
+def test_shelter_normalize(benchmark, shelter_page):
+    rows = json.loads(shelter_page)["body"]
+    table = benchmark(normalize, rows, "DSSP-IF-00706")
+    assert len(table) == len(rows)
+
+
+def test_shelter_distances(benchmark, shelters):
+    lats = shelters["latitude"].to_numpy()
+    lons = shelters["longitude"].to_numpy()
+    distances = benchmark(geodesic_km, *SEOUL, lats, lons)
+    assert len(distances) == len(shelters)
+
+
+def test_shelter_index_build(benchmark, shelters):
+    lats = shelters["latitude"].to_numpy()
+    lons = shelters["longitude"].to_numpy()
+    benchmark.pedantic(shelter_index.get_index, args=(lats, lons), setup=shelter_index._indexes.clear, rounds=10)
+
+
+def test_shelter_nearest(benchmark, shelters):
+    shelter_index.nearest(shelters, *SEOUL)  # 인덱스 생성은 측정에서 제외
+    closest = benchmark(shelter_index.nearest, shelters, *SEOUL, k=10)
+    assert len(closest) == 10
+
+
+def test_shelter_clusters_build(benchmark, shelters):
+    lats = shelters["latitude"].to_numpy()
+    lons = shelters["longitude"].to_numpy()
+    index = benchmark(shelter_clusters.ClusterIndex, lats, lons)
+    assert index.levels[shelter_clusters.MIN_ZOOM]["count"].sum() == len(shelters)
+
+
+def test_shelter_clusters_query(benchmark, shelters):
+    index = shelter_clusters.get_index(shelters["latitude"].to_numpy(), shelters["longitude"].to_numpy())
+    bounds = shelter_clusters.view_bounds(SEOUL, 12, 700, 500)
+    visible = benchmark(index.query, *bounds, 12)
+    assert 0 < len(visible["lat"]) <= len(shelters)
@@ -0,0 +1,17 @@
+import usgs_stream
+from conftest import RecordedResponse, RecordedSession
+
+
+def test_usgs_iter_features(benchmark, usgs_geojson):
+    def parse():
+        chunks = RecordedResponse(usgs_geojson).iter_content(usgs_stream.CHUNK_BYTES)
+        return sum(1 for _ in usgs_stream.iter_features(chunks))
+
+    assert benchmark(parse) > 0
+
+
+def test_usgs_fetch_frame(benchmark, usgs_geojson, earthquakes):
+    session = RecordedSession(usgs_geojson)
+    df = benchmark(usgs_stream.fetch_earthquakes, {"starttime": "2025-02-01"}, with_ids=True, float_code="d",
+                   session=session)
+    assert len(df) == len(earthquakes)
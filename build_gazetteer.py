@@ -0,0 +1,226 @@
+"""
+한국 행정구역 지명 사전(geodata/kr_gazetteer.csv.gz) 생성 스크립트
+
+입력 (빌드할 때만 필요, 앱 실행에는 필요 없음)
+- 행정동 코드표 JSON/CSV (시도코드, 시도명, 시군구코드, 시군구명, 행정동코드, 읍면동명, 말소일자)
+  예: PublicDataReader 패키지의 raw/code_hdong.json
+- (선택) 행정동 중심점 CSV (행정동코드, lat, lon)
+  예: 통계청 SGIS 행정구역 경계에서 계산한 중심점
+- (선택) 이름별 좌표 (앞에 준 자료 우선)
+  - korean-geocoding 패키지의 data/ 디렉터리 (시도/시군구/행정동 좌표, MIT)
+  - 이름·좌표 CSV (name, lat, lon) 예: dongnae-kr 패키지의 법정동·리 중심점 CSV
+  분동·출장소처럼 이름이 그대로 없는 지명은 분동 이전 이름, 관할 읍면·리, 하위 지명 평균 순서로 보완
+
+사용 예:
+    python build_gazetteer.py --codes code_hdong.json \
+        --named-centroids korean_geocoding/data dongnae_kr/data/dongnaeKR_251130.csv
+"""
+import argparse
+import glob
+import os
+import pickle
+import re
+
+import pandas as pd
+
+GEODATA_DIR = "geodata"
+
+# ✅ 코드표 이후 바뀐 시도 명칭 / 관할
+RENAMED_SIDO = {
+    "강원도": "강원특별자치도",
+    "전라북도": "전북특별자치도",
+}
+# 2023-07 경상북도 군위군 → 대구광역시 편입
+MOVED_SIGUNGU = {("경상북도", "군위군"): "대구광역시"}
+
+# ✅ 중심점 파일이 없을 때 사용하는 시도청 / 주요 시청 좌표
+SEED_COORDINATES = {
+    "서울특별시": (37.5665, 126.9780),
+    "부산광역시": (35.1796, 129.0756),
+    "대구광역시": (35.8714, 128.6014),
+    "인천광역시": (37.4563, 126.7052),
+    "광주광역시": (35.1595, 126.8526),
+    "대전광역시": (36.3504, 127.3845),
+    "울산광역시": (35.5384, 129.3114),
+    "세종특별자치시": (36.4801, 127.2890),
+    "경기도": (37.2893, 127.0535),
+    "강원특별자치도": (37.8854, 127.7298),
+    "충청북도": (36.6357, 127.4917),
+    "충청남도": (36.6588, 126.6728),
+    "전북특별자치도": (35.8203, 127.1088),
+    "전라남도": (34.8161, 126.4629),
+    "경상북도": (36.5760, 128.5056),
+    "경상남도": (35.2383, 128.6925),
+    "제주특별자치도": (33.4890, 126.4983),
+    "경기도 수원시": (37.2636, 127.0286),
+    "경기도 성남시": (37.4202, 127.1267),
+    "경기도 용인시": (37.2411, 127.1776),
+    "강원특별자치도 춘천시": (37.8813, 127.7298),
+    "충청북도 청주시": (36.6424, 127.4891),
+    "충청남도 천안시": (36.8151, 127.1139),
+    "전북특별자치도 전주시": (35.8242, 127.1475),
+    "전라남도 목포시": (34.8118, 126.3922),
+    "경상북도 포항시": (36.0190, 129.3435),
+    "경상남도 창원시": (35.2285, 128.6811),
+    "제주특별자치도 제주시": (33.4996, 126.5312),
+}
+
+
+def read_codes(path):
+    """현재 유효한 행정동 코드만 (시도, 시군구, 읍면동) 테이블로 읽기"""
+    if path.endswith(".json"):
+        codes = pd.read_json(path, dtype=str)
+    else:
+        codes = pd.read_csv(path, dtype=str)
+    codes = codes[codes["말소일자"].isna() & ~codes["시도명"].str.endswith("출장소")]
+
+    table = pd.DataFrame({
+        "code": codes["행정동코드"],
+        "sido": codes["시도명"].replace(RENAMED_SIDO),
+        "sigungu": codes["시군구명"].fillna(""),
+        "dong": codes["읍면동명"].fillna(""),
+    })
+    for (old_sido, sigungu), new_sido in MOVED_SIGUNGU.items():
+        moved = (table["sido"] == RENAMED_SIDO.get(old_sido, old_sido)) & (table["sigungu"] == sigungu)
+        table.loc[moved, "sido"] = new_sido
+    return table.drop_duplicates(subset=["sido", "sigungu", "dong"]).reset_index(drop=True)
+
+
+# ✅ 이름별 좌표 자료 읽기
+class _Section:
+    """korean-geocoding 의 Section 객체 (속성만 읽음)"""
+
+
+class _SectionUnpickler(pickle.Unpickler):
+    def find_class(self, module, name):
+        if (module, name) == ("korean_geocoding.section", "Section"):
+            return _Section
+        raise pickle.UnpicklingError(f"허용하지 않는 객체: {module}.{name}")
+
+
+def read_korean_geocoding(data_dir):
+    """korean-geocoding 의 시도별 .dat 파일 → (name, lat, lon) 테이블"""
+    rows = []
+    for path in sorted(glob.glob(os.path.join(data_dir, "*.dat"))):
+        with open(path, "rb") as f:
+            stack = [_SectionUnpickler(f).load()]
+        while stack:
+            section = stack.pop()
+            if getattr(section, "coordinates", None):
+                rows.append((section.full_addr, *section.coordinates))
+            stack.extend(getattr(section, "children", {}).values())
+    return pd.DataFrame(rows, columns=["name", "lat", "lon"])
+
+
+def read_named_centroids(path):
+    """korean-geocoding data/ 디렉터리 또는 이름·좌표 CSV (dongnae-kr 열 이름도 허용)"""
+    if os.path.isdir(path):
+        return read_korean_geocoding(path)
+    table = pd.read_csv(path, encoding="utf-8-sig")
+    return table.rename(columns={"dnname": "name", "dnlatitude": "lat", "dnlongitude": "lon"})[["name", "lat", "lon"]]
+
+
+def _current_name(name):
+    """옛 시도 명칭 / 관할을 코드표와 같게 바꾼 이름"""
+    parts = str(name).split()
+    if not parts:
+        return ""
+    parts[0] = RENAMED_SIDO.get(parts[0], parts[0])
+    for (old_sido, sigungu), new_sido in MOVED_SIGUNGU.items():
+        if len(parts) > 1 and parts[0] == RENAMED_SIDO.get(old_sido, old_sido) and parts[1] == sigungu:
+            parts[0] = new_sido
+    return " ".join(parts)
+
+
+def _name_keys(name):
+    """다른 자료에서 찾아볼 이름 (그대로 → '제' 없이 → 분동 이전 이름, 예: 상도제1동 → 상도1동 → 상도동)"""
+    *parents, last = name.split()
+    variants = [last, re.sub(r"제(?=\d)", "", last), re.sub(r"제?\d+(\.\d+)*동$", "동", last)]
+    return [" ".join(parents + [variant]) for variant in dict.fromkeys(variants)]
+
+
+def _branch_coordinates(name, named):
+    """
+    출장소·새로 나뉜 동처럼 관할 지명 + 지역명으로 된 이름의 좌표 (같은 지역명으로 시작하는 지명의 평균)
+    예: '흑산면홍도출장소' → 흑산면 아래 '홍도'로 시작하는 리 (없으면 흑산면)
+        '운정4동' → 같은 시의 운정1동·운정2동·운정3동
+    """
+    *parents, last = name.split()
+    last = re.sub(r"(제?\d+(\.\d+)*동|출장소)$", "", last)
+    heads = [last[:i] for i in range(len(last), 0, -1) if last[i - 1] in "시군구읍면"] + [""]
+    for head in heads:
+        scope = " ".join(parents + ([head] if head else []))
+        place = last[len(head):]
+        if not place:
+            continue
+        prefix = scope + " "
+        matches = [named[key] for key in named if key.startswith(prefix) and key.split()[-1].startswith(place)]
+        if matches:
+            return tuple(pd.DataFrame(matches).mean())
+        if head and scope in named:
+            return named[scope]
+    return None
+
+
+def build(codes_path, centroids_path=None, out_dir=GEODATA_DIR, named_paths=()):
+    os.makedirs(out_dir, exist_ok=True)
+    table = read_codes(codes_path)
+
+    name = (table["sido"] + " " + table["sigungu"] + " " + table["dong"]).str.split().str.join(" ")
+    seed = name.map(SEED_COORDINATES)
+    table["lat"] = seed.str[0]
+    table["lon"] = seed.str[1]
+
+    if centroids_path:
+        centroids = pd.read_csv(centroids_path, dtype={"행정동코드": str}).rename(columns={"행정동코드": "code"})
+        merged = table[["code"]].merge(centroids[["code", "lat", "lon"]], on="code", how="left")
+        table["lat"] = merged["lat"].fillna(table["lat"]).round(5)
+        table["lon"] = merged["lon"].fillna(table["lon"]).round(5)
+
+    if named_paths:
+        named = {}
+        for path in named_paths:
+            for key, lat, lon in read_named_centroids(path).itertuples(index=False):
+                named.setdefault(_current_name(key), (lat, lon))
+        fill_named(table, name, named)
+
+    table["lat"] = table["lat"].round(5)
+    table["lon"] = table["lon"].round(5)
+    table.to_csv(os.path.join(out_dir, "kr_gazetteer.csv.gz"), index=False, compression="gzip")
+    return {"entries": len(table), "with_coordinates": int(table["lat"].notna().sum())}
+
+
+def fill_named(table, name, named):
+    """
+    좌표가 없는 지명을 이름별 좌표로 채움
+    1) 같은 이름 / 분동 이전 이름  2) 하위 지명 좌표 평균 (시군구, 시도)  3) 출장소·새로 나뉜 동의 관할·이웃 지명
+    """
+    missing = table["lat"].isna()
+    for i in table.index[missing]:
+        for key in _name_keys(name[i]):
+            if key in named:
+                table.loc[i, ["lat", "lon"]] = named[key]
+                break
+
+    levels = (table["sigungu"] != "").astype(int) + (table["dong"] != "").astype(int)
+    for level in (1, 0):
+        for i in table.index[table["lat"].isna() & (levels == level)]:
+            children = name.str.startswith(name[i] + " ") & table["lat"].notna()
+            if children.any():
+                table.loc[i, ["lat", "lon"]] = table.loc[children, ["lat", "lon"]].mean().to_numpy()
+
+    for i in table.index[table["lat"].isna()]:
+        coordinates = _branch_coordinates(name[i], named)
+        if coordinates is not None:
+            table.loc[i, ["lat", "lon"]] = coordinates
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="한국 행정구역 지명 사전 생성")
+    parser.add_argument("--codes", required=True, help="행정동 코드표 (JSON 또는 CSV)")
+    parser.add_argument("--centroids", help="행정동 중심점 CSV (행정동코드, lat, lon)")
+    parser.add_argument("--named-centroids", nargs="+", default=(),
+                        help="이름별 좌표 (korean-geocoding data/ 디렉터리 또는 name, lat, lon CSV, 앞의 자료 우선)")
+    parser.add_argument("--out", default=GEODATA_DIR)
+    args = parser.parse_args()
+    print(build(args.codes, args.centroids, args.out, args.named_centroids))
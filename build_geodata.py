@@ -0,0 +1,286 @@
+"""
+오프라인 역지오코딩 데이터(geodata/) 생성 스크립트
+
+입력 (빌드할 때만 필요, 앱 실행에는 필요 없음)
+- Natural Earth 1:110m 국가 경계 shapefile (예: geopandas 0.14 의 naturalearth_lowres)
+- GeoNames cities1000 CSV (lat, lon, name, admin1, admin2, cc) (예: reverse_geocoder 의 rg_cities1000.csv)
+- pyshp, pycountry 패키지 (shapefile 읽기 / 한국어 국가명)
+- (선택) GeoNames 별칭이 들어 있는 cities1000 JSON (예: geonamescache 의 data/cities1000.json)
+  한글 별칭이 있는 도시는 한국어 이름을 함께 저장
+
+사용 예:
+    python build_geodata.py --countries naturalearth_lowres.shp --places rg_cities1000.csv \
+        --korean-names geonamescache/data/cities1000.json
+"""
+import argparse
+import difflib
+import gettext
+import gzip
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+GEODATA_DIR = "geodata"
+
+# 래스터 해상도 (도)
+GRID_STEP = 0.1
+
+# ✅ 해역 이름 (경계는 근사 다각형 / 경위도 범위, 위에서부터 먼저 일치하는 해역 사용)
+SEA_POLYGONS = [
+    ("남극해", [(-180, -90), (180, -90), (180, -60), (-180, -60)]),
+    ("북극해", [(-180, 66.5), (180, 66.5), (180, 90), (-180, 90)]),
+    ("남해", [(126.2, 33.2), (126.3, 34.6), (128.5, 35.2), (129.5, 35.3), (130.9, 33.9), (129.7, 33.0), (127.5, 32.8)]),
+    ("황해", [(117.5, 37.0), (117.5, 41.0), (122.5, 41.0), (125.5, 40.0), (126.8, 37.5), (126.3, 34.4),
+             (126.2, 33.2), (121.8, 31.4), (120.0, 33.0)]),
+    ("동해", [(128.5, 34.6), (130.0, 33.6), (131.0, 34.2), (132.5, 35.6), (136.0, 36.5), (140.0, 40.5),
+             (140.2, 42.5), (141.8, 45.5), (142.0, 52.0), (140.0, 52.0), (127.0, 43.0), (127.0, 38.0)]),
+    ("동중국해", [(121.8, 31.4), (126.2, 33.2), (129.7, 33.0), (130.5, 31.0), (131.0, 30.0), (129.5, 28.5),
+               (127.5, 26.0), (123.5, 24.0), (121.9, 25.0), (120.0, 26.5)]),
+    ("남중국해", [(117.0, 23.5), (120.5, 22.5), (120.9, 21.9), (121.8, 18.5), (120.5, 14.0), (120.0, 12.0),
+               (119.0, 10.5), (117.2, 7.0), (116.0, 5.0), (109.0, 1.0), (104.5, 1.3), (103.5, 5.5),
+               (100.0, 10.0), (105.0, 22.0), (110.0, 21.5)]),
+    ("오호츠크해", [(135.0, 43.0), (145.5, 43.5), (150.0, 46.0), (156.5, 50.8), (156.5, 62.0), (135.0, 62.0)]),
+    ("베링해", [(162.0, 51.0), (180.0, 51.0), (180.0, 66.5), (162.0, 66.5)]),
+    ("베링해", [(-180.0, 51.0), (-157.0, 57.0), (-157.0, 66.5), (-180.0, 66.5)]),
+    ("흑해", [(27.0, 40.5), (42.0, 40.5), (42.0, 47.5), (27.0, 47.5)]),
+    ("카스피해", [(46.0, 36.0), (55.5, 36.0), (55.5, 47.5), (46.0, 47.5)]),
+    ("지중해", [(-5.6, 30.0), (36.5, 30.0), (36.5, 46.0), (-5.6, 46.0)]),
+    ("홍해", [(32.0, 12.5), (43.5, 12.5), (43.5, 30.0), (32.0, 30.0)]),
+    ("페르시아만", [(47.5, 23.0), (57.0, 23.0), (57.0, 30.5), (47.5, 30.5)]),
+    ("아라비아해", [(51.0, 0.0), (77.0, 0.0), (77.0, 25.5), (51.0, 25.5)]),
+    ("벵골만", [(78.0, 5.0), (95.0, 5.0), (95.0, 23.0), (78.0, 23.0)]),
+    ("멕시코만", [(-98.0, 21.8), (-80.5, 21.8), (-80.5, 31.0), (-98.0, 31.0)]),
+    ("멕시코만", [(-98.0, 18.0), (-90.0, 18.0), (-90.0, 21.8), (-98.0, 21.8)]),
+    ("카리브해", [(-89.0, 8.0), (-60.0, 8.0), (-60.0, 21.8), (-89.0, 21.8)]),
+]
+OCEAN_NAMES = ["태평양", "대서양", "인도양"]
+
+
+# ✅ 1. 다각형 래스터화 (스캔라인, 짝홀 규칙)
+def _rasterize(rings, lat_centers, lon_centers):
+    """rings(경도/위도 좌표 배열 목록) 내부에 중심이 있는 격자 셀 마스크"""
+    mask = np.zeros((lat_centers.size, lon_centers.size), dtype=bool)
+    x0 = np.concatenate([ring[:, 0] for ring in rings])
+    y0 = np.concatenate([ring[:, 1] for ring in rings])
+    x1 = np.concatenate([np.roll(ring[:, 0], -1) for ring in rings])
+    y1 = np.concatenate([np.roll(ring[:, 1], -1) for ring in rings])
+
+    rows = np.nonzero((lat_centers >= y0.min()) & (lat_centers <= y0.max()))[0]
+    for row in rows:
+        y = lat_centers[row]
+        crossing = (y0 > y) != (y1 > y)
+        xs = np.sort(x0[crossing] + (y - y0[crossing]) * (x1[crossing] - x0[crossing]) / (y1[crossing] - y0[crossing]))
+        for start, end in zip(xs[0::2], xs[1::2]):
+            mask[row, (lon_centers >= start) & (lon_centers < end)] = True
+    return mask
+
+
+def _border_cells(rings, shape, step):
+    """경계선이 지나가는 셀 (주변 1칸 포함) - 실행 시 정확한 다각형 판정이 필요한 셀"""
+    border = np.zeros(shape, dtype=bool)
+    for ring in rings:
+        a, b = ring, np.roll(ring, -1, axis=0)
+        length = np.hypot(*(b - a).T)
+        n = np.maximum(np.ceil(length / (step / 4)).astype(int), 1)
+        t = np.concatenate([np.arange(k) / k for k in n])
+        seg = np.repeat(np.arange(len(a)), n)
+        points = a[seg] + (b[seg] - a[seg]) * t[:, np.newaxis]
+        rows = np.clip(((points[:, 1] + 90) / step).astype(int), 0, shape[0] - 1)
+        cols = np.clip(((points[:, 0] + 180) / step).astype(int), 0, shape[1] - 1)
+        border[rows, cols] = True
+
+    # 주변 셀까지 확장
+    dilated = border.copy()
+    dilated[1:, :] |= border[:-1, :]
+    dilated[:-1, :] |= border[1:, :]
+    dilated[:, 1:] |= dilated[:, :-1].copy()
+    dilated[:, :-1] |= dilated[:, 1:].copy()
+    return dilated
+
+
+# ✅ 2. 국가 경계 읽기
+def read_countries(shp_path):
+    import pycountry
+    import shapefile
+
+    ko = gettext.translation("iso3166-1", pycountry.LOCALES_DIR, languages=["ko"])
+    countries = []
+    for shape_record in shapefile.Reader(shp_path).iterShapeRecords():
+        record = shape_record.record.as_dict()
+        shape = shape_record.shape
+        points = np.asarray(shape.points)
+        parts = list(shape.parts) + [len(points)]
+        rings = [np.round(points[a:b], 3) for a, b in zip(parts[:-1], parts[1:]) if b - a >= 3]
+
+        country = pycountry.countries.get(alpha_3=record["iso_a3"]) if record["iso_a3"] != "-99" else None
+        if country is None:
+            try:
+                country = pycountry.countries.lookup(record["name"])
+            except LookupError:
+                country = None
+
+        countries.append({
+            "name": record["name"],
+            "name_ko": ko.gettext(country.name) if country else record["name"],
+            "iso_a2": country.alpha_2 if country else "",
+            "rings": rings,
+        })
+    return countries
+
+
+def _point_in_polygon(lons, lats, polygon):
+    polygon = np.asarray(polygon, dtype=float)
+    x0, y0 = polygon[:, 0], polygon[:, 1]
+    x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+    inside = np.zeros(lons.shape, dtype=bool)
+    for a, b, c, d in zip(x0, y0, x1, y1):
+        crossing = (b > lats) != (d > lats)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x_cross = a + (lats - b) * (c - a) / (d - b)
+        inside ^= crossing & (lons < x_cross)
+    return inside
+
+
+def _ocean_basin(lon_grid, lat_grid):
+    """주요 해양 구분 (남·북아메리카 / 아프리카 / 인도네시아 기준의 근사 경계)"""
+    # 아메리카 대륙을 기준으로 태평양 / 대서양을 나누는 경도
+    divide = np.select(
+        [lat_grid >= 30, lat_grid >= 15, lat_grid >= 8, lat_grid >= 0, lat_grid >= -56],
+        [-90.0, -90.0, -83.0, -77.0, -70.0],
+        default=-67.3,
+    )
+    atlantic = (lon_grid > divide) & ((lon_grid < 20) | ((lat_grid >= 30) & (lon_grid < 60)))
+    indian = (
+        ((lon_grid >= 20) & (lon_grid < 100) & (lat_grid < 30))
+        | ((lon_grid >= 100) & (lon_grid < 130) & (lat_grid < -8))
+        | ((lon_grid >= 92) & (lon_grid < 100) & (lat_grid < 20))
+        | ((lon_grid >= 130) & (lon_grid < 146.9) & (lat_grid < -30))
+    )
+    return np.where(atlantic, 1, np.where(indian, 2, 0))
+
+
+_HANGUL_NAME = re.compile(r"^[가-힣]+$")
+_RR_INITIALS = ["g", "kk", "n", "d", "tt", "r", "m", "b", "pp", "s", "ss", "", "j", "jj", "ch", "k", "t", "p", "h"]
+_RR_MEDIALS = ["a", "ae", "ya", "yae", "eo", "e", "yeo", "ye", "o", "wa", "wae", "oe", "yo", "u", "wo", "we", "wi",
+               "yu", "eu", "ui", "i"]
+_RR_FINALS = ["", "k", "k", "k", "n", "n", "n", "t", "l", "k", "m", "l", "l", "l", "p", "l", "m", "p", "p", "t", "t",
+              "ng", "t", "t", "k", "t", "p", "t"]
+
+
+def _romanize(hangul):
+    """음절 단위 국어의 로마자 표기 (발음 변화 규칙 없이 이름 비교용)"""
+    parts = []
+    for char in hangul:
+        code = ord(char) - 0xAC00
+        parts.append(_RR_INITIALS[code // 588] + _RR_MEDIALS[code % 588 // 28] + _RR_FINALS[code % 28])
+    return "".join(parts)
+
+
+def _korean_name(name, aliases):
+    """
+    한글 별칭 중 로마자 표기가 GeoNames 이름과 가장 비슷한 것 (서울 / 경성 / 서울특별시 중 "서울")
+    """
+    names = [alias for alias in aliases if _HANGUL_NAME.match(alias)]
+    if not names:
+        return None
+    target = re.sub(r"[^a-z]", "", name.lower())
+    return max(names, key=lambda alias: (difflib.SequenceMatcher(None, _romanize(alias), target).ratio(), -len(alias)))
+
+
+def add_korean_names(places, names_path, max_offset=0.1):
+    """
+    GeoNames 별칭의 한글 이름을 name_ko 컬럼으로 추가 (없으면 빈 문자열)
+    같은 국가 코드·이름이고 좌표 차이가 max_offset도 이내인 도시와 연결
+    """
+    with open(names_path, encoding="utf-8") as f:
+        cities = json.load(f).values()
+    rows = []
+    for city in cities:
+        name_ko = _korean_name(city["name"], city.get("alternatenames", []))
+        if name_ko:
+            rows.append((city["countrycode"], city["name"], city["latitude"], city["longitude"], name_ko))
+    korean = pd.DataFrame(rows, columns=["cc", "name", "lat_ko", "lon_ko", "name_ko"])
+
+    places = places.drop(columns="name_ko", errors="ignore").reset_index(drop=True)
+    matched = places.reset_index().merge(korean, on=["cc", "name"])
+    offset = np.maximum((matched["lat"] - matched["lat_ko"]).abs(), (matched["lon"] - matched["lon_ko"]).abs())
+    matched = matched.assign(offset=offset)[offset <= max_offset].sort_values("offset").drop_duplicates("index")
+    places["name_ko"] = matched.set_index("index")["name_ko"].reindex(places.index).fillna("")
+    return places
+
+
+# ✅ 3. 전체 빌드
+def build(countries_path, places_path, out_dir=GEODATA_DIR, step=GRID_STEP, korean_names_path=None):
+    os.makedirs(out_dir, exist_ok=True)
+    countries = read_countries(countries_path)
+
+    n_lat, n_lon = int(round(180 / step)), int(round(360 / step))
+    lat_centers = -90 + step * (np.arange(n_lat) + 0.5)
+    lon_centers = -180 + step * (np.arange(n_lon) + 0.5)
+
+    # 국가 래스터 (-1 = 바다) + 경계 셀 표시
+    country_grid = np.full((n_lat, n_lon), -1, dtype=np.int16)
+    border = np.zeros((n_lat, n_lon), dtype=bool)
+    for index, country in enumerate(countries):
+        country_grid[_rasterize(country["rings"], lat_centers, lon_centers)] = index
+        border |= _border_cells(country["rings"], (n_lat, n_lon), step)
+
+    # 해역 래스터 (모든 셀에 가장 가까운 해역 이름 번호를 채움)
+    sea_names = OCEAN_NAMES + sorted({name for name, _ in SEA_POLYGONS}, key=[n for n, _ in SEA_POLYGONS].index)
+    lon_grid, lat_grid = np.meshgrid(lon_centers, lat_centers)
+    sea_grid = _ocean_basin(lon_grid, lat_grid).astype(np.uint8)
+    assigned = np.zeros(sea_grid.shape, dtype=bool)
+    for name, polygon in SEA_POLYGONS:
+        inside = _point_in_polygon(lon_grid, lat_grid, polygon) & ~assigned
+        sea_grid[inside] = sea_names.index(name)
+        assigned |= inside
+
+    # 행정구역 / 도시 지점 (한 격자에 하나씩만 남겨 용량 축소)
+    places = pd.read_csv(places_path, usecols=["lat", "lon", "name", "admin1", "cc"], keep_default_na=False)
+    places["lat"] = places["lat"].round(3)
+    places["lon"] = places["lon"].round(3)
+    cell = (places["lat"] / 0.05).round().astype(int).astype(str) + ":" + (places["lon"] / 0.05).round().astype(int).astype(str)
+    places = places.loc[~cell.duplicated()]
+    if korean_names_path:
+        places = add_korean_names(places, korean_names_path)
+    places.to_csv(os.path.join(out_dir, "places.csv.gz"), index=False, compression="gzip")
+
+    # 110m 해안선에 없는 작은 섬(제주도 등)도 도시 검색을 하도록 도시 주변 셀을 경계 셀로 표시
+    rows = np.clip(((places["lat"].to_numpy() + 90) / step).astype(int), 0, n_lat - 1)
+    cols = np.clip(((places["lon"].to_numpy() + 180) / step).astype(int), 0, n_lon - 1)
+    for d_row in (-1, 0, 1):
+        for d_col in (-1, 0, 1):
+            border[np.clip(rows + d_row, 0, n_lat - 1), (cols + d_col) % n_lon] = True
+
+    np.savez_compressed(
+        os.path.join(out_dir, "regions.npz"),
+        country=country_grid,
+        border=np.packbits(border, axis=1),
+        sea=sea_grid,
+        step=step,
+    )
+
+    with gzip.open(os.path.join(out_dir, "countries.json.gz"), "wt", encoding="utf-8") as f:
+        json.dump({
+            "countries": [
+                {key: value for key, value in country.items() if key != "rings"}
+                | {"rings": [ring.tolist() for ring in country["rings"]]}
+                for country in countries
+            ],
+            "sea_names": sea_names,
+        }, f, ensure_ascii=False, separators=(",", ":"))
+
+    return {"countries": len(countries), "places": len(places), "border_cells": int(border.sum())}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="오프라인 역지오코딩 데이터 생성")
+    parser.add_argument("--countries", required=True, help="Natural Earth 국가 경계 shapefile (.shp)")
+    parser.add_argument("--places", required=True, help="GeoNames cities1000 CSV")
+    parser.add_argument("--korean-names", help="GeoNames cities1000 JSON (한글 별칭, 예: geonamescache)")
+    parser.add_argument("--out", default=GEODATA_DIR)
+    args = parser.parse_args()
+    print(build(args.countries, args.places, args.out, korean_names_path=args.korean_names))
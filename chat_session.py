@@ -0,0 +1,106 @@
+import html
+from collections import deque
+
+import intent_router
+
+# ✅ 세션당 보관하는 메시지 수 / 프롬프트에 넣는 이전 대화 토큰 예산
+MAX_MESSAGES = 40
+CONTEXT_TOKEN_BUDGET = 400
+SUMMARY_MAX_ITEMS = 8
+SUMMARY_ITEM_CHARS = 40
+
+# 한국어는 대략 1~2글자당 1토큰 (보수적으로 2글자당 1토큰으로 계산)
+CHARS_PER_TOKEN = 2
+
+ICONS = {
+    "user": ("https://cdn-icons-png.flaticon.com/512/1144/1144760.png", "user-message"),
+    "assistant": ("https://cdn-icons-png.flaticon.com/512/4712/4712034.png", "ai-message"),
+}
+
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def render_message(role, content):
+    """메시지 말풍선 HTML (메시지마다 한 번만 만듦)"""
+    icon_url, message_class = ICONS.get(role, ICONS["assistant"])
+    body = html.escape(content).replace("\n", "<br>")
+    return f"""
+            <div class="chat-container">
+                <img src="{icon_url}" class="chat-icon">
+                <div class="{message_class}">{body}</div>
+            </div>
+            """
+
+
+class ChatSession:
+    """
+    최근 MAX_MESSAGES개 메시지만 보관하는 대화 기록
+    밀려난 질문은 짧은 요약으로 남기고, 프롬프트에는 토큰 예산 안의 관련 대화만 넣음
+    """
+
+    def __init__(self, greeting=None, max_messages=MAX_MESSAGES):
+        self.messages = deque(maxlen=max_messages)
+        self.summary = deque(maxlen=SUMMARY_MAX_ITEMS)
+        if greeting:
+            self.add("assistant", greeting)
+
+    def add(self, role, content):
+        if len(self.messages) == self.messages.maxlen:
+            self._summarize(self.messages[0])
+        self.messages.append({
+            "role": role,
+            "content": content,
+            "tokens": estimate_tokens(content),
+            "intents": intent_router.classify(content)[0] if role == "user" else set(),
+            "html": render_message(role, content),
+        })
+
+    def _summarize(self, message):
+        """창 밖으로 밀려나는 사용자 질문을 짧게 잘라 의도와 함께 요약에 추가 (최근 SUMMARY_MAX_ITEMS개만 유지)"""
+        if message["role"] == "user":
+            self.summary.append((message["content"][:SUMMARY_ITEM_CHARS], message["intents"]))
+
+    def _turns(self):
+        """(질문, 답변) 쌍 목록 (오래된 것부터)"""
+        turns = []
+        messages = list(self.messages)
+        for question, answer in zip(messages, messages[1:]):
+            if question["role"] == "user" and answer["role"] == "assistant":
+                turns.append((question, answer))
+        return turns
+
+    def context(self, question, budget=CONTEXT_TOKEN_BUDGET):
+        """
+        프롬프트에 넣을 이전 대화
+        질문과 의도가 겹치는 이전 대화만 토큰 예산 안에서 최신순으로 채움
+        (의도가 겹치는 대화가 없는 독립적인 질문이면 빈 문자열)
+        """
+        intents = intent_router.classify(question)[0] - {"general"}
+        selected = []
+        used = 0
+        for q, a in reversed(self._turns()):
+            cost = q["tokens"] + a["tokens"]
+            if not q["intents"] & intents or used + cost > budget:
+                continue
+            selected.append(f"사용자: {q['content']}\nAI: {a['content']}")
+            used += cost
+
+        parts = []
+        summary = [content for content, summary_intents in self.summary if summary_intents & intents]
+        if summary:
+            parts.append("이전 질문 요약: " + " / ".join(summary))
+        parts.extend(reversed(selected))
+        return "\n\n".join(parts)
+
+    def history_html(self):
+        """화면에 표시할 대화 기록 HTML (최신 메시지가 위, 메시지별 HTML 재사용)"""
+        return "".join(message["html"] for message in reversed(self.messages))
+
+
+def get_session(state, key="chat_session", greeting=None):
+    """Streamlit session_state에 저장된 대화 세션 (없으면 생성)"""
+    if key not in state:
+        state[key] = ChatSession(greeting)
+    return state[key]
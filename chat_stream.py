@@ -0,0 +1,53 @@
+import threading
+import time
+from collections import deque
+
+# ✅ 최근 요청별 스트리밍 지표 (첫 토큰까지 걸린 시간, 초당 토큰 수)
+MAX_METRICS = 200
+
+_metrics = deque(maxlen=MAX_METRICS)
+_lock = threading.Lock()
+
+
+def stream_text(backend, prompt, metrics=None, **params):
+    """
+    추론 백엔드(inference_backend)의 스트리밍 응답을 토큰 문자열 단위로 내보내는 generator
+    끝나거나 중단되면 (첫 토큰 시간, 토큰 수, 초당 토큰 수)를 기록
+    metrics에 dict를 넘기면 이 요청의 지표를 채워 줌 (다른 세션의 요청과 섞이지 않음)
+    """
+    start = time.perf_counter()
+    first_token_at = None
+    n_tokens = 0
+    error = None
+    try:
+        for text in backend.stream(prompt, **params):
+            if first_token_at is None:
+                first_token_at = time.perf_counter()
+            n_tokens += 1
+            yield text
+    except Exception as e:
+        error = type(e).__name__
+        raise
+    finally:
+        end = time.perf_counter()
+        generation_seconds = end - first_token_at if first_token_at is not None else 0.0
+        record = {
+            "started_at": time.time() - (end - start),
+            "ttft": first_token_at - start if first_token_at is not None else None,
+            "total_seconds": end - start,
+            "tokens": n_tokens,
+            # 첫 토큰 이후 생성 속도 (토큰이 1개 이하면 계산 불가)
+            "tokens_per_second": (n_tokens - 1) / generation_seconds if n_tokens > 1 and generation_seconds > 0 else None,
+            "error": error,
+        }
+        if metrics is not None:
+            metrics.update(record)
+        with _lock:
+            _metrics.append(record)
+
+
+def get_metrics():
+    """최근 요청별 지표 목록 (오래된 것부터)"""
+    with _lock:
+        return list(_metrics)
+
@@ -1,10 +1,16 @@
 import streamlit as st
 import requests
-import pandas as pd
 import folium
-from streamlit_folium import st_folium, folium_static
+import streamlit.components.v1 as components
+from streamlit_folium import st_folium
 import urllib.parse
-from geopy.distance import geodesic
+
+import gazetteer
+import map_cache
+import perf
+import shelter_clusters
+from shelter_index import nearest
+from shelter_store import ShelterAPIError, get_shelters
 
 # ✅ 기존 대피소 API
 BASE_URL_1 = "https://www.safetydata.go.kr/V2/api/DSSP-IF-00706"
@@ -17,57 +23,74 @@ API_KEY_2 = st.secrets.get("API_KEY_2", "")
 encoded_key_2 = urllib.parse.quote(API_KEY_2)  # API Key 인코딩
 
 
-# ✅ 주요 도시 좌표 (시 단위 검색)
-CITY_COORDINATES = {
-    "서울특별시": (37.5665, 126.9780),
-    "부산광역시": (35.1796, 129.0756),
-    "대구광역시": (35.8714, 128.6014),
-    "인천광역시": (37.4563, 126.7052),
-    "광주광역시": (35.1595, 126.8526),
-    "대전광역시": (36.3504, 127.3845),
-    "울산광역시": (35.5384, 129.3114),
-    "세종특별자치시": (36.4801, 127.2890),
-    "경기도 수원시": (37.2636, 127.0286),
-    "경기도 성남시": (37.4202, 127.1267),
-    "경기도 용인시": (37.2411, 127.1776),
-    "강원특별자치도 춘천시": (37.8813, 127.7298),
-    "충청북도 청주시": (36.6424, 127.4891),
-    "충청남도 천안시": (36.8151, 127.1139),
-    "전라북도 전주시": (35.8242, 127.1475),
-    "전라남도 목포시": (34.8118, 126.3922),
-    "경상북도 포항시": (36.0190, 129.3435),
-    "경상남도 창원시": (35.2285, 128.6811),
-    "제주특별자치도 제주시": (33.4996, 126.5312),
+# ✅ 두 대피소 API (전체 페이지를 받아 하나의 테이블로 합친 뒤 디스크 스냅샷으로 보관)
+SHELTER_SOURCES = {
+    "DSSP-IF-00706": (BASE_URL_1, API_KEY_1),
+    "DSSP-IF-10941": (BASE_URL_2, API_KEY_2),
 }
 
-@st.cache_data  # API 데이터 캐싱
-def get_shelters(api_url, api_key):
-    """
-    API에서 대피소 데이터를 가져오는 함수 (두 개의 API 공통 사용)
-    """
-    encoded_key = urllib.parse.quote(api_key)
+# ✅ 전국 대피소 클러스터 지도
+KOREA_CENTER = (36.5, 127.8)
+CLUSTER_MAP_ZOOM = 7
+CLUSTER_MAP_SIZE = (700, 500)
+SOURCE_COLORS = {"DSSP-IF-00706": "#1f77b4", "DSSP-IF-10941": "#2ca02c"}
 
-    params = {
-        "serviceKey": encoded_key,
-        "returnType": "json",
-        "pageNo": "1",
-        "numOfRows": "5000"  # 최대한 많은 데이터 확보
-    }
 
+def cluster_layer(df, view):
+    """현재 화면 범위·줌에 보이는 클러스터 / 대피소만 담은 레이어"""
+    index = shelter_clusters.get_index(df["latitude"].to_numpy(), df["longitude"].to_numpy())
+    bounds, zoom = view.get("bounds") or {}, view.get("zoom") or CLUSTER_MAP_ZOOM
     try:
-        response = requests.get(api_url, params=params, timeout=5, verify=False)
-        response.raise_for_status()
-        data = response.json()
-
-        if data.get("header", {}).get("resultCode") != "00":
-            st.error(f"⚠️ API 오류: {data.get('header', {}).get('resultMsg')}")
-            return []
-
-        return data.get("body", [])
+        south, west = bounds["_southWest"]["lat"], bounds["_southWest"]["lng"]
+        north, east = bounds["_northEast"]["lat"], bounds["_northEast"]["lng"]
+    except (KeyError, TypeError):
+        south, west, north, east = shelter_clusters.view_bounds(KOREA_CENTER, zoom, *CLUSTER_MAP_SIZE)
+    visible = index.query(south, west, north, east, zoom)
+
+    layer = folium.FeatureGroup(name="대피소")
+    for lat, lon, count, row_id in zip(visible["lat"], visible["lon"], visible["count"], visible["id"]):
+        if row_id >= 0:
+            row = df.iloc[row_id]
+            folium.CircleMarker(
+                [lat, lon], radius=6, weight=1, fill=True, fill_opacity=0.8,
+                color=SOURCE_COLORS.get(row.get("source"), "#1f77b4"),
+                popup=f"<b>{row['쉘터이름']}</b><br>📍 {row['주소']}",
+                tooltip=row["주소"],
+            ).add_to(layer)
+        else:
+            size = 26 + 6 * len(str(count))
+            folium.Marker(
+                [lat, lon],
+                icon=folium.DivIcon(
+                    icon_size=(size, size), icon_anchor=(size // 2, size // 2),
+                    html=(f"<div style='width:{size}px;height:{size}px;line-height:{size}px;border-radius:50%;"
+                          f"background:rgba(0,123,255,0.75);color:white;text-align:center;font-weight:bold;'>{count}</div>"),
+                ),
+                tooltip=f"대피소 {count}곳 (확대하면 나뉩니다)",
+            ).add_to(layer)
+    return layer, len(visible["lat"])
+
+
+def show_shelter_clusters(df):
+    """
+    전국 대피소 지도 (기본 지도는 그대로 두고 클러스터 레이어만 화면 이동 / 확대마다 교체)
+    """
+    view = st.session_state.get("shelter_cluster_map") or {}
+    with perf.timed("shelters.clusters"):
+        layer, n_items = cluster_layer(df, view)
+
+    base_map = folium.Map(location=list(KOREA_CENTER), zoom_start=CLUSTER_MAP_ZOOM)
+    width, height = CLUSTER_MAP_SIZE
+    st_folium(
+        base_map,
+        key="shelter_cluster_map",
+        feature_group_to_add=layer,
+        returned_objects=["bounds", "zoom"],
+        width=width,
+        height=height,
+    )
+    st.caption(f"전체 대피소 {len(df):,}곳 · 현재 화면 표시 {n_items:,}개")
 
-    except requests.exceptions.RequestException as e:
-        st.error(f"⚠️ API 요청 중 오류 발생: {e}")
-        return []
 
 def run_deapi():
     st.title("🏠 전국 대피소 검색")
@@ -78,67 +101,68 @@ def run_deapi():
     
     
 
-    # ✅ 두 개의 API에서 데이터 가져오기
-    shelters_1 = get_shelters(BASE_URL_1, API_KEY_1)
-    shelters_2 = get_shelters(BASE_URL_2, API_KEY_2)
-
-    # ✅ 두 개의 데이터 합치기
-    all_shelters = shelters_1 + shelters_2
+    # ✅ 두 개의 API에서 데이터 가져오기 (로컬 스냅샷 우선, 오래되면 백그라운드 갱신)
+    try:
+        with perf.timed("safetydata.shelters"):
+            df = get_shelters(SHELTER_SOURCES)
+    except (requests.exceptions.RequestException, ShelterAPIError, ValueError) as e:
+        st.error(f"⚠️ API 요청 중 오류 발생: {e}")
+        df = None
 
-    if not all_shelters:
+    if df is None or df.empty:
         st.warning("⚠️ 전국 대피소 데이터를 불러올 수 없습니다.")
         return
 
-    df = pd.DataFrame(all_shelters)
-
-    # ✅ 필드명 변환 (위도/경도, 주소)
-    df.rename(columns={"LAT": "latitude", "LOT": "longitude", "SHLT_NM": "쉘터이름"}, inplace=True)
-
-    df["latitude"] = pd.to_numeric(df["latitude"], errors="coerce")
-    df["longitude"] = pd.to_numeric(df["longitude"], errors="coerce")
-
-    # ✅ **주소 필드 수정** ("RONA_DADDR"을 우선 사용하고, 없으면 "ADDR" 사용)
-    df["주소"] = df["RONA_DADDR"].fillna(df["ADDR"]).fillna("주소 없음")
-
-    # ✅ **대피소 이름이 없는 경우 '주소를 참고하세요'로 대체**
-    df["쉘터이름"] = df["쉘터이름"].fillna("주소를 참고하세요").astype(str)
-
-    df = df.dropna(subset=["latitude", "longitude"])
-
-    # ✅ 기본 전국 대피소 지도 표시
+    # ✅ 기본 전국 대피소 지도 표시 (줌 레벨별로 미리 묶은 클러스터 중 화면에 보이는 것만 전송)
     st.subheader("🗺️ 전국 대피소 지도")
-    
-    
+    show_shelter_clusters(df)
 
-    
-
-    st.info("📍 원하는 도시를 선택하면 해당 지역의 가장 가까운 대피소 10개를 검색합니다.")
+    st.info("📍 원하는 지역(시/도, 시/군/구, 읍/면/동)을 선택하면 해당 지역의 가장 가까운 대피소 10개를 검색합니다.")
 
-    # ✅ 검색 UI
-    selected_region = st.selectbox("📌 도시 선택", list(CITY_COORDINATES.keys()), index=0)
+    # ✅ 검색 UI (지명 사전 전체를 입력하면서 검색)
+    selected_region = st.selectbox("📌 지역 선택", gazetteer.names(), index=0)
     detail_address = st.text_input("🏠 상세 주소 (선택 사항)", placeholder="예: 삼성동 123번지")
 
     if st.button("🔍 검색"):
-        # ✅ 선택한 도시의 중심 좌표 가져오기
-        user_lat, user_lon = CITY_COORDINATES[selected_region]
-
-        # ✅ 거리 계산 후 가장 가까운 10개 대피소 찾기
-        df["거리"] = df.apply(lambda row: geodesic((user_lat, user_lon), (row["latitude"], row["longitude"])).km, axis=1)
-        closest_df = df.nsmallest(10, "거리")
+        # ✅ 선택한 지역의 좌표는 지명 사전에서 바로 가져오고, 상세 주소가 있을 때만 Nominatim(국내) 검색
+        query = f"{selected_region} {detail_address}".strip()
+        with perf.timed("geocode.address"):
+            user_lat, user_lon, resolved_name, approximate = gazetteer.resolve(
+                query, use_network=bool(detail_address.strip()), retries=1, country_codes="kr")
+        if user_lat is None:
+            st.error("❌ 주소를 찾을 수 없습니다. 올바른 주소를 입력하세요.")
+            return
+
+        # ✅ 실제로 검색에 쓰는 위치 표시 (상위 지명 중심으로 대신했으면 경고)
+        if approximate:
+            st.warning(f"⚠️ '{query}'의 정확한 좌표를 찾지 못해 '{resolved_name}' 중심에서 가까운 대피소를 검색합니다.")
+        else:
+            st.caption(f"📍 찾은 위치: {resolved_name}")
+
+        # ✅ 공간 인덱스로 가장 가까운 10개 대피소 찾기 (후보만 정확한 거리 계산)
+        with perf.timed("shelters.nearest"):
+            closest_df = nearest(df, user_lat, user_lon, k=10)
 
         # ✅ 검색된 대피소 지도
-        st.subheader(f"📍 {selected_region} 인근 대피소 10개")
-        search_map = folium.Map(location=[user_lat, user_lon], zoom_start=12)
-
-        for _, row in closest_df.iterrows():
-            folium.Marker(
-                [row["latitude"], row["longitude"]],
-                popup=f"<b>{row['쉘터이름']}</b><br>📍 {row['주소']}<br>📏 {round(row['거리'], 2)}km 거리",
-                tooltip=row["주소"],  # 🔹 마커 위에 주소 표시
-                icon=folium.Icon(color="blue", icon="info-sign")
-            ).add_to(search_map)
-
-        folium_static(search_map)
+        st.subheader(f"📍 {query} 인근 대피소 10개")
+        def build_search_map():
+            search_map = folium.Map(location=[user_lat, user_lon], zoom_start=12)
+
+            for _, row in closest_df.iterrows():
+                folium.Marker(
+                    [row["latitude"], row["longitude"]],
+                    popup=f"<b>{row['쉘터이름']}</b><br>📍 {row['주소']}<br>📏 {round(row['거리'], 2)}km 거리",
+                    tooltip=row["주소"],  # 🔹 마커 위에 주소 표시
+                    icon=folium.Icon(color="blue", icon="info-sign")
+                ).add_to(search_map)
+            return search_map
+
+        # ✅ 같은 위치·같은 대피소 결과면 렌더링한 지도 HTML 재사용
+        with perf.timed("folium.deapo"):
+            html = map_cache.get_html(
+                map_cache.version("deapo.search", user_lat, user_lon, closest_df), build_search_map
+            )
+            components.html(html, height=500, width=700)
         
         # ✅ 검색된 대피소 목록 출력 (열 너비 조정 및 스크롤 활성화)
         st.subheader("📋 가장 가까운 대피소 10개")
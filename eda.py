@@ -1,77 +1,43 @@
 import streamlit as st
+from html import escape as html_escape
 import folium
-from streamlit_folium import st_folium
-import joblib
-import pandas as pd
+import streamlit.components.v1 as components
 import requests
 from folium.plugins import HeatMap
 
-model_path = "earthquake_model.joblib"
-scaler_path = "scaler.joblib"
+import event_store
+import gazetteer
+import heat_grid
+import map_cache
+import perf
+from predictor import predict_many
 
-loaded_scaler = joblib.load(scaler_path)
-loaded_rf = joblib.load(model_path)
-
-# ✅ 1. 과거 지진 데이터를 USGS API에서 가져오기
+# ✅ 1. 과거 지진 데이터를 로컬 이벤트 저장소에서 가져오기 (USGS에서는 새 이벤트만 동기화)
 @st.cache_data(ttl=3600)
 def get_past_earthquakes(min_magnitude=4.5, start_date="2023-01-01", end_date="2024-01-01", limit=1000):
-    url = "https://earthquake.usgs.gov/fdsnws/event/1/query"
-    params = {
-        "format": "geojson",
-        "starttime": start_date,
-        "endtime": end_date,
-        "minmagnitude": min_magnitude,
-        "limit": limit,
-        "orderby": "time"
-    }
-    
     try:
-        response = requests.get(url, params=params, timeout=5)
-        response.raise_for_status()
-        data = response.json()
-    except requests.exceptions.RequestException as e:
+        with perf.timed("usgs.sync"):
+            event_store.sync(start_date, min_magnitude)
+    except (requests.exceptions.RequestException, ValueError) as e:
         st.error(f"⚠️ USGS API 요청 실패: {e}")
-        return pd.DataFrame()
-
-    earthquakes = []
-    for feature in data.get("features", []):
-        properties = feature["properties"]
-        geometry = feature["geometry"]
-        earthquakes.append({
-            "time": properties.get("time"),
-            "magnitude": properties.get("mag"),
-            "lat": geometry["coordinates"][1],
-            "lon": geometry["coordinates"][0],
-            "depth": geometry["coordinates"][2]
-        })
-    return pd.DataFrame(earthquakes)
+
+    with perf.timed("event_store.query"):
+        return event_store.query(start_date, end_date, min_magnitude, limit)
 
 # ✅ 1년간 규모 4.5 이상의 지진 데이터 가져오기
 df_earthquakes = get_past_earthquakes()
 
-# ✅ 2. 주소를 위도, 경도로 변환하는 함수
+# ✅ 2. 주소를 위도, 경도로 변환하는 함수 (지명 사전 우선, 찾지 못한 주소만 Nominatim)
 @st.cache_data(ttl=3600)
 def get_lat_lon_from_address(address, retries=3):
-    url = f"https://nominatim.openstreetmap.org/search?format=json&q={address}&limit=1&accept-language=ko"
-    headers = {"User-Agent": "Mozilla/5.0"}
-    
-    for attempt in range(retries):
-        try:
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            if data:
-                return float(data[0]["lat"]), float(data[0]["lon"])
-        except requests.exceptions.RequestException:
-            return None, None
-    return None, None
+    """(위도, 경도, 찾은 지명, 상위 지명 중심 좌표로 대신했는지 여부)"""
+    with perf.timed("geocode.address"):
+        return gazetteer.resolve(address, retries=retries)
 
 #  3. 지진 발생 확률 예측 함수
-def predict_earthquake(lat, lon, depth=10.0):
-    input_df = pd.DataFrame([[lat, lon, depth]], columns=['lat', 'lon', 'depth'])
-    input_scaled = loaded_scaler.transform(input_df)  
-    prob = loaded_rf.predict_proba(input_scaled)[0][1]  
-    return round(prob * 100, 2)
+@perf.timed("model.predict")
+def predict_earthquake(lat, lon, depth=10.0, mode=None):
+    return predict_many([lat], [lon], [depth], mode=mode)[0]
 
 
 def get_risk_level(prob):
@@ -88,6 +54,20 @@ def get_risk_level(prob):
     else:
         return "🔴 위험 (Severe Risk)", "즉시 대피소로 이동하고 비상 물품을 챙기세요."
 
+def build_heatmap():
+    """과거 지진 HeatMap 기본 지도 (사용자 위치와 무관한 부분)"""
+    real_time_map = folium.Map(location=[36.5, 127.8], zoom_start=6, tiles="OpenStreetMap")
+
+    # ✅ HeatMap 추가 (과거 1년간 지진 데이터를 육각형 격자로 묶어 셀만 전송, 데이터 버전별 캐시)
+    if not df_earthquakes.empty:
+        with perf.timed("heatmap.bin"):
+            heat_data = heat_grid.heat_data(
+                df_earthquakes["lat"].to_numpy(), df_earthquakes["lon"].to_numpy(),
+                df_earthquakes["magnitude"].to_numpy(),
+            )
+        HeatMap(heat_data, radius=12, blur=6, min_opacity=0.4).add_to(real_time_map)
+    return real_time_map
+
 def run_eda():
     # ✅ Streamlit UI 설정
     st.title("🌍 실시간 지진 예측 시스템")
@@ -95,19 +75,30 @@ def run_eda():
     # ✅ 5. 주소 입력 필드
     address = st.text_input("📍 주소를 입력하세요 (예: 서울특별시 강남구)")
 
+    # ✅ 입력한 주소로 시작하는(또는 비슷한) 지명 자동완성
+    if address and gazetteer.is_available():
+        suggestions = [name for name in gazetteer.suggest(address) if name != address]
+        if suggestions:
+            address = st.selectbox("🔎 자동완성", [address] + suggestions, index=0)
+
     # 기본 좌표 (한국 중앙)
     lat, lon = 36.5, 127.8  # 한국의 중앙 위치
     prob = None  # 예측 결과 기본값
     risk_level, advice = None, None  # 기본 위험 정보
 
     if address:
-        lat, lon = get_lat_lon_from_address(address)
+        lat, lon, resolved_name, approximate = get_lat_lon_from_address(address)
 
         # ✅ 좌표가 정상적으로 반환되지 않으면 기본 좌표 사용
         if lat is None or lon is None:
             st.error("❌ 주소를 찾을 수 없습니다. 올바른 주소를 입력하세요.")
             lat, lon = 36.5, 127.8  # 기본 좌표 유지 (에러 방지)
         else:
+            # ✅ 실제로 예측에 쓰는 위치 표시 (상위 지명 중심으로 대신했으면 경고)
+            if approximate:
+                st.warning(f"⚠️ '{address}'의 정확한 좌표를 찾지 못해 '{resolved_name}' 중심 좌표로 예측합니다.")
+            else:
+                st.caption(f"📍 찾은 위치: {resolved_name}")
             prob = predict_earthquake(lat, lon)  # 예측 실행
             risk_level, advice = get_risk_level(prob)
 
@@ -122,17 +113,17 @@ def run_eda():
 
     # ✅ 좌표가 유효할 때만 지도 생성
     if lat is not None and lon is not None:
-        real_time_map = folium.Map(location=[lat, lon], zoom_start=6, tiles="OpenStreetMap")
-
-        # ✅ HeatMap 추가 (과거 1년간 지진 데이터 활용)
-        if not df_earthquakes.empty:
-            heat_data = df_earthquakes[['lat', 'lon', 'magnitude']].values.tolist()
-            HeatMap(heat_data, radius=12, blur=6, min_opacity=0.4).add_to(real_time_map)
-
-        # ✅ 사용자 위치 마커 추가
-        if address and lat is not None and lon is not None:
-            folium.Marker([lat, lon], popup=f"📍 {address}", icon=folium.Icon(color="red")).add_to(real_time_map)
-
-        st_folium(real_time_map, height=500, width=700)
+        with perf.timed("folium.eda"):
+            # ✅ HeatMap 지도는 지진 데이터 버전별로 한 번만 렌더링해 캐시
+            html = map_cache.get_html(
+                map_cache.version("eda.heatmap", df_earthquakes[["lat", "lon", "magnitude"]], heat_grid.DEFAULT_CELL_DEG),
+                build_heatmap,
+            )
+
+            # ✅ 사용자 위치 마커와 보기 위치만 요청마다 덧붙임
+            markers = []
+            if address:
+                markers.append({"lat": lat, "lon": lon, "popup": f"📍 {html_escape(address)}", "color": "red"})
+            components.html(map_cache.with_overlays(html, markers, center=(lat, lon)), height=500, width=700)
     else:
         st.error("🚨 지도 생성을 위한 유효한 좌표가 없습니다. 올바른 주소를 입력하세요.")
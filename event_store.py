@@ -0,0 +1,216 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from usgs_stream import fetch_earthquakes
+
+# ✅ USGS 이벤트를 이벤트 id 기준으로 저장하는 로컬 SQLite 저장소
+EVENT_DB_PATH = os.environ.get("EVENT_DB_PATH", "earthquake_events.db")
+
+# 같은 프로세스에서 이 간격(초) 안에 다시 동기화하지 않음
+MIN_SYNC_INTERVAL = 60
+
+EVENT_COLUMNS = ["id", "time", "updated", "magnitude", "place", "lat", "lon", "depth"]
+
+_write_lock = threading.Lock()
+
+
+def _connect(path=None):
+    conn = sqlite3.connect(path or EVENT_DB_PATH, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS events (
+            id TEXT PRIMARY KEY,
+            time INTEGER NOT NULL,
+            updated INTEGER NOT NULL,
+            magnitude REAL,
+            place TEXT,
+            lat REAL,
+            lon REAL,
+            depth REAL
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS events_time ON events (time)")
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+    return conn
+
+
+@contextmanager
+def _open(path=None):
+    """트랜잭션 단위로 커밋하고 연결을 닫음"""
+    conn = _connect(path)
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _to_millis(date):
+    """'YYYY-MM-DD' 문자열 / datetime → UTC 기준 epoch 밀리초"""
+    if isinstance(date, (int, float)):
+        return int(date)
+    if isinstance(date, str):
+        date = datetime.strptime(date, "%Y-%m-%d")
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return int(date.timestamp() * 1000)
+
+
+def _to_iso(millis):
+    return datetime.fromtimestamp(millis / 1000, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3]
+
+
+def _get_meta(conn):
+    return dict(conn.execute("SELECT key, value FROM meta").fetchall())
+
+
+def _set_meta(conn, **values):
+    conn.executemany(
+        "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+        [(key, str(value)) for key, value in values.items()],
+    )
+
+
+# ✅ 1. USGS에서 이벤트 가져오기
+def fetch_events(params, timeout=15):
+    """USGS FDSN 쿼리 결과를 저장소 컬럼 형식의 DataFrame으로 반환 (페이지 단위 스트리밍)"""
+    # 저장소는 규모 필터를 정확히 비교해야 하므로 float64로 받음
+    return fetch_earthquakes({**params, "orderby": "time-asc"}, with_ids=True, float_code="d", timeout=timeout)
+
+
+def _upsert(conn, df):
+    """새 이벤트는 추가, 이미 있는 이벤트는 더 최근에 갱신된 경우에만 덮어씀"""
+    conn.executemany("""
+        INSERT INTO events (id, time, updated, magnitude, place, lat, lon, depth)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET
+            time = excluded.time, updated = excluded.updated, magnitude = excluded.magnitude,
+            place = excluded.place, lat = excluded.lat, lon = excluded.lon, depth = excluded.depth
+        WHERE excluded.updated >= events.updated
+    """, df[EVENT_COLUMNS].itertuples(index=False, name=None))
+
+
+# ✅ 2. 증분 동기화
+def sync(start_date, min_magnitude=4.5, force=False, path=None):
+    """
+    저장소가 start_date 이후 / min_magnitude 이상 이벤트를 모두 갖도록 갱신
+    - 처음이거나 범위가 넓어진 경우에만 새로 필요한 구간(앞쪽 기간 / 낮은 규모 구간)을 내려받고
+    - 그 외에는 마지막으로 저장한 갱신 시각 이후 바뀐 이벤트만 가져옴 (updatedafter)
+    반환값: 이번에 내려받은 이벤트 수
+    """
+    start_ms = _to_millis(start_date)
+    now_ms = int(time.time() * 1000)
+
+    with _write_lock, _open(path) as conn:
+        meta = _get_meta(conn)
+        coverage_start = int(meta["coverage_start"]) if "coverage_start" in meta else None
+        floor = float(meta["min_magnitude"]) if "min_magnitude" in meta else None
+        last_updated = int(meta["last_updated"]) if "last_updated" in meta else None
+        last_sync = float(meta.get("last_sync", 0))
+
+        covered = coverage_start is not None and coverage_start <= start_ms and floor <= min_magnitude
+        if covered and not force and time.time() - last_sync < MIN_SYNC_INTERVAL:
+            return 0
+
+        fetched = []
+        if coverage_start is None:
+            # 저장소가 비었음 → 요청 구간 전체 받기
+            coverage_start, floor = start_ms, min_magnitude
+            fetched.append(fetch_events({
+                "starttime": _to_iso(coverage_start),
+                "minmagnitude": floor,
+            }))
+        else:
+            if min_magnitude < floor:
+                # 더 작은 규모까지 필요 → 저장된 구간에서 새 규모 구간만 받기 (이미 있는 이벤트는 다시 받지 않음)
+                fetched.append(fetch_events({
+                    "starttime": _to_iso(coverage_start),
+                    "minmagnitude": min_magnitude,
+                    "maxmagnitude": floor,
+                }))
+                floor = min_magnitude
+            if start_ms < coverage_start:
+                # 앞쪽 구간만 채우기
+                fetched.append(fetch_events({
+                    "starttime": _to_iso(start_ms),
+                    "endtime": _to_iso(coverage_start),
+                    "minmagnitude": floor,
+                }))
+                coverage_start = start_ms
+            # 마지막 동기화 이후 새로 생기거나 수정된 이벤트만
+            fetched.append(fetch_events({
+                "starttime": _to_iso(coverage_start),
+                "updatedafter": _to_iso(last_updated or coverage_start),
+                "minmagnitude": floor,
+            }))
+
+        count = 0
+        for df in fetched:
+            if df.empty:
+                continue
+            _upsert(conn, df)
+            count += len(df)
+            last_updated = max(last_updated or 0, int(df["updated"].max()))
+
+        _set_meta(
+            conn,
+            coverage_start=coverage_start,
+            min_magnitude=floor,
+            last_updated=last_updated or now_ms,
+            last_sync=time.time(),
+        )
+        return count
+
+
+# ✅ 3. 저장소에서 조회
+def query(start_date=None, end_date=None, min_magnitude=None, limit=None,
+          columns=("time", "magnitude", "lat", "lon", "depth"), path=None):
+    """시간 구간 / 최소 규모 조건에 맞는 이벤트를 최신순으로 반환"""
+    sql = f"SELECT {', '.join(columns)} FROM events WHERE 1 = 1"
+    args = []
+    if start_date is not None:
+        sql += " AND time >= ?"
+        args.append(_to_millis(start_date))
+    if end_date is not None:
+        sql += " AND time < ?"
+        args.append(_to_millis(end_date))
+    if min_magnitude is not None:
+        sql += " AND magnitude >= ?"
+        args.append(min_magnitude)
+    sql += " ORDER BY time DESC"
+    if limit is not None:
+        sql += " LIMIT ?"
+        args.append(int(limit))
+
+    with _open(path) as conn:
+        return pd.read_sql_query(sql, conn, params=args)
+
+
+# ✅ 4. 학습용 CSV 내보내기
+# USGS는 starttime이 없으면 최근 30일을 조회하므로, 기간을 주지 않으면 그만큼 동기화
+USGS_DEFAULT_DAYS = 30
+
+
+def export_csv(save_path="global_earthquakes.csv", min_magnitude=3.5, days=None, limit=10000, path=None):
+    """
+    저장소를 갱신한 뒤 규모 min_magnitude 이상 최신 이벤트 limit개를
+    학습 데이터 형식(time, magnitude, place, lat, lon, depth)으로 저장
+    (days를 주면 최근 days일로 제한, 없으면 저장소 전체에서 최신순)
+    """
+    now = datetime.now(timezone.utc)
+    sync(now - timedelta(days=days or USGS_DEFAULT_DAYS), min_magnitude, path=path)
+    start_date = now - timedelta(days=days) if days else None
+    df = query(start_date, None, min_magnitude, limit,
+               columns=("time", "magnitude", "place", "lat", "lon", "depth"), path=path)
+    df.to_csv(save_path, index=False, encoding="utf-8")
+    return df
+
+if __name__ == "__main__":
+    df = export_csv()
+    print(f"✅ {len(df)}건의 지진 데이터를 'global_earthquakes.csv' 파일로 저장했습니다.")
@@ -0,0 +1,148 @@
+"""
+테스트용 로컬 추론 서버 (Hugging Face text-generation-inference 형식)
+
+- POST /  {"inputs": ..., "parameters": {...}, "stream": true/false}
+- stream=true 이면 토큰마다 Server-Sent Events 로 전송
+- POST /v1/chat/completions  OpenAI 호환 형식 (stream=true 이면 choices[0].delta 이벤트, 마지막에 [DONE])
+- 같은 입력에는 항상 같은 답변 (네트워크 / API 토큰 없이 챗봇 동작과 스트리밍 지표 확인용)
+
+사용 예:
+    python fake_inference_server.py --port 8080 --token-delay 0.02
+    HF_INFERENCE_URL=http://127.0.0.1:8080 streamlit run app.py
+    INFERENCE_BACKEND=openai OPENAI_BASE_URL=http://127.0.0.1:8080/v1 streamlit run app.py
+"""
+import argparse
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CANNED_ANSWERS = [
+    "지진이 발생하면 먼저 탁자 아래로 들어가 머리를 보호하세요. 흔들림이 멈추면 전기와 가스를 차단하고, "
+    "문을 열어 출구를 확보한 뒤 계단을 이용해 넓은 공터로 대피하세요.",
+    "비상 물품으로는 물, 비상식량, 손전등, 휴대용 라디오, 응급 키트, 여벌 옷과 담요를 준비하세요. "
+    "가족과 만날 장소와 연락 방법도 미리 정해 두세요.",
+    "해안가에서 강한 흔들림을 느끼거나 쓰나미 경보가 발령되면 즉시 높은 지대나 지정된 대피소로 이동하세요. "
+    "경보가 해제될 때까지 해안으로 돌아가지 마세요.",
+]
+
+
+def fake_answer(prompt):
+    """입력에 따라 정해진 답변 (같은 입력이면 항상 같은 답변)"""
+    digest = hashlib.sha1(prompt.encode("utf-8")).digest()
+    return CANNED_ANSWERS[digest[0] % len(CANNED_ANSWERS)]
+
+
+def tokenize(text):
+    """공백을 앞 단어에 붙인 단순 토큰 분리"""
+    return re.findall(r"\S+\s*", text)
+
+
+class FakeInferenceHandler(BaseHTTPRequestHandler):
+    first_token_delay = 0.1
+    token_delay = 0.02
+
+    def log_message(self, format, *args):  # 요청 로그 출력 안 함
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        if self.path.rstrip("/").endswith("/chat/completions"):
+            self._chat_completions(payload)
+            return
+
+        prompt = payload.get("inputs", "")
+        max_new_tokens = int((payload.get("parameters") or {}).get("max_new_tokens") or 520)
+        tokens = tokenize(fake_answer(prompt))[:max_new_tokens]
+
+        if not payload.get("stream"):
+            time.sleep(self.first_token_delay + self.token_delay * len(tokens))
+            self._send_json([{"generated_text": "".join(tokens)}])
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        time.sleep(self.first_token_delay)
+        for i, text in enumerate(tokens):
+            self._send_event({"index": i, "token": {"id": i, "text": text, "logprob": 0.0, "special": False},
+                              "generated_text": None, "details": None})
+            time.sleep(self.token_delay)
+        self._send_event({"index": len(tokens), "token": {"id": 1, "text": "<eos>", "logprob": 0.0, "special": True},
+                          "generated_text": "".join(tokens),
+                          "details": {"finish_reason": "eos_token", "generated_tokens": len(tokens), "seed": None}})
+
+    def _chat_completions(self, payload):
+        """OpenAI 호환 응답 (마지막 메시지 내용을 입력으로 사용)"""
+        messages = payload.get("messages") or [{}]
+        prompt = messages[-1].get("content", "")
+        tokens = tokenize(fake_answer(prompt))[:int(payload.get("max_tokens") or 520)]
+        model = payload.get("model", "fake")
+
+        if not payload.get("stream"):
+            time.sleep(self.first_token_delay + self.token_delay * len(tokens))
+            self._send_json({"object": "chat.completion", "model": model, "choices": [{
+                "index": 0, "message": {"role": "assistant", "content": "".join(tokens)}, "finish_reason": "stop",
+            }]})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        time.sleep(self.first_token_delay)
+        for text in tokens:
+            self._send_event({"object": "chat.completion.chunk", "model": model, "choices": [{
+                "index": 0, "delta": {"content": text}, "finish_reason": None,
+            }]})
+            time.sleep(self.token_delay)
+        self._send_event({"object": "chat.completion.chunk", "model": model, "choices": [{
+            "index": 0, "delta": {}, "finish_reason": "stop",
+        }]})
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def _send_event(self, data):
+        self.wfile.write(b"data:" + json.dumps(data, ensure_ascii=False).encode("utf-8") + b"\n\n")
+        self.wfile.flush()
+
+    def _send_json(self, data):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start(host="127.0.0.1", port=0, first_token_delay=0.1, token_delay=0.02):
+    """백그라운드 스레드로 서버 시작 → (server, url), 끝나면 server.shutdown()"""
+    handler = type("Handler", (FakeInferenceHandler,), {
+        "first_token_delay": first_token_delay,
+        "token_delay": token_delay,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, name="fake-inference", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="테스트용 로컬 추론 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--first-token-delay", type=float, default=0.1)
+    parser.add_argument("--token-delay", type=float, default=0.02)
+    args = parser.parse_args()
+
+    server, url = start(args.host, args.port, args.first_token_delay, args.token_delay)
+    print(f"가짜 추론 서버 실행 중: {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
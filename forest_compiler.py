@@ -0,0 +1,206 @@
+import threading
+import time
+
+import numpy as np
+
+from model_registry import get_model, get_scaler
+
+# 한 번에 평가할 최대 샘플 수 (노드 인덱스 행렬 메모리 제한)
+CHUNK_SIZE = 4096
+
+_compiled = None
+_compiled_key = None
+_lock = threading.Lock()
+
+
+# ✅ 1. 스케일러를 임계값에 합치기
+def _float_keys(values):
+    """float64 값을 크기 순서가 보존되는 int64 키로 변환"""
+    bits = values.view(np.int64)
+    return np.where(bits >= 0, bits, -(bits & 0x7FFFFFFFFFFFFFFF))
+
+
+def _key_floats(keys):
+    bits = np.where(keys >= 0, keys, (-keys) | np.int64(-0x8000000000000000))
+    return bits.view(np.float64)
+
+
+def _fold_thresholds(thresholds, mean, scale):
+    """
+    스케일된 임계값 t를 원본 좌표 임계값 x*로 변환
+    sklearn 트리는 입력을 float32로 바꿔 비교하므로
+    float32((x - mean) / scale) <= t 를 만족하는 가장 큰 float64 x를 이분 탐색으로 찾음
+    → x <= x* 비교 결과가 원래 경로와 정확히 일치
+    """
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    max_float = np.finfo(np.float64).max
+    lo = np.full(thresholds.shape, _float_keys(np.array([-max_float]))[0])
+    hi = np.full(thresholds.shape, _float_keys(np.array([max_float]))[0])
+
+    with np.errstate(over="ignore", invalid="ignore"):
+        # 불변식: lo는 조건을 만족, hi는 조건을 만족하지 않음 (양 끝은 경계값으로 처리)
+        for _ in range(66):
+            active = hi - 1 > lo
+            if not active.any():
+                break
+            # (lo + hi) // 2 를 오버플로 없이 계산
+            mid = (lo >> 1) + (hi >> 1) + (lo & hi & 1)
+            x = _key_floats(mid)
+            goes_left = ((x - mean) / scale).astype(np.float32) <= thresholds
+            lo = np.where(active & goes_left, mid, lo)
+            hi = np.where(active & ~goes_left, mid, hi)
+
+    return _key_floats(lo)
+
+
+# ✅ 2. 랜덤포레스트를 연속 배열로 평탄화
+class CompiledForest:
+    """
+    학습된 RandomForestClassifier + StandardScaler를 배열 기반 평가기로 변환
+    (feature / threshold / children / leaf value 배열, 원본 lat/lon/depth를 바로 입력)
+    """
+
+    def __init__(self, model, scaler=None):
+        n_features = model.n_features_in_
+        mean = np.zeros(n_features) if scaler is None or scaler.mean_ is None else scaler.mean_
+        scale = np.ones(n_features) if scaler is None or scaler.scale_ is None else scaler.scale_
+
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            is_leaf = tree.children_left == -1
+            node_ids = np.arange(n_nodes)
+
+            feature = np.where(is_leaf, 0, tree.feature).astype(np.intp)
+            threshold = np.full(n_nodes, np.inf)
+            for f in range(n_features):
+                mask = ~is_leaf & (feature == f)
+                threshold[mask] = _fold_thresholds(tree.threshold[mask], mean[f], scale[f])
+
+            # 리프 노드는 자기 자신을 가리키게 하여 반복 중 제자리에 머물도록 함
+            left = np.where(is_leaf, node_ids, tree.children_left) + offset
+            right = np.where(is_leaf, node_ids, tree.children_right) + offset
+
+            # DecisionTreeClassifier.predict_proba와 같은 방식으로 정규화
+            value = tree.value[:, 0, :estimator.n_classes_].astype(np.float64)
+            normalizer = value.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            value = value / normalizer
+
+            features.append(feature)
+            thresholds.append(threshold)
+            lefts.append(left)
+            rights.append(right)
+            values.append(value)
+            roots.append(offset)
+            offset += n_nodes
+            max_depth = max(max_depth, tree.max_depth)
+
+        self.feature = np.ascontiguousarray(np.concatenate(features))
+        self.threshold = np.ascontiguousarray(np.concatenate(thresholds))
+        self.left = np.ascontiguousarray(np.concatenate(lefts))
+        self.right = np.ascontiguousarray(np.concatenate(rights))
+        self.value = np.ascontiguousarray(np.concatenate(values))
+        self.roots = np.asarray(roots, dtype=np.intp)
+        self.max_depth = max_depth
+        self.n_features = n_features
+        self.classes_ = model.classes_
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.feature, self.threshold, self.left, self.right, self.value, self.roots))
+
+    def _leaves(self, X):
+        """각 샘플이 트리별로 도달하는 리프 노드 인덱스 (n_samples, n_trees)"""
+        rows = np.arange(X.shape[0])[:, np.newaxis]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], self.roots.size))
+        for _ in range(self.max_depth):
+            goes_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            next_nodes = np.where(goes_left, self.left[nodes], self.right[nodes])
+            # 모든 샘플이 리프에 도달하면 (노드가 더 이상 바뀌지 않으면) 조기 종료
+            if np.array_equal(next_nodes, nodes):
+                break
+            nodes = next_nodes
+        return nodes
+
+    def predict_proba(self, X):
+        """원본 좌표 입력 X (n_samples, n_features)에 대한 클래스 확률"""
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        proba = np.zeros((X.shape[0], self.value.shape[1]))
+
+        for start in range(0, X.shape[0], CHUNK_SIZE):
+            leaves = self._leaves(X[start:start + CHUNK_SIZE])
+            out = proba[start:start + CHUNK_SIZE]
+            # RandomForestClassifier와 같은 순서로 누적해야 결과가 비트 단위로 일치
+            for t in range(leaves.shape[1]):
+                out += self.value[leaves[:, t]]
+
+        proba /= self.roots.size
+        return proba
+
+
+# ✅ 3. 레지스트리 모델 기준으로 한 번만 컴파일
+def get_compiled_forest():
+    """레지스트리의 현재 모델/스케일러로 컴파일된 평가기 (모델이 바뀌면 다시 컴파일)"""
+    global _compiled, _compiled_key
+    model, scaler = get_model(), get_scaler()
+    key = (id(model), id(scaler))
+    if _compiled_key == key:
+        return _compiled
+
+    with _lock:
+        if _compiled_key != key:
+            _compiled = CompiledForest(model, scaler)
+            _compiled_key = key
+    return _compiled
+
+
+def _benchmark(n_single=200, n_batch=10000, seed=42):
+    """sklearn 경로와 컴파일된 평가기의 속도 / 결과 일치 여부 비교"""
+    import pandas as pd
+
+    model, scaler = get_model(), get_scaler()
+    start = time.perf_counter()
+    compiled = get_compiled_forest()
+    compile_seconds = time.perf_counter() - start
+
+    rng = np.random.default_rng(seed)
+    X = np.column_stack([
+        rng.uniform(-90, 90, n_batch),
+        rng.uniform(-180, 180, n_batch),
+        rng.uniform(0, 700, n_batch),
+    ])
+    columns = ["lat", "lon", "depth"]
+
+    def sklearn_proba(rows):
+        return model.predict_proba(scaler.transform(pd.DataFrame(rows, columns=columns)))
+
+    start = time.perf_counter()
+    for row in X[:n_single]:
+        sklearn_proba(row[np.newaxis])
+    sklearn_single = (time.perf_counter() - start) / n_single
+
+    start = time.perf_counter()
+    for row in X[:n_single]:
+        compiled.predict_proba(row[np.newaxis])
+    compiled_single = (time.perf_counter() - start) / n_single
+
+    start = time.perf_counter()
+    expected = sklearn_proba(X)
+    sklearn_batch = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = compiled.predict_proba(X)
+    compiled_batch = time.perf_counter() - start
+
+    print(f"컴파일: {compile_seconds * 1000:.1f} ms, 배열 크기 {compiled.nbytes / 1024:.0f} KB")
+    print(f"단일 예측: sklearn {sklearn_single * 1e6:.0f} µs / compiled {compiled_single * 1e6:.0f} µs")
+    print(f"{n_batch}건 일괄 예측: sklearn {sklearn_batch * 1000:.1f} ms / compiled {compiled_batch * 1000:.1f} ms")
+    print(f"결과 일치: {np.array_equal(expected, actual)}")
+
+
+if __name__ == "__main__":
+    _benchmark()
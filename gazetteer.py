@@ -0,0 +1,216 @@
+import bisect
+import difflib
+import os
+import re
+import threading
+import time
+
+import pandas as pd
+import requests
+
+# ✅ 번들 지명 사전 (build_gazetteer.py로 생성)
+GAZETTEER_PATH = os.environ.get(
+    "GAZETTEER_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "geodata", "kr_gazetteer.csv.gz"),
+)
+NOMINATIM_SEARCH_URL = "https://nominatim.openstreetmap.org/search"
+REQUEST_TIMEOUT = 10
+
+# 시도 약칭 / 옛 명칭 → 현재 명칭
+SIDO_ALIASES = {
+    "서울": "서울특별시", "서울시": "서울특별시",
+    "부산": "부산광역시", "부산시": "부산광역시",
+    "대구": "대구광역시", "대구시": "대구광역시",
+    "인천": "인천광역시", "인천시": "인천광역시",
+    "광주": "광주광역시", "광주시": "광주광역시",
+    "대전": "대전광역시", "대전시": "대전광역시",
+    "울산": "울산광역시", "울산시": "울산광역시",
+    "세종": "세종특별자치시", "세종시": "세종특별자치시",
+    "경기": "경기도",
+    "강원": "강원특별자치도", "강원도": "강원특별자치도",
+    "충북": "충청북도", "충남": "충청남도",
+    "전북": "전북특별자치도", "전라북도": "전북특별자치도",
+    "전남": "전라남도", "경북": "경상북도", "경남": "경상남도",
+    "제주": "제주특별자치도", "제주도": "제주특별자치도",
+}
+
+_index = None
+_lock = threading.Lock()
+
+
+def _compact(text):
+    return re.sub(r"\s+", "", str(text))
+
+
+# ✅ 1. 정렬된 키 배열 인덱스 (최초 1회)
+def _load():
+    """
+    지명마다 (전체 이름, 시군구+읍면동, 읍면동, 시군구) 키를 만들어 정렬
+    접두어 검색은 bisect, 오타 검색은 difflib로 처리
+    """
+    global _index
+    if _index is None:
+        with _lock:
+            if _index is None:
+                table = pd.read_csv(GAZETTEER_PATH, dtype={"code": str}, keep_default_na=False,
+                                    na_values={"lat": [""], "lon": [""]})
+                names = (table["sido"] + " " + table["sigungu"] + " " + table["dong"]).str.split().str.join(" ")
+                levels = (table["sigungu"] != "").astype(int) + (table["dong"] != "").astype(int)
+
+                by_name = {name: i for i, name in enumerate(names)}
+                parents = []
+                for sido, sigungu, dong in zip(table["sido"], table["sigungu"], table["dong"]):
+                    if dong:
+                        parent = by_name.get(f"{sido} {sigungu}".strip())
+                    elif sigungu:
+                        # "수원시 장안구" → "수원시" → 시도
+                        parent = by_name.get(f"{sido} {sigungu.split()[0]}") if " " in sigungu else None
+                        parent = parent if parent is not None else by_name.get(sido)
+                    else:
+                        parent = None
+                    parents.append(parent)
+
+                pairs = set()
+                for i, (sigungu, dong) in enumerate(zip(table["sigungu"], table["dong"])):
+                    keys = {_compact(names[i])}
+                    if dong:
+                        keys |= {_compact(sigungu + dong), dong}
+                        if " " in sigungu:
+                            keys.add(sigungu.split()[-1] + dong)
+                    elif sigungu:
+                        keys |= {_compact(sigungu), sigungu.split()[-1]}
+                    pairs |= {(key, i) for key in keys}
+                pairs = sorted(pairs)
+
+                _index = {
+                    "names": names.tolist(),
+                    "levels": levels.to_numpy(),
+                    "lats": table["lat"].to_numpy(dtype=float),
+                    "lons": table["lon"].to_numpy(dtype=float),
+                    "parents": parents,
+                    "keys": [key for key, _ in pairs],
+                    "ids": [i for _, i in pairs],
+                    "unique_keys": sorted({key for key, _ in pairs}),
+                }
+    return _index
+
+
+def is_available():
+    """번들 지명 사전이 있는지 여부"""
+    return os.path.exists(GAZETTEER_PATH)
+
+
+def _normalize(query):
+    """첫 단어의 시도 약칭을 정식 명칭으로 바꾸고 공백 제거"""
+    tokens = str(query).split()
+    if tokens and tokens[0] in SIDO_ALIASES:
+        tokens[0] = SIDO_ALIASES[tokens[0]]
+    return _compact(" ".join(tokens))
+
+
+def names():
+    """전체 지명 목록 (시도 → 시군구 → 읍면동 순서)"""
+    return list(_load()["names"])
+
+
+# ✅ 2. 자동완성 (접두어 → 오타 보정 순서)
+def suggest(query, limit=10):
+    """입력 중인 주소로 시작하는 지명 목록, 없으면 비슷한 지명 목록"""
+    index = _load()
+    key = _normalize(query)
+    if not key:
+        return []
+
+    keys, ids = index["keys"], index["ids"]
+    start = bisect.bisect_left(keys, key)
+    end = bisect.bisect_left(keys, key + "\uffff")
+    matches = set(ids[start:end])
+
+    if not matches:
+        for close in difflib.get_close_matches(key, index["unique_keys"], n=limit, cutoff=0.6):
+            start = bisect.bisect_left(keys, close)
+            end = bisect.bisect_right(keys, close + "\uffff")
+            matches |= set(ids[start:end])
+
+    ranked = sorted(matches, key=lambda i: (index["levels"][i], len(index["names"][i]), index["names"][i]))
+    return [index["names"][i] for i in ranked[:limit]]
+
+
+def _match(address):
+    """주소 앞부분과 가장 길게 일치하는 지명 (지명 번호, 남은 주소 길이)"""
+    index = _load()
+    key = _normalize(address)
+    keys, ids = index["keys"], index["ids"]
+    for length in range(len(key), 0, -1):
+        position = bisect.bisect_left(keys, key[:length])
+        if position < len(keys) and keys[position] == key[:length]:
+            # 같은 키가 여러 지명이면 상위 행정구역 우선
+            end = bisect.bisect_right(keys, key[:length])
+            best = min(ids[position:end], key=lambda i: (index["levels"][i], i))
+            return best, len(key) - length
+    return None, len(key)
+
+
+def _coordinates(entry):
+    """지명 또는 좌표가 있는 가장 가까운 상위 지명의 (위도, 경도, 이름)"""
+    index = _load()
+    while entry is not None:
+        if index["lats"][entry] == index["lats"][entry]:  # NaN이 아니면
+            return float(index["lats"][entry]), float(index["lons"][entry]), index["names"][entry]
+        entry = index["parents"][entry]
+    return None, None, None
+
+
+# ✅ 3. Nominatim (지명 사전으로 찾을 수 없는 주소만)
+def search_nominatim(query, retries=3, country_codes=None):
+    """
+    Nominatim 주소 검색 (위도, 경도), 요청 실패 시 잠시 기다렸다 재시도
+    country_codes를 주면 그 나라 안에서만 검색 (예: "kr")
+    """
+    params = {"format": "json", "q": query, "limit": 1, "accept-language": "ko"}
+    if country_codes:
+        params["countrycodes"] = country_codes
+    headers = {"User-Agent": "Mozilla/5.0"}
+    for attempt in range(retries):
+        try:
+            response = requests.get(NOMINATIM_SEARCH_URL, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+            data = response.json()
+            if data:
+                return float(data[0]["lat"]), float(data[0]["lon"])
+            return None, None
+        except (requests.exceptions.RequestException, ValueError):
+            if attempt < retries - 1:
+                time.sleep(1.0 * (attempt + 1))
+    return None, None
+
+
+def resolve(address, use_network=True, retries=3, country_codes=None):
+    """
+    주소 → (위도, 경도, 찾은 지명, 근사 여부)
+    - 지명 사전에서 읍면동까지 찾았거나, 남은 주소 없이 좌표가 있는 지명이면 바로 반환
+    - 그 밖에는 Nominatim으로 검색하고 (country_codes로 나라 제한), 실패하면 지명 사전의 (상위) 좌표 사용
+      (이때는 입력한 주소가 아닌 상위 지명의 중심이므로 근사 여부 True)
+    """
+    entry = None
+    remaining = len(_compact(address))
+    if is_available():
+        entry, remaining = _match(address)
+        if entry is not None:
+            index = _load()
+            has_coordinates = index["lats"][entry] == index["lats"][entry]
+            if has_coordinates and (remaining == 0 or index["levels"][entry] == 2):
+                return _coordinates(entry) + (False,)
+
+    if use_network:
+        lat, lon = search_nominatim(address, retries, country_codes)
+        if lat is not None:
+            return lat, lon, address, False
+
+    lat, lon, name = _coordinates(entry)
+    return lat, lon, name, lat is not None
+
+
+def geocode(address, use_network=True, retries=3, country_codes=None):
+    """주소 → (위도, 경도, 찾은 지명) (resolve 참고)"""
+    return resolve(address, use_network, retries, country_codes)[:3]
@@ -0,0 +1,154 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+import requests
+
+# ✅ 역지오코딩 결과를 좌표 격자 단위로 저장하는 디스크 캐시
+GEOCODE_DB_PATH = os.environ.get("GEOCODE_DB_PATH", "geocode_cache.db")
+NOMINATIM_REVERSE_URL = "https://nominatim.openstreetmap.org/reverse"
+
+# 소수점 2자리 반올림 (약 1km 격자)
+CELL_PRECISION = 2
+
+# Nominatim 사용 정책: 초당 1회 이하
+MIN_REQUEST_INTERVAL = 1.0
+REQUEST_TIMEOUT = 10
+
+# reverse()가 결과를 기다리는 최대 시간 (대기열이 길어도 화면이 멈추지 않도록)
+RESULT_TIMEOUT = 30
+
+_memory = {}
+_pending = {}
+_pending_lock = threading.Lock()
+_queue = queue.Queue()
+_worker = None
+_db_lock = threading.Lock()
+
+
+def cell_key(lat, lon, precision=CELL_PRECISION):
+    """좌표를 반올림한 격자 키"""
+    return f"{round(float(lat), precision):.{precision}f},{round(float(lon), precision):.{precision}f}"
+
+
+# ✅ 1. 디스크 캐시
+def _connect():
+    conn = sqlite3.connect(GEOCODE_DB_PATH, timeout=30)
+    conn.execute("CREATE TABLE IF NOT EXISTS labels (cell TEXT PRIMARY KEY, address TEXT, fetched_at REAL)")
+    return conn
+
+
+def _load_cached(cell):
+    with _db_lock:
+        conn = _connect()
+        try:
+            row = conn.execute("SELECT address FROM labels WHERE cell = ?", (cell,)).fetchone()
+        finally:
+            conn.close()
+    if row is None:
+        return False, None
+    return True, json.loads(row[0]) if row[0] else None
+
+
+def _store(cell, address):
+    with _db_lock:
+        conn = _connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO labels (cell, address, fetched_at) VALUES (?, ?, ?)",
+                    (cell, json.dumps(address, ensure_ascii=False) if address else None, time.time()),
+                )
+        finally:
+            conn.close()
+
+
+# ✅ 2. 요청 속도를 제한하는 단일 워커
+def _request_address(lat, lon):
+    """Nominatim 역지오코딩 (주소가 없는 해상 지점이면 None)"""
+    params = {"format": "json", "lat": lat, "lon": lon, "accept-language": "ko"}
+    headers = {"User-Agent": "Mozilla/5.0"}
+    response = requests.get(NOMINATIM_REVERSE_URL, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return response.json().get("address") or None
+
+
+def _run_worker():
+    last_request = 0.0
+    while True:
+        cell, lat, lon = _queue.get()
+        future = _pending.get(cell)
+
+        wait = MIN_REQUEST_INTERVAL - (time.monotonic() - last_request)
+        if wait > 0:
+            time.sleep(wait)
+        last_request = time.monotonic()
+
+        try:
+            address = _request_address(lat, lon)
+            _memory[cell] = address
+            try:
+                _store(cell, address)
+            except sqlite3.Error:  # 디스크 캐시에 쓰지 못해도 결과는 돌려줌
+                pass
+            future.set_result(address)
+        except Exception as e:  # 어떤 오류든 기다리는 쪽에 전달하고 워커는 계속 실행
+            future.set_exception(e)
+        finally:
+            with _pending_lock:
+                _pending.pop(cell, None)
+            _queue.task_done()
+
+
+def _ensure_worker():
+    global _worker
+    with _pending_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run_worker, name="nominatim-worker", daemon=True)
+            _worker.start()
+
+
+def request(lat, lon):
+    """
+    좌표의 주소를 Future로 반환
+    캐시에 있으면 바로 완료된 Future, 같은 격자 요청이 대기 중이면 그 Future를 공유
+    """
+    cell = cell_key(lat, lon)
+    if cell in _memory:
+        future = Future()
+        future.set_result(_memory[cell])
+        return future
+
+    found, address = _load_cached(cell)
+    if found:
+        _memory[cell] = address
+        future = Future()
+        future.set_result(address)
+        return future
+
+    _ensure_worker()
+    with _pending_lock:
+        future = _pending.get(cell)
+        if future is None:
+            future = Future()
+            _pending[cell] = future
+            _queue.put((cell, lat, lon))
+    return future
+
+
+# ✅ 3. 조회 / 일괄 미리 가져오기
+def reverse(lat, lon, timeout=RESULT_TIMEOUT):
+    """좌표의 Nominatim 주소 dict (실패하거나 주소가 없거나 timeout초 안에 못 받으면 None)"""
+    try:
+        return request(lat, lon).result(timeout=timeout)
+    except Exception:
+        return None
+
+
+def prefetch(coords):
+    """여러 좌표의 주소를 워커 큐에 미리 넣어둠 (기다리지 않고 Future 목록 반환)"""
+    return [request(lat, lon) for lat, lon in coords]
@@ -0,0 +1,129 @@
+import numpy as np
+from geopy.distance import geodesic
+
+# ✅ WGS84 타원체 / 평균 지구 반지름
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+WGS84_B = (1 - WGS84_F) * WGS84_A
+EARTH_RADIUS_KM = 6371.0088
+
+# geopy(Karney) 대비 허용 오차 (미터) - validate()로 확인
+TOLERANCE_M = {np.float64: 0.001, np.float32: 10.0}
+
+
+def _prepare(lat1, lon1, lat2, lon2, dtype):
+    arrays = [np.asarray(v, dtype=dtype) for v in (lat1, lon1, lat2, lon2)]
+    return np.broadcast_arrays(*arrays)
+
+
+def pairwise(origin_lats, origin_lons, lats, lons):
+    """여러 출발점 × 여러 지점 계산용 (m, 1) / (1, n) 형태로 변환 → 결과 (m, n)"""
+    return (
+        np.asarray(origin_lats)[:, np.newaxis],
+        np.asarray(origin_lons)[:, np.newaxis],
+        np.asarray(lats)[np.newaxis, :],
+        np.asarray(lons)[np.newaxis, :],
+    )
+
+
+# ✅ 1. 구면 거리 (haversine)
+def haversine_km(lat1, lon1, lat2, lon2, dtype=np.float64):
+    """두 지점(또는 배열) 사이의 구면 거리 (km), 입력은 브로드캐스팅"""
+    lat1, lon1, lat2, lon2 = (np.radians(v) for v in _prepare(lat1, lon1, lat2, lon2, dtype))
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    h = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return (2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(h, 1)))).astype(dtype)
+
+
+# ✅ 2. 타원체 거리 (Vincenty 역해, 벡터화)
+def geodesic_km(lat1, lon1, lat2, lon2, dtype=np.float64, max_iter=200):
+    """
+    WGS84 타원체 위의 거리 (km), geopy.distance.geodesic과 같은 기준
+    수렴하지 않는 대척점 근처 쌍만 geopy(Karney)로 다시 계산
+    """
+    lat1, lon1, lat2, lon2 = _prepare(lat1, lon1, lat2, lon2, dtype)
+    a, b, f = dtype(WGS84_A), dtype(WGS84_B), dtype(WGS84_F)
+    tol = 1e-12 if dtype == np.float64 else 1e-6
+
+    L = np.radians(np.remainder(lon2 - lon1 + 180, 360) - 180).astype(dtype)
+    U1 = np.arctan((1 - f) * np.tan(np.radians(lat1)))
+    U2 = np.arctan((1 - f) * np.tan(np.radians(lat2)))
+    sinU1, cosU1 = np.sin(U1), np.cos(U1)
+    sinU2, cosU2 = np.sin(U2), np.cos(U2)
+
+    lam = L
+    converged = np.zeros(L.shape, dtype=bool)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for _ in range(max_iter):
+            sin_lam, cos_lam = np.sin(lam), np.cos(lam)
+            sin_sigma = np.sqrt((cosU2 * sin_lam) ** 2 + (cosU1 * sinU2 - sinU1 * cosU2 * cos_lam) ** 2)
+            cos_sigma = sinU1 * sinU2 + cosU1 * cosU2 * cos_lam
+            sigma = np.arctan2(sin_sigma, cos_sigma)
+            sin_alpha = np.where(sin_sigma == 0, 0, cosU1 * cosU2 * sin_lam / sin_sigma)
+            cos2_alpha = 1 - sin_alpha ** 2
+            # 적도 위의 두 점이면 cos2_alpha = 0
+            cos_2sigma_m = np.where(cos2_alpha == 0, 0, cos_sigma - 2 * sinU1 * sinU2 / cos2_alpha)
+            C = f / 16 * cos2_alpha * (4 + f * (4 - 3 * cos2_alpha))
+            lam_prev = lam
+            lam = L + (1 - C) * f * sin_alpha * (
+                sigma + C * sin_sigma * (cos_2sigma_m + C * cos_sigma * (-1 + 2 * cos_2sigma_m ** 2))
+            )
+            converged = np.abs(lam - lam_prev) <= tol
+            if converged.all():
+                break
+
+    u2 = cos2_alpha * (a ** 2 - b ** 2) / b ** 2
+    A = 1 + u2 / 16384 * (4096 + u2 * (-768 + u2 * (320 - 175 * u2)))
+    B = u2 / 1024 * (256 + u2 * (-128 + u2 * (74 - 47 * u2)))
+    delta_sigma = B * sin_sigma * (cos_2sigma_m + B / 4 * (
+        cos_sigma * (-1 + 2 * cos_2sigma_m ** 2)
+        - B / 6 * cos_2sigma_m * (-3 + 4 * sin_sigma ** 2) * (-3 + 4 * cos_2sigma_m ** 2)
+    ))
+    distance = (b * A * (sigma - delta_sigma) / 1000).astype(dtype)
+    distance = np.where(sin_sigma == 0, dtype(0), distance)
+
+    # 수렴 실패(대척점 부근)만 Karney 알고리즘으로 계산
+    failed = ~converged | ~np.isfinite(distance)
+    if failed.any():
+        distance = np.array(distance, copy=True)
+        for idx in map(tuple, np.argwhere(failed)):
+            distance[idx] = geodesic((lat1[idx], lon1[idx]), (lat2[idx], lon2[idx])).km
+    return distance
+
+
+# ✅ 3. geopy 대비 정확도 검증
+def validate(n_points=20000, seed=42, max_km=None):
+    """임의 지점 쌍에서 geopy.distance.geodesic 대비 최대 오차(미터)를 측정"""
+    rng = np.random.default_rng(seed)
+    lat1, lat2 = rng.uniform(-89, 89, (2, n_points))
+    lon1, lon2 = rng.uniform(-180, 180, (2, n_points))
+    if max_km is not None:
+        # 짧은 거리 위주 검증 (대피소 검색 범위)
+        lat2 = np.clip(lat1 + rng.uniform(-1, 1, n_points) * max_km / 111, -89, 89)
+        lon2 = lon1 + rng.uniform(-1, 1, n_points) * max_km / 111
+
+    expected = np.array([geodesic((a, b), (c, d)).km for a, b, c, d in zip(lat1, lon1, lat2, lon2)])
+    result = {}
+    for dtype in (np.float64, np.float32):
+        error_m = np.abs(geodesic_km(lat1, lon1, lat2, lon2, dtype=dtype).astype(np.float64) - expected) * 1000
+        result[dtype.__name__] = {
+            "max_error_m": float(error_m.max()),
+            "tolerance_m": TOLERANCE_M[dtype],
+            "ok": bool(error_m.max() <= TOLERANCE_M[dtype]),
+        }
+    return result
+
+
+if __name__ == "__main__":
+    import time
+
+    print("전 세계 임의 쌍:", validate())
+    print("100km 이내 쌍:", validate(max_km=100))
+
+    rng = np.random.default_rng(0)
+    lats, lons = rng.uniform(33, 38.5, 100000), rng.uniform(125, 130, 100000)
+    for dtype in (np.float64, np.float32):
+        start = time.perf_counter()
+        geodesic_km(37.5665, 126.9780, lats, lons, dtype=dtype)
+        print(f"{dtype.__name__}: 10만 개 지점 거리 {(time.perf_counter() - start) * 1000:.1f} ms")
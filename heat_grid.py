@@ -0,0 +1,100 @@
+import hashlib
+import threading
+
+import numpy as np
+
+# ✅ 히트맵 육각형 격자 크기 (도 단위, 중심 간 거리 ≈ 셀 크기 × √3)
+DEFAULT_CELL_DEG = 0.5
+
+_SQRT3 = np.sqrt(3.0)
+_KEY_OFFSET = 1 << 30
+_KEY_BASE = 1 << 31
+
+_cache = {}
+_lock = threading.Lock()
+MAX_CACHED = 8
+
+
+def data_version(*arrays):
+    """좌표·가중치 배열의 해시 (데이터가 바뀌면 격자를 다시 계산)"""
+    digest = hashlib.sha1()
+    for array in arrays:
+        digest.update(np.ascontiguousarray(array, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+# ✅ 1. 위경도 → 육각형 셀 (axial 좌표, 평면 근사)
+def hex_cells(lats, lons, cell_deg=DEFAULT_CELL_DEG):
+    """각 점이 속한 뾰족한 위쪽(pointy-top) 육각형 셀의 (q, r) 정수 좌표"""
+    x = np.asarray(lons, dtype=np.float64) / cell_deg
+    y = np.asarray(lats, dtype=np.float64) / cell_deg
+    q = (_SQRT3 / 3 * x - y / 3)
+    r = (2 / 3 * y)
+
+    # 큐브 좌표 반올림 (가장 가까운 육각형 중심)
+    s = -q - r
+    rq, rr, rs = np.rint(q), np.rint(r), np.rint(s)
+    dq, dr, ds = np.abs(rq - q), np.abs(rr - r), np.abs(rs - s)
+    fix_q = (dq > dr) & (dq > ds)
+    fix_r = ~fix_q & (dr > ds)
+    rq = np.where(fix_q, -rr - rs, rq)
+    rr = np.where(fix_r, -rq - rs, rr)
+    return rq.astype(np.int64), rr.astype(np.int64)
+
+
+def cell_centers(q, r, cell_deg=DEFAULT_CELL_DEG):
+    """육각형 셀 중심의 (위도, 경도)"""
+    lons = cell_deg * (_SQRT3 * q + _SQRT3 / 2 * r)
+    lats = cell_deg * (1.5 * r)
+    return lats, lons
+
+
+# ✅ 2. 셀별 집계 (규모 가중)
+def bin_points(lats, lons, weights, cell_deg=DEFAULT_CELL_DEG):
+    """
+    점들을 육각형 셀로 묶어 (셀 중심 위도, 경도, 가중치 합, 점 개수) 배열 반환
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    valid = np.isfinite(lats) & np.isfinite(lons) & np.isfinite(weights)
+    lats, lons, weights = lats[valid], lons[valid], weights[valid]
+    if lats.size == 0:
+        empty = np.empty(0)
+        return empty, empty, empty, np.empty(0, dtype=np.int64)
+
+    # (q, r)를 하나의 정수 키로 합쳐 1차원 unique (2차원 unique보다 훨씬 빠름)
+    q, r = hex_cells(lats, lons, cell_deg)
+    keys, inverse = np.unique((q + _KEY_OFFSET) * _KEY_BASE + (r + _KEY_OFFSET), return_inverse=True)
+    totals = np.bincount(inverse, weights=weights)
+    counts = np.bincount(inverse)
+
+    q, r = keys // _KEY_BASE - _KEY_OFFSET, keys % _KEY_BASE - _KEY_OFFSET
+    center_lats, center_lons = cell_centers(q, r, cell_deg)
+    center_lons = (center_lons + 180.0) % 360.0 - 180.0  # 날짜변경선 밖으로 나간 셀 중심 보정
+    return center_lats, center_lons, totals, counts
+
+
+def heat_data(lats, lons, weights, cell_deg=DEFAULT_CELL_DEG):
+    """
+    folium HeatMap에 넣을 [[위도, 경도, 강도], ...] (셀 단위)
+    강도는 셀별 규모 합을 로그 스케일로 0~1 정규화 (큰 셀이 나머지를 가리지 않도록)
+    데이터 버전과 격자 크기별로 캐시
+    """
+    key = (data_version(lats, lons, weights), cell_deg)
+    cached = _cache.get(key)
+    if cached is not None:
+        return cached
+
+    center_lats, center_lons, totals, _ = bin_points(lats, lons, weights, cell_deg)
+    if totals.size:
+        intensity = np.log1p(totals) / np.log1p(totals.max())
+    else:
+        intensity = totals
+    data = np.column_stack([center_lats, center_lons, intensity]).round(4).tolist()
+
+    with _lock:
+        if len(_cache) >= MAX_CACHED:
+            _cache.pop(next(iter(_cache)))
+        _cache[key] = data
+    return data
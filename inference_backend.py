@@ -0,0 +1,196 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import requests
+
+# ✅ 추론 백엔드 설정 (hf: Hugging Face API, openai: OpenAI 호환 로컬 서버, fake: 결정적 가짜 응답)
+BACKEND = os.environ.get("INFERENCE_BACKEND", "hf")
+MODEL_ID = os.environ.get("HF_INFERENCE_URL", "google/gemma-2-9b-it")
+OPENAI_BASE_URL = os.environ.get("OPENAI_BASE_URL", "http://127.0.0.1:8080/v1")
+OPENAI_MODEL = os.environ.get("OPENAI_MODEL", "gemma-2-9b-it")
+
+# 요청 시간 제한 (초)
+TIMEOUT = float(os.environ.get("INFERENCE_TIMEOUT", "60"))
+
+# ✅ 프로세스 전체 동시 요청 수 / 대기열 길이 / 대기 시간 제한
+MAX_CONCURRENT = int(os.environ.get("INFERENCE_MAX_CONCURRENT", "4"))
+MAX_QUEUE = int(os.environ.get("INFERENCE_MAX_QUEUE", "16"))
+QUEUE_TIMEOUT = float(os.environ.get("INFERENCE_QUEUE_TIMEOUT", "30"))
+
+
+class BackendBusy(Exception):
+    """동시 요청이 가득 차 대기열에도 들어갈 수 없거나 대기 시간이 초과됨"""
+
+
+# ✅ 1. 동시 요청 제한 (모든 세션·백엔드가 공유)
+_slots = threading.BoundedSemaphore(MAX_CONCURRENT)
+_queue_lock = threading.Lock()
+_waiting = 0
+_stats = {"requests": 0, "waited": 0, "rejected": 0, "timeouts": 0}
+
+
+@contextmanager
+def slot(on_wait=None, timeout=QUEUE_TIMEOUT):
+    """
+    추론 요청 하나의 실행 자리
+    자리가 없으면 on_wait(앞에 기다리는 요청 수)를 호출한 뒤 대기, 대기열이 가득 차거나 시간이 초과되면 BackendBusy
+    """
+    global _waiting
+    if not _slots.acquire(blocking=False):
+        with _queue_lock:
+            if _waiting >= MAX_QUEUE:
+                _stats["rejected"] += 1
+                raise BackendBusy(f"대기 중인 요청이 너무 많습니다 ({_waiting}건)")
+            ahead = _waiting
+            _waiting += 1
+            _stats["waited"] += 1
+        try:
+            if on_wait is not None:
+                on_wait(ahead)
+            acquired = _slots.acquire(timeout=timeout)
+        finally:
+            with _queue_lock:
+                _waiting -= 1
+        if not acquired:
+            with _queue_lock:
+                _stats["timeouts"] += 1
+            raise BackendBusy(f"{timeout:.0f}초 동안 차례가 오지 않았습니다")
+
+    with _queue_lock:
+        _stats["requests"] += 1
+    try:
+        yield
+    finally:
+        _slots.release()
+
+
+def get_stats():
+    """처리한 요청 / 대기했던 요청 / 거절 / 대기 시간 초과 횟수와 현재 대기 수"""
+    with _queue_lock:
+        return dict(_stats, waiting=_waiting, max_concurrent=MAX_CONCURRENT, max_queue=MAX_QUEUE)
+
+
+# ✅ 2. 백엔드 (generate: 전체 답변 문자열, stream: 토큰 문자열 generator)
+class HuggingFaceBackend:
+    """Hugging Face 추론 API (또는 text-generation-inference 서버 URL)"""
+
+    def __init__(self, model=MODEL_ID, token=None, timeout=TIMEOUT):
+        from huggingface_hub import InferenceClient
+
+        self.name = f"hf:{model}"
+        self.client = InferenceClient(model=model, api_key=token, timeout=timeout)
+
+    def generate(self, prompt, **params):
+        return self.client.text_generation(prompt, **params)
+
+    def stream(self, prompt, **params):
+        for output in self.client.text_generation(prompt, stream=True, details=True, **params):
+            if output.token.special:  # <eos> 같은 특수 토큰은 표시하지 않음
+                continue
+            yield output.token.text
+
+
+class OpenAICompatibleBackend:
+    """OpenAI 호환 /chat/completions 서버 (vLLM, llama.cpp, Ollama 등 로컬 서버)"""
+
+    def __init__(self, base_url=OPENAI_BASE_URL, model=OPENAI_MODEL, token=None, timeout=TIMEOUT):
+        self.name = f"openai:{model}@{base_url}"
+        self.url = base_url.rstrip("/") + "/chat/completions"
+        self.model = model
+        self.timeout = timeout
+        self.session = requests.Session()  # 연결 재사용
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+
+    def _payload(self, prompt, stream, max_new_tokens=None, **params):
+        payload = {"model": self.model, "messages": [{"role": "user", "content": prompt}], "stream": stream}
+        if max_new_tokens is not None:
+            payload["max_tokens"] = max_new_tokens
+        payload.update(params)
+        return payload
+
+    def generate(self, prompt, **params):
+        response = self.session.post(self.url, json=self._payload(prompt, False, **params), timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()["choices"][0]["message"]["content"]
+
+    def stream(self, prompt, **params):
+        with self.session.post(self.url, json=self._payload(prompt, True, **params),
+                               timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():  # SSE는 charset 없이 오는 경우가 많아 직접 UTF-8로 디코딩
+                line = line.decode("utf-8")
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                text = json.loads(data)["choices"][0].get("delta", {}).get("content")
+                if text:
+                    yield text
+
+
+class FakeBackend:
+    """네트워크 없이 입력마다 정해진 답변을 내는 결정적 백엔드 (테스트·부하 측정용)"""
+
+    def __init__(self, token=None, first_token_delay=0.0, token_delay=0.0):  # token은 사용하지 않음
+        self.name = "fake"
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+
+    def _tokens(self, prompt, max_new_tokens=None, **params):
+        from fake_inference_server import fake_answer, tokenize
+
+        tokens = tokenize(fake_answer(prompt))
+        return tokens[:max_new_tokens] if max_new_tokens else tokens
+
+    def generate(self, prompt, **params):
+        tokens = self._tokens(prompt, **params)
+        time.sleep(self.first_token_delay + self.token_delay * len(tokens))
+        return "".join(tokens)
+
+    def stream(self, prompt, **params):
+        time.sleep(self.first_token_delay)
+        for text in self._tokens(prompt, **params):
+            yield text
+            time.sleep(self.token_delay)
+
+
+BACKENDS = {
+    "hf": HuggingFaceBackend,
+    "openai": OpenAICompatibleBackend,
+    "fake": FakeBackend,
+}
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def get_backend(kind=BACKEND, **options):
+    """설정별로 프로세스당 한 번만 만든 백엔드 (모든 Streamlit 세션·재실행이 연결을 공유)"""
+    key = (kind, tuple(sorted(options.items())))
+    backend = _backends.get(key)
+    if backend is not None:
+        return backend
+
+    with _backends_lock:
+        if key not in _backends:
+            if kind not in BACKENDS:
+                raise ValueError(f"알 수 없는 추론 백엔드: {kind} (가능: {', '.join(BACKENDS)})")
+            _backends[key] = BACKENDS[kind](**options)
+        return _backends[key]
+
+
+# ✅ 3. 동시 요청 제한을 적용한 호출
+def generate(backend, prompt, on_wait=None, **params):
+    with slot(on_wait):
+        return backend.generate(prompt, **params)
+
+
+def stream(backend, prompt, on_wait=None, **params):
+    """스트리밍이 끝나거나 중단될 때까지 자리를 차지하는 토큰 generator"""
+    with slot(on_wait):
+        yield from backend.stream(prompt, **params)
@@ -0,0 +1,111 @@
+from collections import deque
+
+# ✅ 의도별 키워드 (챗봇이 답할 수 있는 지진 관련 질문인지 + 어떤 주제인지)
+INTENT_KEYWORDS = {
+    "general": ["지진", "진도", "진앙", "지진예측", "지진 대책", "지진 안정", "지진 대응", "지진 대처", "지진 행동 요령"],
+    "preparedness": ["지진 대비", "대처방법", "안전", "안전수칙", "키트", "응급처치", "대비 물품"],
+    "evacuation": ["대피소", "대피", "대피 장소", "안전한 장소", "안전한장소"],
+    "after": ["구조 활동", "지진 발생 후", "2차피해"],
+    "tsunami": ["쓰나미"],
+    "seismic_design": ["내진설계", "내진 설계"],
+    "psychological": ["심리적", "충격"],
+}
+
+
+class AhoCorasick:
+    """여러 키워드를 한 번의 텍스트 순회로 찾는 Aho-Corasick 오토마톤 (키워드 → 라벨)"""
+
+    def __init__(self, keyword_labels):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+
+        for keyword, labels in keyword_labels.items():
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                state = next_state
+            self._output[state] = self._output[state] + ((keyword, frozenset(labels)),)
+
+        # 너비 우선으로 실패 링크 연결 (실패 상태의 출력도 합쳐 둠)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find(self, text):
+        """텍스트에 나타난 (키워드, 라벨) 목록 (나타난 순서)"""
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        matches = []
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                matches.extend(output[state])
+        return matches
+
+
+def _keyword_labels(intent_keywords):
+    keyword_labels = {}
+    for intent, keywords in intent_keywords.items():
+        for keyword in keywords:
+            keyword_labels.setdefault(keyword, set()).add(intent)
+    return keyword_labels
+
+
+# ✅ 앱 시작 시 한 번만 생성
+_automaton = AhoCorasick(_keyword_labels(INTENT_KEYWORDS))
+
+
+def classify(text):
+    """질문에서 찾은 (의도 집합, 키워드 목록)"""
+    matches = _automaton.find(text)
+    intents = set()
+    for _, labels in matches:
+        intents |= labels
+    return intents, [keyword for keyword, _ in matches]
+
+
+def is_related(text):
+    """지진 관련 키워드가 하나라도 있는지"""
+    return bool(_automaton.find(text))
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    # 키워드 수를 늘려도 오토마톤 검색 시간은 거의 그대로, 단순 `in` 검색은 키워드 수에 비례
+    random.seed(0)
+    syllables = [chr(code) for code in range(0xAC00, 0xAC00 + 400)]
+    text = "지진 발생 후 심리적 충격을 어떻게 극복할 수 있나요? " * 4
+    for n_keywords in (30, 300, 3000):
+        keywords = [kw for kws in INTENT_KEYWORDS.values() for kw in kws]
+        keywords += ["".join(random.choices(syllables, k=3)) for _ in range(n_keywords - len(keywords))]
+        automaton = AhoCorasick({keyword: {"x"} for keyword in keywords})
+
+        repeat = 2000
+        start = time.perf_counter()
+        for _ in range(repeat):
+            automaton.find(text)
+        automaton_us = (time.perf_counter() - start) / repeat * 1e6
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            [keyword for keyword in keywords if keyword in text]
+        scan_us = (time.perf_counter() - start) / repeat * 1e6
+        print(f"키워드 {n_keywords:>5}개: 오토마톤 {automaton_us:7.1f} µs / 선형 검색 {scan_us:7.1f} µs")
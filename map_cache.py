@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import folium
+import pandas as pd
+
+import perf
+
+# ✅ 렌더링한 지도 HTML 캐시 (메모리 LRU + 디스크)
+MAP_CACHE_DIR = os.environ.get("MAP_CACHE_DIR", "map_cache")
+MAX_MEMORY_ENTRIES = 32
+
+_memory = OrderedDict()
+_stats = {"memory_hits": 0, "disk_hits": 0, "renders": 0}
+_lock = threading.Lock()
+
+_MAP_VAR = re.compile(r"var (map_[0-9a-f]+) = L\.map\(")
+
+
+def version(*parts):
+    """지도 입력(DataFrame, 배열, 보기 설정 값)의 해시 → 캐시 키 (folium 버전이 바뀌어도 새로 렌더링)"""
+    digest = hashlib.sha1(folium.__version__.encode("utf-8"))
+    for part in parts:
+        if isinstance(part, pd.DataFrame):
+            digest.update(pd.util.hash_pandas_object(part, index=False).to_numpy().tobytes())
+            digest.update(repr(list(part.columns)).encode("utf-8"))
+        else:
+            digest.update(repr(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _disk_path(key):
+    return os.path.join(MAP_CACHE_DIR, f"{key}.html")
+
+
+def get_html(key, build):
+    """
+    key에 해당하는 지도 HTML (메모리 → 디스크 → build()로 folium.Map을 만들어 렌더링 순서로 찾음)
+    """
+    with _lock:
+        html = _memory.get(key)
+        if html is not None:
+            _memory.move_to_end(key)
+            _stats["memory_hits"] += 1
+    if html is not None:
+        perf.record_cache("map_html", True)
+        return html
+
+    path = _disk_path(key)
+    try:
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        source = "disk_hits"
+    except OSError:
+        html = build().get_root().render()
+        source = "renders"
+        try:
+            os.makedirs(MAP_CACHE_DIR, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(html)
+            os.replace(tmp_path, path)
+        except OSError:  # 디스크에 쓰지 못해도 메모리 캐시는 사용
+            pass
+
+    perf.record_cache("map_html", source == "disk_hits")
+    with _lock:
+        _stats[source] += 1
+        _memory[key] = html
+        _memory.move_to_end(key)
+        while len(_memory) > MAX_MEMORY_ENTRIES:
+            _memory.popitem(last=False)
+    return html
+
+
+def get_stats():
+    """메모리 적중 / 디스크 적중 / 새로 렌더링한 횟수와 메모리 항목 수"""
+    with _lock:
+        return dict(_stats, size=len(_memory))
+
+
+def clear(disk=False):
+    with _lock:
+        _memory.clear()
+        for name in _stats:
+            _stats[name] = 0
+    if disk and os.path.isdir(MAP_CACHE_DIR):
+        for name in os.listdir(MAP_CACHE_DIR):
+            if name.endswith(".html"):
+                os.remove(os.path.join(MAP_CACHE_DIR, name))
+
+
+# ✅ 요청별 오버레이 (캐시된 지도 위에 마커 / 보기 위치만 덧붙임)
+def with_overlays(html, markers=(), center=None, zoom=None):
+    """
+    캐시된 지도 HTML에 사용자별 마커와 보기 위치를 스크립트로 추가
+    markers: [{"lat", "lon", "popup"(HTML), "tooltip", "color", "icon"}, ...]
+    """
+    match = _MAP_VAR.search(html)
+    if match is None or (not markers and center is None):
+        return html
+    map_var = match.group(1)
+
+    lines = []
+    if center is not None:
+        lines.append(f"{map_var}.setView({json.dumps(list(center))}, {json.dumps(zoom)} || {map_var}.getZoom());")
+    for marker in markers:
+        icon = json.dumps({"markerColor": marker.get("color", "red"), "iconColor": "white",
+                           "icon": marker.get("icon", "info-sign"), "prefix": "glyphicon"})
+        line = f"L.marker({json.dumps([marker['lat'], marker['lon']])}, {{icon: L.AwesomeMarkers.icon({icon})}})"
+        if marker.get("popup"):
+            line += f".bindPopup({json.dumps(marker['popup'])})"
+        if marker.get("tooltip"):
+            line += f".bindTooltip({json.dumps(marker['tooltip'])})"
+        lines.append(line + f".addTo({map_var});")
+
+    # 지도 생성 스크립트가 모두 실행된 뒤에 추가 (</script>가 들어가지 않도록 JSON은 이스케이프)
+    script = "\n<script>\n" + "\n".join(lines).replace("</", "<\\/") + "\n</script>\n"
+    end = html.rfind("</html>")
+    return html[:end] + script + html[end:] if end != -1 else html + script
@@ -0,0 +1,206 @@
+import hashlib
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+
+import joblib
+
+# ✅ 앱에서 사용하는 모델 아티팩트 경로
+ARTIFACT_PATHS = {
+    "model": "earthquake_model.joblib",
+    "scaler": "scaler.joblib",
+}
+
+# ✅ train.py로 학습한 버전 중 현재 사용할 버전을 가리키는 파일 (있으면 ARTIFACT_PATHS 대신 사용)
+MODEL_DIR = os.environ.get("MODEL_DIR", "models")
+ACTIVE_POINTER_PATH = os.path.join(MODEL_DIR, "active.json")
+RELOAD_CHECK_INTERVAL = float(os.environ.get("MODEL_RELOAD_INTERVAL", "5"))
+
+# ✅ 아티팩트가 참조하는 라이브러리 (로드 측정 전에 따로 import해 import 비용을 분리)
+PRELOAD_MODULES = ("sklearn.ensemble", "sklearn.preprocessing")
+
+# ✅ 메모리 맵 로딩 (예: MODEL_MMAP_MODE=r) → 여러 워커 프로세스가 같은 페이지를 공유
+MMAP_MODE = os.environ.get("MODEL_MMAP_MODE") or None
+
+_artifacts = {}
+_load_stats = {}
+_import_stats = {}
+_versions = {}
+_active = {"paths": None, "mtime_ns": None, "checked": 0.0}
+_lock = threading.Lock()
+
+
+def _rss_bytes():
+    """현재 프로세스의 상주 메모리(RSS) 크기 (바이트)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        # macOS는 바이트, 리눅스는 KB 단위 (최대 RSS 기준)
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss if sys.platform == "darwin" else rss * 1024
+
+
+# ✅ 재시작 없이 새 버전으로 교체 (active.json이 바뀌면 다음 호출에서 다시 로드)
+def _read_pointer():
+    try:
+        mtime_ns = os.stat(ACTIVE_POINTER_PATH).st_mtime_ns
+        with open(ACTIVE_POINTER_PATH, encoding="utf-8") as f:
+            pointer = json.load(f)
+        base = os.path.dirname(ACTIVE_POINTER_PATH)
+        paths = {name: os.path.join(base, pointer["artifacts"][name]) for name in ARTIFACT_PATHS}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None, None
+    return paths, mtime_ns
+
+
+def check_for_update(force=False):
+    """
+    active.json의 변경 여부를 RELOAD_CHECK_INTERVAL초마다 확인하고
+    가리키는 버전이 바뀌었으면 로드된 아티팩트를 비움 (바뀌었으면 True)
+    """
+    now = time.monotonic()
+    if not force and now - _active["checked"] < RELOAD_CHECK_INTERVAL:
+        return False
+    _active["checked"] = now
+
+    paths, mtime_ns = _read_pointer()
+    if mtime_ns == _active["mtime_ns"]:
+        return False
+    with _lock:
+        changed = paths != _active["paths"]
+        _active.update(paths=paths, mtime_ns=mtime_ns)
+        if changed:
+            _artifacts.clear()
+            _load_stats.clear()
+    return changed
+
+
+def artifact_path(name):
+    """현재 사용 중인 아티팩트 파일 경로 (active.json이 없으면 기본 경로)"""
+    paths = _active["paths"]
+    return paths[name] if paths else ARTIFACT_PATHS[name]
+
+
+def content_hash(paths):
+    """파일 내용을 순서대로 이은 해시 (모델 버전 이름)"""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def activate(version_dir):
+    """
+    train.py가 만든 버전 디렉터리를 사용 버전으로 지정 (active.json을 원자적으로 교체)
+    실행 중인 앱은 RELOAD_CHECK_INTERVAL초 안에 새 버전을 로드
+    """
+    base = os.path.dirname(ACTIVE_POINTER_PATH)
+    pointer = {
+        "version": os.path.basename(os.path.normpath(version_dir)),
+        "artifacts": {name: os.path.relpath(os.path.join(version_dir, os.path.basename(path)), base)
+                      for name, path in ARTIFACT_PATHS.items()},
+    }
+    os.makedirs(base, exist_ok=True)
+    tmp_path = f"{ACTIVE_POINTER_PATH}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(pointer, f, indent=2)
+    os.replace(tmp_path, ACTIVE_POINTER_PATH)
+    check_for_update(force=True)
+    return pointer
+
+
+def _preload_modules():
+    """PRELOAD_MODULES를 한 번만 import하고 걸린 시간 / 메모리 증가량을 따로 기록"""
+    if _import_stats:
+        return
+    rss_before = _rss_bytes()
+    start = time.perf_counter()
+    for module in PRELOAD_MODULES:
+        importlib.import_module(module)
+    _import_stats.update(
+        modules=list(PRELOAD_MODULES),
+        load_seconds=round(time.perf_counter() - start, 4),
+        rss_delta_bytes=max(_rss_bytes() - rss_before, 0),
+    )
+
+
+def get_artifact(name, mmap_mode=MMAP_MODE):
+    """
+    아티팩트를 프로세스당 한 번만 로드해 모든 Streamlit 세션이 공유
+    (최초 호출 시점에 로드하며 로드 시간과 메모리 증가량을 기록)
+    """
+    check_for_update()
+    artifact = _artifacts.get(name)
+    if artifact is not None:
+        return artifact
+
+    with _lock:
+        if name in _artifacts:
+            return _artifacts[name]
+
+        _preload_modules()
+        path = artifact_path(name)
+        rss_before = _rss_bytes()
+        start = time.perf_counter()
+        artifact = joblib.load(path, mmap_mode=mmap_mode)
+        load_seconds = time.perf_counter() - start
+
+        _load_stats[name] = {
+            "path": path,
+            "mmap_mode": mmap_mode,
+            "file_bytes": os.path.getsize(path),
+            "load_seconds": round(load_seconds, 4),
+            "rss_delta_bytes": max(_rss_bytes() - rss_before, 0),
+        }
+        _artifacts[name] = artifact
+        return artifact
+
+
+def get_model():
+    return get_artifact("model")
+
+
+def get_scaler():
+    return get_artifact("scaler")
+
+
+def get_model_version(names=("model", "scaler")):
+    """모델/스케일러 파일 내용 해시 (사전 계산 결과물의 버전 태그로 사용)"""
+    check_for_update()
+    paths = [artifact_path(name) for name in names]
+    key = tuple((path, os.stat(path).st_mtime_ns, os.path.getsize(path)) for path in paths)
+    if key not in _versions:
+        _versions[key] = content_hash(paths)
+    return _versions[key]
+
+
+def get_load_stats():
+    """
+    로드된 아티팩트별 로드 시간 / 메모리 사용량 (콜드 스타트 비용 추적용)
+    라이브러리 import 비용은 "imports" 항목으로 따로 기록
+    """
+    stats = {name: dict(stats) for name, stats in _load_stats.items()}
+    if _import_stats:
+        stats["imports"] = dict(_import_stats)
+    return stats
+
+
+def clear():
+    """로드된 아티팩트를 모두 비움 (다음 호출 시 다시 로드)"""
+    with _lock:
+        _artifacts.clear()
+        _load_stats.clear()
+
+
+if __name__ == "__main__":
+    get_scaler()
+    get_model()
+    for name, stats in get_load_stats().items():
+        print(f"{name}: {stats}")
@@ -1,52 +1,35 @@
 import streamlit as st
 import folium
-from streamlit_folium import st_folium
-import joblib
+import streamlit.components.v1 as components
 import pandas as pd
 import requests
 from folium.plugins import HeatMap
 from datetime import datetime, timedelta
 
-# ✅ 1. 저장된 모델 불러오기
-loaded_rf = joblib.load("earthquake_model.joblib")
-loaded_scaler = joblib.load("scaler.joblib")
+import event_store
+import geocode_cache
+import map_cache
+import offline_geocoder
+import perf
 
+# ✅ 1. 저장된 모델 불러오기 (predictor 모듈에서 한 번만 로드)
+from predictor import predict_many
 
 
-# ✅ 현재 날짜를 기반으로 실시간 데이터 요청
+
+# ✅ 현재 날짜를 기반으로 실시간 데이터 요청 (로컬 이벤트 저장소에서 조회)
 def get_past_earthquakes(min_magnitude=4.5, days=30, limit=5000):
     end_date = datetime.today().strftime("%Y-%m-%d")
     start_date = (datetime.today() - timedelta(days=days)).strftime("%Y-%m-%d")
 
-    url = "https://earthquake.usgs.gov/fdsnws/event/1/query"
-    params = {
-        "format": "geojson",
-        "starttime": start_date,
-        "endtime": end_date,
-        "minmagnitude": min_magnitude,
-        "limit": limit,
-        "orderby": "time"
-    }
     try:
-        response = requests.get(url, params=params, timeout=15)
-        response.raise_for_status()
-        data = response.json()
-    except requests.exceptions.RequestException as e:
+        with perf.timed("usgs.sync"):
+            event_store.sync(start_date, min_magnitude)
+    except (requests.exceptions.RequestException, ValueError) as e:
         st.error(f"⚠️ USGS API 요청 실패: {e}")
-        return pd.DataFrame()
-
-    earthquakes = []
-    for feature in data.get("features", []):
-        properties = feature["properties"]
-        geometry = feature["geometry"]
-        earthquakes.append({
-            "time": properties["time"],
-            "magnitude": properties["mag"],
-            "lat": geometry["coordinates"][1],
-            "lon": geometry["coordinates"][0],
-            "depth": geometry["coordinates"][2]
-        })
-    return pd.DataFrame(earthquakes)
+
+    with perf.timed("event_store.query"):
+        return event_store.query(start_date, end_date, min_magnitude, limit)
 
 # ✅ 3. 특정 지역이 바다인지 판별하는 함수
 def get_ocean_name(lat, lon):
@@ -62,34 +45,35 @@ def get_ocean_name(lat, lon):
         return "남극해"
     return "해상"
 
-# ✅ 4. Nominatim API를 사용하여 위도, 경도를 나라와 지역명으로 변환
-@st.cache_data(ttl=3600)
+# ✅ 4. 위도, 경도를 나라와 지역명으로 변환 (번들 데이터로 오프라인 조회, 없으면 Nominatim)
 def get_location_name(lat, lon):
-    url = f"https://nominatim.openstreetmap.org/reverse?format=json&lat={lat}&lon={lon}&accept-language=ko"
-    headers = {"User-Agent": "Mozilla/5.0"}
-    
-    try:
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        if "address" in data and data["address"]:
-            address = data["address"]
-            country = address.get("country", "")
-            state = address.get("state", "")
-            city = address.get("city", address.get("town", address.get("village", "")))
-            location = f"{country}, {state} {city}".strip()
-            return location if location else get_ocean_name(lat, lon)
-    except requests.exceptions.RequestException:
-        pass
-    
+    if offline_geocoder.is_available():
+        return offline_geocoder.reverse(lat, lon)
+
+    address = geocode_cache.reverse(lat, lon)
+    if address:
+        country = address.get("country", "")
+        state = address.get("state", "")
+        city = address.get("city", address.get("town", address.get("village", "")))
+        location = f"{country}, {state} {city}".strip()
+        return location if location else get_ocean_name(lat, lon)
+
     return get_ocean_name(lat, lon)
 
+@perf.timed("geocode.reverse")
+def get_location_names(lats, lons):
+    """여러 좌표의 지명을 한 번에 조회"""
+    if offline_geocoder.is_available():
+        return offline_geocoder.reverse_many(lats, lons)
+
+    # 번들 데이터가 없으면 지명 조회를 한 번에 큐에 넣어둠 (같은 격자는 한 번만 요청)
+    geocode_cache.prefetch(list(zip(lats, lons)))
+    return [get_location_name(lat, lon) for lat, lon in zip(lats, lons)]
+
 # ✅ 5. 지진 발생 확률 예측 함수
-def predict_earthquake(lat, lon, depth=10.0):
-    input_df = pd.DataFrame([[lat, lon, depth]], columns=['lat', 'lon', 'depth'])
-    input_scaled = loaded_scaler.transform(input_df)
-    prob = loaded_rf.predict_proba(input_scaled)[0][1]
-    return round(prob * 100, 2)
+@perf.timed("model.predict")
+def predict_earthquake(lat, lon, depth=10.0, mode=None):
+    return predict_many([lat], [lon], [depth], mode=mode)[0]
 
 # ✅ 6. 주요 국가 위험도 계산 (위도, 경도 기준)
 major_countries = {
@@ -101,14 +85,20 @@ major_countries = {
 }
 
 def get_major_countries_risk():
+    coords = list(major_countries.values())
+    lats = [c[0] for c in coords]
+    lons = [c[1] for c in coords]
+    with perf.timed("model.predict"):
+        probs = predict_many(lats, lons)
+    locations = get_location_names(lats, lons)
+
     country_risks = []
-    for country, coords in major_countries.items():
-        prob = predict_earthquake(coords[0], coords[1])
+    for (country, (lat, lon)), prob, location in zip(major_countries.items(), probs, locations):
         country_risks.append({
             "country": country,
-            "location": get_location_name(coords[0], coords[1]),
-            "lat": coords[0],
-            "lon": coords[1],
+            "location": location,
+            "lat": lat,
+            "lon": lon,
             "risk": prob
         })
     return pd.DataFrame(country_risks)
@@ -130,38 +120,53 @@ def run_new():
 
     # ✅ 9. 실시간 예측 지도
     st.write("### 🔍 실시간 지진 예측 지도")
-    m1 = folium.Map(location=[20, 0], zoom_start=2, tiles="OpenStreetMap")
-    for _, row in df_earthquakes.sort_values(by="magnitude", ascending=False).head(5).iterrows():
-        folium.Marker(
-            location=[row["lat"], row["lon"]],
-            popup=f"📍 {get_location_name(row['lat'], row['lon'])}<br>예상 지진 확률: {predict_earthquake(row['lat'], row['lon'])}%",
-            icon=folium.Icon(color="red")
-        ).add_to(m1)
-    st_folium(m1, height=500, width=600)
+    top_df = df_earthquakes.sort_values(by="magnitude", ascending=False).head(5).copy()
+    with perf.timed("model.predict"):
+        top_df["risk"] = predict_many(top_df["lat"].to_numpy(), top_df["lon"].to_numpy())
+    top_df["location"] = get_location_names(top_df["lat"].to_numpy(), top_df["lon"].to_numpy())
+
+    def build_top_map():
+        m1 = folium.Map(location=[20, 0], zoom_start=2, tiles="OpenStreetMap")
+        for _, row in top_df.iterrows():
+            folium.Marker(
+                location=[row["lat"], row["lon"]],
+                popup=f"📍 {row['location']}<br>예상 지진 확률: {row['risk']}%",
+                icon=folium.Icon(color="red")
+            ).add_to(m1)
+        return m1
+
+    # ✅ 표시할 데이터가 같으면 렌더링한 지도 HTML 재사용
+    with perf.timed("folium.new.top"):
+        html = map_cache.get_html(
+            map_cache.version("new.top", top_df[["lat", "lon", "risk", "location"]]), build_top_map
+        )
+        components.html(html, height=500, width=600)
 
     # ✅ 10. 실시간 예측 위험 지역 정리
     st.write("### 🔥 실시간 지진 예측 정보 🔥")
  
-    for _, row in df_earthquakes.sort_values(by="magnitude", ascending=False).head(5).iterrows():
-        location_name = get_location_name(row["lat"], row["lon"])
-        risk = predict_earthquake(row["lat"], row["lon"])
-        st.write(f"📍 **{location_name} → 예상 지진 확률: {risk}%**")
+    for _, row in top_df.iterrows():
+        st.write(f"📍 **{row['location']} → 예상 지진 확률: {row['risk']}%**")
 
     # ✅ 11. 주요 국가 위험도 정보 표시
     st.write("### 🌍 주요 국가 지진 위험도 히트맵")
     major_risk_df = get_major_countries_risk()
-    m2 = folium.Map(location=[20, 0], zoom_start=2, tiles="CartoDB Positron")
-    heat_data = major_risk_df[['lat', 'lon', 'risk']].values.tolist()
-    HeatMap(heat_data, radius=30, blur=10, min_opacity=0.5).add_to(m2)
-
-    for _, row in major_risk_df.iterrows():
-        folium.Marker(
-            location=[row["lat"], row["lon"]],
-            popup=f"📍 {row['country']} ({row['location']})<br>예상 지진 확률: {row['risk']}%",
-            icon=folium.Icon(color="blue", icon="info-sign")
-        ).add_to(m2)
-    
-    st_folium(m2, height=500, width=600)
+    def build_countries_map():
+        m2 = folium.Map(location=[20, 0], zoom_start=2, tiles="CartoDB Positron")
+        heat_data = major_risk_df[['lat', 'lon', 'risk']].values.tolist()
+        HeatMap(heat_data, radius=30, blur=10, min_opacity=0.5).add_to(m2)
+
+        for _, row in major_risk_df.iterrows():
+            folium.Marker(
+                location=[row["lat"], row["lon"]],
+                popup=f"📍 {row['country']} ({row['location']})<br>예상 지진 확률: {row['risk']}%",
+                icon=folium.Icon(color="blue", icon="info-sign")
+            ).add_to(m2)
+        return m2
+
+    with perf.timed("folium.new.countries"):
+        html = map_cache.get_html(map_cache.version("new.countries", major_risk_df), build_countries_map)
+        components.html(html, height=500, width=600)
     
     st.write("### 🏛 주요 국가 지진 위험도")
     for _, row in major_risk_df.iterrows():
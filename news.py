@@ -3,9 +3,12 @@ import requests
 import re
 from datetime import datetime
 import pytz  
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import feedparser
 
+import news_feed
+import perf
+
 # ✅ 한국 시간대 설정 (UTC → KST 변환)
 KST = pytz.timezone('Asia/Seoul')
 UTC = pytz.utc  # ✅ UTC 정의
@@ -20,11 +23,13 @@ def format_date_korean(date_str):
     """네이버 뉴스 날짜를 'YYYY년 M월 D일' 형식으로 변환 및 datetime 객체 반환"""
     try:
         date_obj = datetime.strptime(date_str.replace(".", "-").strip(), "%Y-%m-%d")
+        date_obj = KST.localize(date_obj)  # 구글 뉴스(시간대 포함)와 함께 정렬할 수 있도록
         return date_obj, f"{date_obj.year}년 {date_obj.month}월 {date_obj.day}일"
     except ValueError:
         return None, date_str  # 변환 실패 시 원래 문자열 유지
 
-def get_naver_earthquake_news():
+@perf.timed("news.naver")
+def get_naver_earthquake_news(timeout=news_feed.SOURCE_TIMEOUT):
     """네이버 뉴스 검색 결과에서 최신 지진 관련 뉴스 크롤링"""
     query = "지진 OR 강진 OR 여진 OR 쓰나미 OR 해일 OR 규모 OR 진앙 OR 피해"
     url = f"https://search.naver.com/search.naver?where=news&query={query}&sort=1"
@@ -33,8 +38,10 @@ def get_naver_earthquake_news():
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/112.0.0.0 Safari/537.36"
     }
 
-    response = requests.get(url, headers=headers)
-    soup = BeautifulSoup(response.text, "html.parser")
+    response = requests.get(url, headers=headers, timeout=timeout)
+    response.raise_for_status()
+    # 기사 영역(div.news_area)만 파싱
+    soup = BeautifulSoup(response.text, "html.parser", parse_only=SoupStrainer("div", class_="news_area"))
 
     news_list = []
     news_items = soup.select("div.news_area")
@@ -42,6 +49,8 @@ def get_naver_earthquake_news():
     for item in news_items[:15]:  
         title = item.select_one("a.news_tit").text
         link = item.select_one("a.news_tit")["href"]
+        if news_feed.is_seen(link, title):  # ✅ 이미 저장한 기사는 건너뜀
+            continue
         source = item.select_one("a.info.press").text.strip()
         pub_date = item.select_one("span.info").text.strip()
         
@@ -58,13 +67,28 @@ def get_naver_earthquake_news():
 
     return news_list
 
-def get_google_earthquake_news():
+@perf.timed("news.google")
+def get_google_earthquake_news(timeout=news_feed.SOURCE_TIMEOUT):
     """구글 뉴스 RSS에서 최신 지진 관련 뉴스 가져오기"""
     rss_url = "https://news.google.com/rss/search?q=지진&hl=ko&gl=KR&ceid=KR:ko"
-    feed = feedparser.parse(rss_url)
+
+    # ✅ 피드가 바뀌지 않았으면(304) 새 기사 없음
+    response = news_feed.conditional_get(rss_url, timeout=timeout)
+    if response is None:
+        return []
+
+    # ✅ <item> 단위로 나눈 뒤 처음 보는 링크의 항목만 feedparser로 파싱
+    new_items = []
+    for item in re.findall(rb"<item>.*?</item>", response.content, re.S)[:15]:
+        link = re.search(rb"<link>(.*?)</link>", item, re.S)
+        if link is None or not news_feed.is_seen(link.group(1).strip().decode("utf-8", "replace")):
+            new_items.append(item)
+    if not new_items:
+        return []
+    feed = feedparser.parse(b"<rss version=\"2.0\"><channel>" + b"".join(new_items) + b"</channel></rss>")
 
     news_list = []
-    for entry in feed.entries[:15]:  
+    for entry in feed.entries:  
         pub_date_obj = datetime(*entry.published_parsed[:6])
         pub_date_obj = UTC.localize(pub_date_obj).astimezone(KST)
         pub_date_korean = f"{pub_date_obj.year}년 {pub_date_obj.month}월 {pub_date_obj.day}일"
@@ -78,19 +102,29 @@ def get_google_earthquake_news():
     
     return news_list
 
+# ✅ 뉴스 소스 (동시에 요청하여 새 기사만 저장, 소스별 최신순 목록을 병합한 피드를 캐시)
+NEWS_SOURCES = {
+    "네이버 뉴스": get_naver_earthquake_news,
+    "구글 뉴스": get_google_earthquake_news,
+}
+
 def run_news():
     st.title("🌍 실시간 지진 뉴스")
 
-    if st.button("🔄 최신 뉴스 불러오기"):
-        st.rerun()
+    # ✅ 버튼을 누르면 캐시를 무시하고 바로 다시 받아옴
+    force = st.button("🔄 최신 뉴스 불러오기")
 
     st.write(f"### 📰 2025년 최신 지진 뉴스")
 
-    naver_news = get_naver_earthquake_news()
-    google_news = get_google_earthquake_news()
-    
-    news_articles = sorted(naver_news + google_news, key=lambda x: x['date_obj'], reverse=True)
-    
+    with st.spinner("뉴스를 불러오는 중..."):
+        with perf.timed("news.feed"):
+            feed = news_feed.get_feed(NEWS_SOURCES, force=force)
+
+    for source, error in feed["errors"].items():
+        st.warning(f"⚠️ {source}를 불러오지 못했습니다: {error}")
+
+    news_articles = feed["articles"]
+
     if not news_articles:
         st.write("❌ 관련 지진 뉴스가 없습니다. (최신 데이터를 다시 확인해 주세요.)")
     else:
@@ -0,0 +1,185 @@
+import asyncio
+import hashlib
+import heapq
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+import perf
+
+# ✅ 뉴스 피드 캐시 갱신 주기 / 소스별 제한 시간
+FEED_TTL = 600
+SOURCE_TIMEOUT = 8
+
+# 소스별로 보관하는 최근 기사 수
+MAX_ARTICLES_PER_SOURCE = 50
+# 이미 본 기사 id / 링크를 기억하는 최대 개수 (오래된 것부터 잊음)
+MAX_SEEN = 2000
+
+_feed = None
+_seen_ids = OrderedDict()
+_seen_links = OrderedDict()
+_by_source = {}
+_validators = {}
+_pending_validators = {}
+_current = threading.local()
+_refresh_thread = None
+_lock = threading.Lock()
+_store_lock = threading.Lock()
+
+
+# ✅ 1. 모든 소스를 동시에 요청 (소스별 제한 시간, 실패한 소스는 건너뜀)
+def _run_fetch(name, fetch, timeout):
+    """요청한 소스 이름을 기억한 채로 fetch 실행 (조건부 요청 검증값을 소스별로 모아 둠)"""
+    _current.source = name
+    try:
+        return fetch(timeout)
+    finally:
+        _current.source = None
+
+
+async def _fetch_source(executor, name, fetch, timeout):
+    loop = asyncio.get_running_loop()
+    try:
+        articles = await asyncio.wait_for(loop.run_in_executor(executor, _run_fetch, name, fetch, timeout),
+                                          timeout=timeout)
+        return name, articles, None
+    except asyncio.TimeoutError:
+        return name, [], f"{timeout}초 안에 응답이 없습니다."
+    except Exception as e:  # 한 소스의 실패가 전체 피드를 막지 않도록
+        return name, [], str(e) or type(e).__name__
+
+
+async def _fetch_all(sources, timeout):
+    # 제한 시간을 넘긴 요청은 기다리지 않도록 전용 스레드 풀을 사용하고 종료를 기다리지 않음
+    executor = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix="news-source")
+    try:
+        return await asyncio.gather(
+            *(_fetch_source(executor, name, fetch, timeout) for name, fetch in sources.items())
+        )
+    finally:
+        executor.shutdown(wait=False)
+
+
+# ✅ 2. 기사 저장소 (이미 본 기사 / 조건부 요청)
+def article_id(title):
+    """언론사 꼬리표·기호·대소문자를 무시한 제목 해시 (소스가 달라도 같은 기사면 같은 값)"""
+    title = re.sub(r"<[^>]*>", "", title)
+    title = re.sub(r"\s+-\s+[^-]+$", "", title)  # 구글 뉴스 "제목 - 언론사"
+    normalized = re.sub(r"[\W_]+", "", title).lower()
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def is_seen(link=None, title=None):
+    """이미 저장한 기사인지 (링크 또는 정규화한 제목 기준)"""
+    return (link is not None and link in _seen_links) or (title is not None and article_id(title) in _seen_ids)
+
+
+def conditional_get(url, timeout=SOURCE_TIMEOUT, **kwargs):
+    """
+    ETag / Last-Modified로 조건부 요청
+    바뀐 내용이 없으면(304) None, 있으면 응답을 반환
+    검증값은 refresh()가 이 소스의 기사를 저장한 뒤에 반영 (파싱에 실패하면 다음에 다시 받음)
+    """
+    headers = dict(kwargs.pop("headers", None) or {})
+    etag, last_modified = _validators.get(url, (None, None))
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    response = requests.get(url, headers=headers, timeout=timeout, **kwargs)
+    if response.status_code == 304:
+        return None
+    response.raise_for_status()
+    validators = (response.headers.get("ETag"), response.headers.get("Last-Modified"))
+    source = getattr(_current, "source", None)
+    with _store_lock:
+        if source is None:  # refresh() 밖에서 직접 호출하면 바로 저장
+            _validators[url] = validators
+        else:
+            _pending_validators.setdefault(source, {})[url] = validators
+    return response
+
+
+def _remember(seen, key):
+    seen[key] = None
+    seen.move_to_end(key)
+    while len(seen) > MAX_SEEN:
+        seen.popitem(last=False)
+
+
+def _add_articles(name, articles):
+    """처음 보는 기사만 소스별 목록(최신순)에 병합, 추가한 개수 반환"""
+    new_articles = []
+    for article in articles:
+        key = article_id(article["title"])
+        if key in _seen_ids or article["link"] in _seen_links:
+            continue
+        _remember(_seen_ids, key)
+        _remember(_seen_links, article["link"])
+        new_articles.append(article)
+
+    if new_articles:
+        new_articles.sort(key=lambda x: x["date_obj"], reverse=True)
+        merged = heapq.merge(_by_source.get(name, []), new_articles, key=lambda x: x["date_obj"], reverse=True)
+        _by_source[name] = list(merged)[:MAX_ARTICLES_PER_SOURCE]
+    return len(new_articles)
+
+
+def refresh(sources, timeout=SOURCE_TIMEOUT):
+    """
+    모든 소스를 동시에 받아 새 기사만 저장하고, 소스별 최신순 목록을 k-way 병합한 피드를 캐시에 저장
+    sources: {소스 이름: fetch(timeout) → 새 기사 [{"title", "link", "pub_date", "date_obj"}, ...]}
+    (fetch는 is_seen()으로 이미 본 기사를 건너뛰고 conditional_get()으로 바뀐 내용만 받을 수 있음)
+    """
+    global _feed
+    results = asyncio.run(_fetch_all(sources, timeout))
+
+    with _store_lock:
+        added = {}
+        for name, articles, error in results:
+            added[name] = _add_articles(name, articles)
+            # 기사를 저장한 소스만 조건부 요청 검증값 반영 (실패한 소스는 다음에 전체를 다시 받음)
+            pending = _pending_validators.pop(name, {})
+            if error is None:
+                _validators.update(pending)
+        articles = list(heapq.merge(*_by_source.values(), key=lambda x: x["date_obj"], reverse=True))
+    errors = {name: error for name, _, error in results if error}
+
+    _feed = {"articles": articles, "errors": errors, "added": added, "fetched_at": time.time()}
+    return _feed
+
+
+# ✅ 3. 공유 캐시 + 백그라운드 갱신
+def _refresh_in_background(sources, timeout):
+    global _refresh_thread
+    with _lock:
+        if _refresh_thread is not None and _refresh_thread.is_alive():
+            return
+        _refresh_thread = threading.Thread(target=refresh, args=(sources, timeout), name="news-refresh", daemon=True)
+        _refresh_thread.start()
+
+
+def get_feed(sources, ttl=FEED_TTL, timeout=SOURCE_TIMEOUT, force=False):
+    """
+    합쳐진 뉴스 피드 반환 {"articles", "errors", "added", "fetched_at"}
+    - 캐시가 있으면 바로 반환하고, TTL이 지났으면 백그라운드에서 갱신
+    - 캐시가 없거나 force=True면 지금 받아옴
+    """
+    feed = _feed
+    if feed is None or force:
+        with _lock:
+            if _feed is None or force:
+                perf.record_cache("news_feed", False)
+                return refresh(sources, timeout)
+            feed = _feed
+
+    perf.record_cache("news_feed", True)
+    if time.time() - feed["fetched_at"] > ttl:
+        _refresh_in_background(sources, timeout)
+    return feed
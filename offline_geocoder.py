@@ -0,0 +1,200 @@
+import gzip
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import KDTree
+
+# ✅ 번들 데이터 (build_geodata.py로 생성)
+GEODATA_DIR = os.environ.get("GEODATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "geodata"))
+
+# 해안선이 단순화되어 있으므로, 경계 셀의 바다 좌표가 같은 나라 도시에서 이 거리 이내면 육지로 봄
+COAST_SNAP_KM = 15.0
+EARTH_RADIUS_KM = 6371.0088
+
+_data = None
+_lock = threading.Lock()
+
+
+def _unit_vectors(lats, lons):
+    """위경도 → 단위구 위의 3차원 좌표 (직선 거리 순서 = 구면 거리 순서)"""
+    lat, lon = np.radians(lats), np.radians(lons)
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+
+# ✅ 1. 데이터 로드 (최초 1회)
+def _load():
+    global _data
+    if _data is None:
+        with _lock:
+            if _data is None:
+                regions = np.load(os.path.join(GEODATA_DIR, "regions.npz"))
+                with gzip.open(os.path.join(GEODATA_DIR, "countries.json.gz"), "rt", encoding="utf-8") as f:
+                    meta = json.load(f)
+
+                country = regions["country"]
+                countries = meta["countries"]
+                rings = [[np.asarray(ring) for ring in c["rings"]] for c in countries]
+                bboxes = np.array([
+                    [min(r[:, 0].min() for r in rs), min(r[:, 1].min() for r in rs),
+                     max(r[:, 0].max() for r in rs), max(r[:, 1].max() for r in rs)]
+                    for rs in rings
+                ])
+
+                places = pd.read_csv(os.path.join(GEODATA_DIR, "places.csv.gz"), keep_default_na=False)
+                tree = KDTree(_unit_vectors(places["lat"].to_numpy(), places["lon"].to_numpy()))
+
+                _data = {
+                    "step": float(regions["step"]),
+                    "country": country,
+                    "border": np.unpackbits(regions["border"], axis=1, count=country.shape[1]).astype(bool),
+                    "sea": regions["sea"],
+                    "sea_names": np.array(meta["sea_names"], dtype=object),
+                    "countries": countries,
+                    "rings": rings,
+                    "bboxes": bboxes,
+                    "places": places,
+                    "tree": tree,
+                }
+    return _data
+
+
+def is_available():
+    """번들 데이터가 있는지 여부"""
+    return all(
+        os.path.exists(os.path.join(GEODATA_DIR, name))
+        for name in ("regions.npz", "countries.json.gz", "places.csv.gz")
+    )
+
+
+# ✅ 2. 국가 판정 (경계 셀만 정확한 다각형 검사)
+def _in_rings(lons, lats, rings, chunk=4096):
+    """여러 점이 다각형(rings, 짝홀 규칙) 안에 있는지 (점 × 변 벡터 연산)"""
+    inside = np.zeros(lons.shape, dtype=bool)
+    for ring in rings:
+        x0, y0 = ring[:, 0], ring[:, 1]
+        x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+        keep = y0 != y1  # 수평 변은 교차 판정에서 제외
+        x0, y0, x1, y1 = x0[keep], y0[keep], x1[keep], y1[keep]
+        for start in range(0, lons.size, chunk):
+            px = lons[start:start + chunk, np.newaxis]
+            py = lats[start:start + chunk, np.newaxis]
+            crossing = (y0 > py) != (y1 > py)
+            x_cross = x0 + (py - y0) * (x1 - x0) / (y1 - y0)
+            inside[start:start + chunk] ^= (np.count_nonzero(crossing & (px < x_cross), axis=1) % 2).astype(bool)
+    return inside
+
+
+def country_index(lats, lons):
+    """각 좌표의 국가 번호 배열 (-1 = 바다)"""
+    data = _load()
+    lats = np.atleast_1d(np.asarray(lats, dtype=np.float64))
+    lons = np.atleast_1d(np.remainder(np.asarray(lons, dtype=np.float64) + 180, 360) - 180)
+    step = data["step"]
+    rows = np.clip(((lats + 90) / step).astype(int), 0, data["country"].shape[0] - 1)
+    cols = np.clip(((lons + 180) / step).astype(int), 0, data["country"].shape[1] - 1)
+
+    result = data["country"][rows, cols].astype(int)
+    border = np.nonzero(data["border"][rows, cols])[0]
+    if border.size:
+        # 경계 셀 좌표는 bbox가 겹치는 국가 다각형으로 다시 판정
+        result[border] = -1
+        b_lats, b_lons = lats[border], lons[border]
+        for c, (x_min, y_min, x_max, y_max) in enumerate(data["bboxes"]):
+            candidates = np.nonzero(
+                (result[border] < 0) & (x_min <= b_lons) & (b_lons <= x_max) & (y_min <= b_lats) & (b_lats <= y_max)
+            )[0]
+            if candidates.size:
+                inside = _in_rings(b_lons[candidates], b_lats[candidates], data["rings"][c])
+                result[border[candidates[inside]]] = c
+    return result
+
+
+def sea_names(lats, lons):
+    """각 좌표의 해역 이름 배열"""
+    data = _load()
+    lats = np.atleast_1d(np.asarray(lats, dtype=np.float64))
+    lons = np.atleast_1d(np.remainder(np.asarray(lons, dtype=np.float64) + 180, 360) - 180)
+    step = data["step"]
+    rows = np.clip(((lats + 90) / step).astype(int), 0, data["sea"].shape[0] - 1)
+    cols = np.clip(((lons + 180) / step).astype(int), 0, data["sea"].shape[1] - 1)
+    return data["sea_names"][data["sea"][rows, cols]]
+
+
+def is_land(lats, lons):
+    """육지(국가 경계 안) 여부 배열"""
+    return country_index(lats, lons) >= 0
+
+
+# ✅ 3. 지명 (국가 + 가장 가까운 도시의 행정구역)
+def reverse_many(lats, lons):
+    """
+    여러 좌표의 지명 목록
+    - 육지: 가장 가까운 GeoNames 지점에 한글 이름이 있으면 "국가, 도시" (예: 대한민국, 포항)
+      없으면 영어로 통일한 "Country, Admin1 City" (예: Japan, Hokkaido Kushiro)
+    - 바다: 해역 이름 (예: 태평양, 동해)
+    """
+    data = _load()
+    lats = np.atleast_1d(np.asarray(lats, dtype=np.float64))
+    lons = np.atleast_1d(np.asarray(lons, dtype=np.float64))
+    index = country_index(lats, lons)
+    labels = np.array(sea_names(lats, lons), dtype=object)
+
+    # 육지 좌표 + 해안 근처(경계 셀) 바다 좌표만 가장 가까운 도시 검색
+    step = data["step"]
+    rows = np.clip(((lats + 90) / step).astype(int), 0, data["border"].shape[0] - 1)
+    cols = np.clip(((np.remainder(lons + 180, 360)) / step).astype(int), 0, data["border"].shape[1] - 1)
+    targets = np.nonzero((index >= 0) | data["border"][rows, cols])[0]
+    if targets.size == 0:
+        return labels.tolist()
+
+    chord, nearest = data["tree"].query(_unit_vectors(lats[targets], lons[targets]), k=1)
+    distance_km = 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(chord[:, 0] / 2, 1))
+    places = data["places"].iloc[nearest[:, 0]]
+    names_ko = places["name_ko"] if "name_ko" in places else [""] * len(places)
+    by_iso = {c["iso_a2"]: c for c in data["countries"] if c["iso_a2"]}
+
+    for i, km, admin1, city, city_ko, cc in zip(targets, distance_km, places["admin1"], places["name"],
+                                               names_ko, places["cc"]):
+        if index[i] >= 0:
+            country = data["countries"][index[i]]
+        elif km <= COAST_SNAP_KM and cc in by_iso:
+            country = by_iso[cc]
+        else:
+            continue
+
+        if cc != country["iso_a2"]:
+            # 가장 가까운 도시가 다른 나라면 국가명만 표시
+            labels[i] = country["name_ko"]
+        elif city_ko:
+            labels[i] = f"{country['name_ko']}, {city_ko}"
+        else:
+            # 한글 이름이 없으면 한국어/영어를 섞지 않고 영어로 표시
+            detail = " ".join(dict.fromkeys(part for part in (admin1, city) if part))
+            labels[i] = f"{country['name']}, {detail}" if detail else country["name_ko"]
+    return labels.tolist()
+
+
+def reverse(lat, lon):
+    """단일 좌표의 지명"""
+    return reverse_many([lat], [lon])[0]
+
+
+if __name__ == "__main__":
+    import time
+
+    for lat, lon in [(37.5665, 126.9780), (35.1796, 129.0756), (37.5, 131.0), (35.0, 140.5),
+                     (0.0, -150.0), (30.0, -40.0), (-20.0, 80.0), (14.0, 115.0), (38.0, 124.0)]:
+        print((lat, lon), reverse(lat, lon))
+
+    rng = np.random.default_rng(0)
+    lats, lons = rng.uniform(-60, 70, 100000), rng.uniform(-180, 180, 100000)
+    reverse_many(lats[:10], lons[:10])
+    start = time.perf_counter()
+    country_index(lats, lons)
+    print(f"국가 판정 10만 개: {(time.perf_counter() - start) * 1000:.1f} ms")
+    start = time.perf_counter()
+    reverse_many(lats, lons)
+    print(f"지명 10만 개: {(time.perf_counter() - start) * 1000:.1f} ms")
@@ -0,0 +1,171 @@
+import functools
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+# ✅ 구간별 소요 시간 측정 (PERF_TIMING=0이면 측정 코드가 아무 일도 하지 않음)
+ENABLED = os.environ.get("PERF_TIMING", "1") != "0"
+
+# 구간별로 최근 WINDOW개 측정값만 보관해 백분위수 계산
+WINDOW = 1000
+QUANTILES = (0.5, 0.95, 0.99)
+
+_timings = {}
+_caches = {}
+_lock = threading.Lock()
+
+
+class _Series:
+    __slots__ = ("samples", "count", "total", "errors")
+
+    def __init__(self):
+        self.samples = deque(maxlen=WINDOW)
+        self.count = 0
+        self.total = 0.0
+        self.errors = 0
+
+
+def record(name, seconds, error=False):
+    """구간 이름별 소요 시간(초) 기록"""
+    with _lock:
+        series = _timings.get(name)
+        if series is None:
+            series = _timings[name] = _Series()
+        series.samples.append(seconds)
+        series.count += 1
+        series.total += seconds
+        series.errors += bool(error)
+
+
+def record_cache(name, hit):
+    """캐시 이름별 적중 / 실패 기록"""
+    if not ENABLED:
+        return
+    with _lock:
+        counts = _caches.setdefault(name, [0, 0])
+        counts[0 if hit else 1] += 1
+
+
+class _Timer:
+    """with 문 또는 데코레이터로 쓰는 구간 측정기"""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record(self.name, time.perf_counter() - self.start, error=exc_type is not None)
+        return False
+
+    def __call__(self, func):
+        name = self.name
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Timer(name):
+                return func(*args, **kwargs)
+        return wrapper
+
+
+class _NoopTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def __call__(self, func):
+        return func
+
+
+_NOOP = _NoopTimer()
+
+
+def timed(name):
+    """
+    구간 측정
+        with perf.timed("usgs.sync"): ...
+        @perf.timed("news.naver")
+    측정을 끄면 아무 일도 하지 않는 객체를 반환 (데코레이터는 원래 함수를 그대로 반환)
+    """
+    return _Timer(name) if ENABLED else _NOOP
+
+
+# ✅ 조회 / 내보내기
+def snapshot():
+    """구간별 {name, count, errors, mean, p50, p95, p99, max} (초 단위, 이름순)"""
+    with _lock:
+        items = [(name, np.array(series.samples), series.count, series.total, series.errors)
+                 for name, series in sorted(_timings.items())]
+
+    rows = []
+    for name, samples, count, total, errors in items:
+        quantiles = np.quantile(samples, QUANTILES) if samples.size else [np.nan] * len(QUANTILES)
+        rows.append({
+            "name": name,
+            "count": count,
+            "errors": errors,
+            "mean": total / count if count else np.nan,
+            **{f"p{round(q * 100)}": float(value) for q, value in zip(QUANTILES, quantiles)},
+            "max": float(samples.max()) if samples.size else np.nan,
+        })
+    return rows
+
+
+def cache_stats():
+    """캐시별 {name, hits, misses, hit_ratio}"""
+    with _lock:
+        items = sorted((name, hits, misses) for name, (hits, misses) in _caches.items())
+    return [{"name": name, "hits": hits, "misses": misses,
+             "hit_ratio": hits / (hits + misses) if hits + misses else np.nan}
+            for name, hits, misses in items]
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text():
+    """Prometheus 텍스트 형식 (summary + 캐시 카운터)"""
+    lines = [
+        "# HELP app_operation_seconds 구간별 소요 시간 (최근 측정값 기준 백분위수)",
+        "# TYPE app_operation_seconds summary",
+    ]
+    with _lock:
+        items = [(name, list(series.samples), series.count, series.total, series.errors)
+                 for name, series in sorted(_timings.items())]
+        caches = sorted(_caches.items())
+
+    for name, samples, count, total, _ in items:
+        label = _label(name)
+        if samples:
+            for q, value in zip(QUANTILES, np.quantile(samples, QUANTILES)):
+                lines.append(f'app_operation_seconds{{operation="{label}",quantile="{q}"}} {value:.6g}')
+        lines.append(f'app_operation_seconds_sum{{operation="{label}"}} {total:.6g}')
+        lines.append(f'app_operation_seconds_count{{operation="{label}"}} {count}')
+
+    lines += ["# HELP app_operation_errors_total 예외로 끝난 구간 수", "# TYPE app_operation_errors_total counter"]
+    for name, _, _, _, errors in items:
+        lines.append(f'app_operation_errors_total{{operation="{_label(name)}"}} {errors}')
+
+    lines += ["# HELP app_cache_requests_total 캐시 조회 수 (result=hit|miss)", "# TYPE app_cache_requests_total counter"]
+    for name, (hits, misses) in caches:
+        lines.append(f'app_cache_requests_total{{cache="{_label(name)}",result="hit"}} {hits}')
+        lines.append(f'app_cache_requests_total{{cache="{_label(name)}",result="miss"}} {misses}')
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    with _lock:
+        _timings.clear()
+        _caches.clear()
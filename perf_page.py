@@ -0,0 +1,56 @@
+import streamlit as st
+import pandas as pd
+
+import answer_cache
+import chat_stream
+import inference_backend
+import map_cache
+import model_registry
+import perf
+
+
+def run_perf():
+    st.title("⏱️ 성능")
+
+    if not perf.ENABLED:
+        st.warning("⚠️ 구간 측정이 꺼져 있습니다. (PERF_TIMING=0)")
+
+    # ✅ 1. 구간별 소요 시간 (최근 측정값 기준 백분위수, 밀리초)
+    st.subheader("구간별 소요 시간 (ms)")
+    timings = pd.DataFrame(perf.snapshot())
+    if timings.empty:
+        st.write("아직 측정된 구간이 없습니다. 다른 메뉴를 사용한 뒤 다시 확인하세요.")
+    else:
+        for column in ["mean", "p50", "p95", "p99", "max"]:
+            timings[column] = (timings[column] * 1000).round(2)
+        st.dataframe(timings.set_index("name"), use_container_width=True)
+
+    # ✅ 2. 캐시 적중률
+    st.subheader("캐시 적중률")
+    caches = pd.DataFrame(perf.cache_stats())
+    if caches.empty:
+        st.write("아직 캐시 조회 기록이 없습니다.")
+    else:
+        caches["hit_ratio"] = (caches["hit_ratio"] * 100).round(1)
+        st.dataframe(caches.set_index("name"), use_container_width=True)
+
+    # ✅ 3. 모듈별 통계 (모델 로드, 지도 HTML 캐시, 챗봇 답변 캐시, 추론 대기열, 스트리밍)
+    with st.expander("모듈별 통계"):
+        st.write("**모델 로드**", model_registry.get_load_stats())
+        st.write("**지도 HTML 캐시**", map_cache.get_stats())
+        st.write("**챗봇 답변 캐시**", answer_cache.get_stats())
+        st.write("**추론 동시 요청 / 대기열**", inference_backend.get_stats())
+        metrics = chat_stream.get_metrics()
+        if metrics:
+            st.write("**최근 스트리밍 응답**")
+            st.dataframe(pd.DataFrame(metrics).tail(20), use_container_width=True)
+
+    # ✅ 4. Prometheus 텍스트 형식
+    text = perf.prometheus_text()
+    with st.expander("Prometheus 형식"):
+        st.code(text, language="text")
+    st.download_button("📥 metrics.txt 다운로드", text, file_name="metrics.txt", mime="text/plain")
+
+    if st.button("🧹 측정값 초기화"):
+        perf.reset()
+        st.rerun()
@@ -0,0 +1,58 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from forest_compiler import get_compiled_forest
+from model_registry import get_model, get_scaler
+
+FEATURE_COLUMNS = ["lat", "lon", "depth"]
+
+# ✅ 기본 예측 방식 ("model": 모델 직접 실행, "raster": 사전 계산 래스터 보간)
+PREDICT_MODE = os.environ.get("PREDICT_MODE", "model")
+
+# ✅ 이 개수 이하의 입력은 컴파일된 랜덤포레스트 평가기로 계산 (0이면 사용 안 함)
+COMPILED_MAX_BATCH = int(os.environ.get("COMPILED_MAX_BATCH", "256"))
+
+
+def _as_points(lats, lons, depths):
+    lats = np.atleast_1d(np.asarray(lats, dtype=np.float64))
+    lons = np.atleast_1d(np.asarray(lons, dtype=np.float64))
+    depths = np.broadcast_to(np.asarray(depths, dtype=np.float64), lats.shape)
+    return lats, lons, depths
+
+
+def predict_proba_many(lats, lons, depths=10.0):
+    """
+    모델을 직접 실행해 각 지점의 지진 발생 확률(0~1)을 반환
+    (소량 입력은 호출 오버헤드가 작은 컴파일된 평가기 사용, 결과는 sklearn과 동일)
+    """
+    lats, lons, depths = _as_points(lats, lons, depths)
+    if lats.size == 0:
+        return np.empty(0, dtype=np.float64)
+
+    if lats.size <= COMPILED_MAX_BATCH:
+        return get_compiled_forest().predict_proba(np.column_stack([lats, lons, depths]))[:, 1]
+
+    input_df = pd.DataFrame({"lat": lats, "lon": lons, "depth": depths}, columns=FEATURE_COLUMNS)
+    input_scaled = get_scaler().transform(input_df)
+    return get_model().predict_proba(input_scaled)[:, 1]
+
+
+# ✅ 여러 지점의 지진 발생 확률을 한 번에 예측
+def predict_many(lats, lons, depths=10.0, mode=None):
+    """
+    위도/경도/깊이 배열을 받아 각 지점의 지진 발생 확률(%)을 반환
+    (스케일러 1회, 랜덤포레스트 1회 호출로 전체 지점을 계산)
+    mode="raster"이면 사전 계산된 위험도 래스터를 보간해 응답
+    (래스터가 없거나 모델 버전이 다르면 모델로 계산)
+    """
+    if (mode or PREDICT_MODE) == "raster":
+        from risk_raster import lookup
+
+        probs = lookup(lats, lons, depths)
+        if probs is not None:
+            return np.round(probs * 100, 2)
+
+    probs = predict_proba_many(lats, lons, depths)
+    return np.round(probs * 100, 2)
@@ -0,0 +1,189 @@
+import argparse
+import json
+import os
+import threading
+import time
+
+import numpy as np
+from joblib import Parallel, delayed
+
+from model_registry import get_model_version
+from predictor import predict_proba_many
+
+# ✅ 사전 계산된 전 세계 위험도 래스터 파일
+RASTER_PATH = "risk_raster.npy"
+RASTER_META_PATH = "risk_raster.json"
+
+DEFAULT_STEP = 0.25
+DEFAULT_DEPTHS = (10.0,)
+
+_raster = None
+_raster_lock = threading.Lock()
+
+
+# ✅ 1. 래스터 생성 (오프라인 빌드 단계)
+def _evaluate_rows(lat_values, lon_values, depth):
+    """위도 행 묶음에 대해 모델을 실행 (병렬 작업 단위)"""
+    grid_lat, grid_lon = np.meshgrid(lat_values, lon_values, indexing="ij")
+    probs = predict_proba_many(grid_lat.ravel(), grid_lon.ravel(), depth)
+    return probs.reshape(grid_lat.shape)
+
+
+def _quantize(probs, dtype):
+    if dtype == "uint8":
+        return np.round(probs * 255).astype(np.uint8)
+    return probs.astype(np.float16)
+
+
+def build_raster(step=DEFAULT_STEP, depths=DEFAULT_DEPTHS, dtype="uint8", n_jobs=-1,
+                 rows_per_job=32, n_check=20000, path=RASTER_PATH, meta_path=RASTER_META_PATH):
+    """
+    위도/경도/깊이 격자 전체에 대해 모델을 평가하여 래스터 파일로 저장
+    (모든 코어를 사용하며, 저장 후 모델 직접 추론 대비 최대 오차를 측정)
+    """
+    start = time.perf_counter()
+    lat_values = np.linspace(-90, 90, int(round(180 / step)) + 1)
+    lon_values = np.linspace(-180, 180, int(round(360 / step)) + 1)
+    depths = sorted(float(d) for d in depths)
+
+    raster = np.empty((len(depths), len(lat_values), len(lon_values)), dtype=np.uint8 if dtype == "uint8" else np.float16)
+    row_chunks = [lat_values[i:i + rows_per_job] for i in range(0, len(lat_values), rows_per_job)]
+
+    for d, depth in enumerate(depths):
+        results = Parallel(n_jobs=n_jobs)(
+            delayed(_evaluate_rows)(chunk, lon_values, depth) for chunk in row_chunks
+        )
+        raster[d] = _quantize(np.vstack(results), dtype)
+
+    np.save(path, raster)
+
+    meta = {
+        "model_version": get_model_version(),
+        "dtype": dtype,
+        "lat_start": -90.0,
+        "lon_start": -180.0,
+        "step": step,
+        "depths": depths,
+        "shape": list(raster.shape),
+        "build_seconds": round(time.perf_counter() - start, 2),
+    }
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+
+    # ✅ 모델 직접 추론과 비교한 오차 기록
+    global _raster
+    _raster = None
+    error = measure_error(n_check, path=path, meta_path=meta_path)
+    meta.update(error)
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+def measure_error(n_points=20000, seed=42, path=RASTER_PATH, meta_path=RASTER_META_PATH):
+    """임의 지점에서 래스터 보간값과 모델 직접 추론값의 오차 (확률 %p 단위)"""
+    raster, meta = _load(path, meta_path)
+    rng = np.random.default_rng(seed)
+    lats = rng.uniform(-90, 90, n_points)
+    lons = rng.uniform(-180, 180, n_points)
+    depths = rng.uniform(min(meta["depths"]), max(meta["depths"]), n_points)
+
+    diff = np.abs(_interpolate(raster, meta, lats, lons, depths) - predict_proba_many(lats, lons, depths)) * 100
+    return {
+        "check_points": n_points,
+        "max_error": round(float(diff.max()), 2),
+        "mean_error": round(float(diff.mean()), 3),
+        "p99_error": round(float(np.percentile(diff, 99)), 2),
+    }
+
+
+# ✅ 2. 래스터 조회 (런타임)
+def _load(path=RASTER_PATH, meta_path=RASTER_META_PATH):
+    with open(meta_path, encoding="utf-8") as f:
+        meta = json.load(f)
+    raster = np.load(path, mmap_mode="r")
+    return raster, meta
+
+
+def get_raster():
+    """
+    래스터를 메모리 맵으로 한 번만 로드 (파일이 없거나 모델 버전이 다르면 None)
+    모델이 새 버전으로 교체되면 다시 확인
+    """
+    global _raster
+    version = get_model_version()
+    if _raster is not None and _raster[1].get("model_version") == version:
+        return _raster
+
+    with _raster_lock:
+        if _raster is None or _raster[1].get("model_version") != version:
+            _raster = None
+            if not (os.path.exists(RASTER_PATH) and os.path.exists(RASTER_META_PATH)):
+                return None
+            raster, meta = _load()
+            if meta.get("model_version") != version:
+                return None
+            _raster = (raster, meta)
+    return _raster
+
+
+def _axis_index(values, start, step, size):
+    pos = np.clip((values - start) / step, 0, size - 1)
+    i0 = np.minimum(pos.astype(np.intp), max(size - 2, 0))
+    return i0, pos - i0
+
+
+def _interpolate(raster, meta, lats, lons, depths):
+    lats = np.atleast_1d(np.asarray(lats, dtype=np.float64))
+    lons = np.atleast_1d(np.asarray(lons, dtype=np.float64))
+    depths = np.broadcast_to(np.asarray(depths, dtype=np.float64), lats.shape)
+
+    n_depth, n_lat, n_lon = raster.shape
+    i, wi = _axis_index(lats, meta["lat_start"], meta["step"], n_lat)
+    j, wj = _axis_index(lons, meta["lon_start"], meta["step"], n_lon)
+
+    # 깊이 축: 인접한 두 깊이 레벨 사이 선형 보간
+    depth_levels = np.asarray(meta["depths"])
+    if n_depth == 1:
+        k = np.zeros(lats.shape, dtype=np.intp)
+        wk = np.zeros(lats.shape)
+    else:
+        k = np.clip(np.searchsorted(depth_levels, depths) - 1, 0, n_depth - 2)
+        wk = np.clip((depths - depth_levels[k]) / (depth_levels[k + 1] - depth_levels[k]), 0, 1)
+
+    def bilinear(level):
+        i1 = np.minimum(i + 1, n_lat - 1)
+        j1 = np.minimum(j + 1, n_lon - 1)
+        top = raster[level, i, j] * (1 - wj) + raster[level, i, j1] * wj
+        bottom = raster[level, i1, j] * (1 - wj) + raster[level, i1, j1] * wj
+        return top * (1 - wi) + bottom * wi
+
+    values = bilinear(k)
+    if n_depth > 1:
+        values = values * (1 - wk) + bilinear(k + 1) * wk
+
+    scale = 255.0 if meta["dtype"] == "uint8" else 1.0
+    return values / scale
+
+
+def lookup(lats, lons, depths=10.0):
+    """래스터 쌍선형 보간으로 지진 발생 확률(0~1)을 반환 (래스터가 없으면 None)"""
+    loaded = get_raster()
+    if loaded is None:
+        return None
+    raster, meta = loaded
+    return _interpolate(raster, meta, lats, lons, depths)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="전 세계 지진 위험도 래스터 생성")
+    parser.add_argument("--step", type=float, default=DEFAULT_STEP, help="격자 간격 (도)")
+    parser.add_argument("--depths", type=float, nargs="+", default=list(DEFAULT_DEPTHS), help="깊이 레벨 (km)")
+    parser.add_argument("--dtype", choices=["uint8", "float16"], default="uint8")
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--check-points", type=int, default=20000)
+    args = parser.parse_args()
+
+    result = build_raster(step=args.step, depths=args.depths, dtype=args.dtype,
+                          n_jobs=args.n_jobs, n_check=args.check_points)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
@@ -0,0 +1,113 @@
+import math
+import threading
+
+import numpy as np
+
+from shelter_index import dataset_version
+
+# ✅ 줌 레벨별 계층 클러스터 설정 (supercluster 방식, 웹 메르카토르 픽셀 격자 기준)
+MIN_ZOOM = 0
+MAX_ZOOM = 16  # 이 줌보다 크게 확대하면 대피소를 하나씩 표시
+CLUSTER_RADIUS_PX = 60
+TILE_SIZE = 256
+VIEW_PADDING = 0.25  # 화면 밖 여유 (가장자리에서 끊겨 보이지 않도록)
+
+_indexes = {}
+_lock = threading.Lock()
+
+
+# ✅ 1. 위경도 ↔ 웹 메르카토르 (0~1 범위)
+def _project(lats, lons):
+    lats = np.clip(np.asarray(lats, dtype=np.float64), -85.05112878, 85.05112878)
+    sin = np.sin(np.radians(lats))
+    x = (np.asarray(lons, dtype=np.float64) + 180.0) / 360.0
+    y = 0.5 - np.log((1 + sin) / (1 - sin)) / (4 * np.pi)
+    return x, y
+
+
+def _unproject(x, y):
+    lons = x * 360.0 - 180.0
+    lats = np.degrees(2 * np.arctan(np.exp((0.5 - y) * 2 * np.pi)) - np.pi / 2)
+    return lats, lons
+
+
+class ClusterIndex:
+    """
+    줌 레벨마다 미리 계산한 클러스터 배열 (위도, 경도, 대피소 수, 단일 대피소 행 번호)
+    한 단계 아래 줌의 클러스터를 다시 묶어 만들기 때문에 계층 구조가 유지됨
+    """
+
+    def __init__(self, lats, lons):
+        x, y = _project(lats, lons)
+        ids = np.arange(len(x))
+        count = np.ones(len(x), dtype=np.int64)
+
+        self.levels = {MAX_ZOOM + 1: self._level(x, y, count, ids)}
+        for zoom in range(MAX_ZOOM, MIN_ZOOM - 1, -1):
+            x, y, count, ids = self._merge(x, y, count, ids, zoom)
+            self.levels[zoom] = self._level(x, y, count, ids)
+
+    @staticmethod
+    def _level(x, y, count, ids):
+        lats, lons = _unproject(x, y)
+        return {"x": x, "y": y, "lat": lats, "lon": lons, "count": count, "id": ids}
+
+    @staticmethod
+    def _merge(x, y, count, ids, zoom):
+        """반경(픽셀) 크기 격자 칸에 들어온 항목을 대피소 수로 가중한 중심 하나로 합침"""
+        if len(x) == 0:
+            return x, y, count, ids
+        cell = CLUSTER_RADIUS_PX / (TILE_SIZE * 2 ** zoom)
+        cells_per_row = int(math.ceil(1 / cell)) + 1
+        keys = np.floor(y / cell).astype(np.int64) * cells_per_row + np.floor(x / cell).astype(np.int64)
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+
+        total = np.bincount(inverse, weights=count)
+        merged_x = np.bincount(inverse, weights=x * count) / total
+        merged_y = np.bincount(inverse, weights=y * count) / total
+        members = np.bincount(inverse)
+        # 항목 하나만 들어온 칸은 원래 항목(대피소 또는 클러스터)을 그대로 이어받음
+        merged_ids = np.where(members == 1, ids[first], -1)
+        return merged_x, merged_y, total.astype(np.int64), merged_ids
+
+    def query(self, south, west, north, east, zoom):
+        """
+        화면 범위(위경도)와 줌에 보이는 클러스터만 반환
+        반환 개수는 전체 대피소 수가 아니라 화면 크기 / 클러스터 반경에 비례
+        """
+        zoom = min(max(int(zoom), MIN_ZOOM), MAX_ZOOM + 1)
+        level = self.levels[zoom]
+
+        min_x, min_y = _project(north, west)
+        max_x, max_y = _project(south, east)
+        pad_x, pad_y = (max_x - min_x) * VIEW_PADDING, (max_y - min_y) * VIEW_PADDING
+        visible = (
+            (level["x"] >= min_x - pad_x) & (level["x"] <= max_x + pad_x)
+            & (level["y"] >= min_y - pad_y) & (level["y"] <= max_y + pad_y)
+        )
+        return {name: level[name][visible] for name in ("lat", "lon", "count", "id")}
+
+
+# ✅ 2. 데이터셋 버전당 한 번만 클러스터 계산
+def get_index(lats, lons):
+    """위도/경도 배열에 대한 ClusterIndex (데이터셋 버전별로 캐싱)"""
+    version = dataset_version(lats, lons)
+    index = _indexes.get(version)
+    if index is None:
+        with _lock:
+            index = _indexes.get(version)
+            if index is None:
+                index = ClusterIndex(lats, lons)
+                _indexes.clear()  # 최신 버전 하나만 유지
+                _indexes[version] = index
+    return index
+
+
+def view_bounds(center, zoom, width, height):
+    """지도 중심과 줌, 크기(픽셀)로 계산한 화면 범위 (south, west, north, east)"""
+    x, y = _project(center[0], center[1])
+    world = TILE_SIZE * 2 ** zoom
+    half_w, half_h = width / 2 / world, height / 2 / world
+    north, west = _unproject(x - half_w, y - half_h)
+    south, east = _unproject(x + half_w, y + half_h)
+    return float(south), float(west), float(north), float(east)
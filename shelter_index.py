@@ -0,0 +1,88 @@
+import hashlib
+import threading
+
+import numpy as np
+from sklearn.neighbors import BallTree
+
+from geodist import EARTH_RADIUS_KM, geodesic_km
+
+# 구면(haversine) 거리와 타원체(geodesic) 거리의 최대 상대 오차 (여유 포함)
+SPHERE_ERROR = 0.006
+
+_indexes = {}
+_lock = threading.Lock()
+
+
+def dataset_version(lats, lons):
+    """대피소 좌표 배열의 해시 (데이터가 바뀌면 인덱스를 다시 생성)"""
+    digest = hashlib.sha1()
+    digest.update(np.ascontiguousarray(lats, dtype=np.float64).tobytes())
+    digest.update(np.ascontiguousarray(lons, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+# ✅ 1. 데이터셋 버전당 한 번만 인덱스 생성
+def get_index(lats, lons):
+    """위도/경도 배열에 대한 haversine BallTree (데이터셋 버전별로 캐싱)"""
+    version = dataset_version(lats, lons)
+    tree = _indexes.get(version)
+    if tree is None:
+        with _lock:
+            tree = _indexes.get(version)
+            if tree is None:
+                points = np.radians(np.column_stack([lats, lons]))
+                tree = BallTree(points, metric="haversine")
+                _indexes.clear()  # 최신 버전 하나만 유지
+                _indexes[version] = tree
+    return tree
+
+
+# ✅ 2. 가장 가까운 k개 대피소
+def nearest(df, lat, lon, k=10, lat_col="latitude", lon_col="longitude"):
+    """
+    (lat, lon)에서 가장 가까운 k개 대피소를 "거리"(km, geodesic) 컬럼과 함께 반환
+    인덱스로 후보만 고른 뒤 후보에 대해서만 정확한 geodesic 거리를 계산
+    """
+    n = len(df)
+    if n == 0:
+        return df.assign(거리=np.empty(0))
+
+    lats = df[lat_col].to_numpy(dtype=np.float64)
+    lons = df[lon_col].to_numpy(dtype=np.float64)
+    tree = get_index(lats, lons)
+    query = np.radians([[lat, lon]])
+
+    n_candidates = min(n, max(2 * k, k + 16))
+    while True:
+        sphere_dist, positions = tree.query(query, k=n_candidates)
+        positions = np.sort(positions[0])  # 동일 거리일 때 원래 행 순서 유지
+        distances = geodesic_km(lat, lon, lats[positions], lons[positions])
+
+        # 후보 밖의 대피소는 구면 거리 기준으로 최소 이만큼 떨어져 있음
+        outside_bound = sphere_dist[0].max() * EARTH_RADIUS_KM * (1 - SPHERE_ERROR)
+        kth = np.sort(distances)[min(k, n_candidates) - 1]
+        if n_candidates == n or kth <= outside_bound:
+            break
+        n_candidates = min(n, n_candidates * 2)
+
+    candidates = df.iloc[positions].assign(거리=distances)
+    return candidates.nsmallest(k, "거리")
+
+
+# ✅ 3. 반경 내 대피소
+def within_radius(df, lat, lon, radius_km, lat_col="latitude", lon_col="longitude"):
+    """(lat, lon)에서 radius_km 이내 대피소를 거리순으로 반환"""
+    if len(df) == 0:
+        return df.assign(거리=np.empty(0))
+
+    lats = df[lat_col].to_numpy(dtype=np.float64)
+    lons = df[lon_col].to_numpy(dtype=np.float64)
+    tree = get_index(lats, lons)
+
+    # 구면 오차만큼 넉넉하게 후보를 고른 뒤 정확한 거리로 다시 거름
+    radius = radius_km / EARTH_RADIUS_KM / (1 - SPHERE_ERROR)
+    positions = np.sort(tree.query_radius(np.radians([[lat, lon]]), r=radius)[0])
+    distances = geodesic_km(lat, lon, lats[positions], lons[positions])
+
+    result = df.iloc[positions].assign(거리=distances)
+    return result[result["거리"] <= radius_km].sort_values("거리", kind="stable")
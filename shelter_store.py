@@ -0,0 +1,193 @@
+import math
+import os
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import requests
+
+# ✅ 대피소 스냅샷 파일 / 갱신 주기
+SHELTER_SNAPSHOT_PATH = os.environ.get("SHELTER_SNAPSHOT_PATH", "shelters_snapshot.csv.gz")
+SNAPSHOT_TTL = 24 * 3600
+# 백그라운드 갱신 재시도 최소 간격 (실패해도 요청마다 API를 다시 부르지 않도록)
+REFRESH_RETRY_INTERVAL = int(os.environ.get("SHELTER_REFRESH_RETRY_INTERVAL", 10 * 60))
+
+ROWS_PER_PAGE = 1000
+MAX_WORKERS = 4
+REQUEST_TIMEOUT = 10
+
+SHELTER_COLUMNS = ["쉘터이름", "주소", "latitude", "longitude", "source"]
+
+_snapshot = None
+_snapshot_mtime = None
+_refresh_thread = None
+_last_attempt = None
+_last_error = None
+_lock = threading.Lock()
+
+
+class ShelterAPIError(Exception):
+    """safetydata API가 오류 코드를 반환한 경우"""
+
+
+# ✅ 1. 페이지 단위 요청
+def _fetch_page(session, api_url, api_key, page_no, num_of_rows=ROWS_PER_PAGE):
+    """한 페이지를 요청하여 (전체 건수, 대피소 목록)을 반환"""
+    params = {
+        "serviceKey": urllib.parse.quote(api_key),
+        "returnType": "json",
+        "pageNo": str(page_no),
+        "numOfRows": str(num_of_rows),
+    }
+    response = session.get(api_url, params=params, timeout=REQUEST_TIMEOUT, verify=False)
+    response.raise_for_status()
+    data = response.json()
+
+    header = data.get("header", {})
+    if header.get("resultCode") != "00":
+        raise ShelterAPIError(header.get("resultMsg") or header.get("errorMsg") or "알 수 없는 오류")
+
+    total = data.get("totalCount", header.get("totalCount"))
+    return int(total) if total is not None else None, data.get("body") or []
+
+
+def fetch_source(api_url, api_key, num_of_rows=ROWS_PER_PAGE, max_workers=MAX_WORKERS, session=None):
+    """
+    첫 페이지로 전체 건수를 확인한 뒤 나머지 페이지를 제한된 워커 풀로 동시에 요청
+    """
+    session = session or requests.Session()
+    total, rows = _fetch_page(session, api_url, api_key, 1, num_of_rows)
+
+    if total is None:
+        # 전체 건수를 알려주지 않으면 빈 페이지가 나올 때까지 순서대로 요청
+        page_no = 2
+        page = rows
+        while len(page) == num_of_rows:
+            _, page = _fetch_page(session, api_url, api_key, page_no, num_of_rows)
+            rows = rows + page
+            page_no += 1
+        return rows
+
+    n_pages = math.ceil(total / num_of_rows)
+    if n_pages > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            pages = pool.map(
+                lambda page_no: _fetch_page(session, api_url, api_key, page_no, num_of_rows)[1],
+                range(2, n_pages + 1),
+            )
+            for page in pages:
+                rows = rows + page
+    return rows
+
+
+# ✅ 2. 두 API 데이터를 하나의 대피소 테이블로 정리
+def normalize(rows, source):
+    """원본 API 레코드를 (쉘터이름, 주소, latitude, longitude, source) 테이블로 변환"""
+    df = pd.DataFrame(rows)
+    if df.empty:
+        return pd.DataFrame(columns=SHELTER_COLUMNS)
+
+    for column in ["LAT", "LOT", "SHLT_NM", "RONA_DADDR", "ADDR"]:
+        if column not in df.columns:
+            df[column] = None
+
+    table = pd.DataFrame({
+        # 대피소 이름이 없는 경우 '주소를 참고하세요'로 대체
+        "쉘터이름": df["SHLT_NM"].fillna("주소를 참고하세요").astype(str),
+        # 도로명 주소(RONA_DADDR)를 우선 사용하고, 없으면 지번 주소(ADDR) 사용
+        "주소": df["RONA_DADDR"].fillna(df["ADDR"]).fillna("주소 없음"),
+        "latitude": pd.to_numeric(df["LAT"], errors="coerce"),
+        "longitude": pd.to_numeric(df["LOT"], errors="coerce"),
+        "source": source,
+    })
+    return table.dropna(subset=["latitude", "longitude"])
+
+
+def load_all(sources, max_workers=MAX_WORKERS):
+    """모든 API에서 대피소를 받아 하나의 테이블로 합침 (소스 간 중복 제거)"""
+    session = requests.Session()
+    with ThreadPoolExecutor(max_workers=len(sources)) as pool:
+        futures = {
+            name: pool.submit(fetch_source, url, key, max_workers=max_workers, session=session)
+            for name, (url, key) in sources.items()
+        }
+        tables = [normalize(future.result(), name) for name, future in futures.items()]
+
+    df = pd.concat(tables, ignore_index=True)
+    return df.drop_duplicates(subset=["쉘터이름", "latitude", "longitude"]).reset_index(drop=True)
+
+
+# ✅ 3. 디스크 스냅샷 + 백그라운드 갱신
+def _save_snapshot(df, path):
+    tmp_path = path + ".tmp"
+    df.to_csv(tmp_path, index=False, compression="gzip")
+    os.replace(tmp_path, path)
+
+
+def _read_snapshot(path):
+    global _snapshot, _snapshot_mtime
+    mtime = os.path.getmtime(path)
+    if _snapshot is None or _snapshot_mtime != mtime:
+        _snapshot = pd.read_csv(path, compression="gzip")
+        _snapshot_mtime = mtime
+    return _snapshot
+
+
+def refresh(sources, path=None):
+    """API에서 전체 대피소를 다시 받아 스냅샷 저장"""
+    global _last_error
+    path = path or SHELTER_SNAPSHOT_PATH
+    df = load_all(sources)
+    if df.empty:
+        raise ShelterAPIError("대피소 데이터가 비어 있습니다.")
+    _save_snapshot(df, path)
+    _last_error = None
+    return df
+
+
+def _refresh_in_background(sources, path, retry_interval=REFRESH_RETRY_INTERVAL):
+    global _refresh_thread, _last_attempt
+
+    def run():
+        global _last_error
+        try:
+            refresh(sources, path)
+        except Exception as e:  # 백그라운드 갱신 실패 시 기존 스냅샷을 계속 사용
+            _last_error = e
+
+    with _lock:
+        if _refresh_thread is not None and _refresh_thread.is_alive():
+            return
+        # 마지막 시도 후 retry_interval이 지나기 전에는 다시 시도하지 않음 (성공·실패 무관)
+        now = time.monotonic()
+        if _last_attempt is not None and now - _last_attempt < retry_interval:
+            return
+        _last_attempt = now
+        _refresh_thread = threading.Thread(target=run, name="shelter-refresh", daemon=True)
+        _refresh_thread.start()
+
+
+def get_shelters(sources, ttl=SNAPSHOT_TTL, path=None):
+    """
+    대피소 테이블 반환
+    - 스냅샷이 있으면 즉시 반환하고, TTL이 지났으면 백그라운드에서 갱신
+    - 스냅샷이 없으면 API에서 받아 저장 (실패 시 예외 전달)
+    """
+    path = path or SHELTER_SNAPSHOT_PATH
+    if os.path.exists(path):
+        if time.time() - os.path.getmtime(path) > ttl:
+            _refresh_in_background(sources, path)
+        return _read_snapshot(path)
+
+    with _lock:
+        if os.path.exists(path):
+            return _read_snapshot(path)
+        refresh(sources, path)
+        return _read_snapshot(path)
+
+
+def get_last_error():
+    """마지막 백그라운드 갱신 오류 (없으면 None)"""
+    return _last_error
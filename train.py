@@ -0,0 +1,204 @@
+import argparse
+import json
+import os
+import shutil
+import time
+from datetime import datetime, timedelta, timezone
+
+import joblib
+import numpy as np
+import pandas as pd
+import requests
+import sklearn
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score, f1_score, roc_auc_score
+from sklearn.model_selection import GridSearchCV, StratifiedKFold, train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+import model_registry
+from predictor import FEATURE_COLUMNS
+
+# ✅ 학습 설정 (map.ipynb의 최종 모델과 같은 기준: 규모 4.5 이상 = 1)
+LABEL_MAGNITUDE = 4.5
+# 이벤트 저장소에서 학습할 때 (노트북 내보내기와 같은 기준: 규모 3.5 이상 최신 10000개)
+EVENTS_MIN_MAGNITUDE = 3.5
+EVENTS_LIMIT = 10000
+SEED = 42
+TEST_SIZE = 0.2
+CV_FOLDS = 5
+TRAIN_CACHE_DIR = os.environ.get("TRAIN_CACHE_DIR", ".train_cache")
+
+# 노트북 최종 모델 (RandomForestClassifier(n_estimators=100, random_state=42))
+DEFAULT_PARAMS = {"n_estimators": 100, "max_depth": None, "min_samples_leaf": 1}
+PARAM_GRID = {
+    "n_estimators": [100, 200],
+    "max_depth": [None, 12, 24],
+    "min_samples_leaf": [1, 3],
+}
+
+_memory = joblib.Memory(TRAIN_CACHE_DIR, verbose=0)
+
+
+# ✅ 1. 학습 데이터
+def load_events(source="csv", csv_path="global_earthquakes.csv"):
+    """global_earthquakes.csv 또는 로컬 이벤트 저장소에서 (lat, lon, depth, magnitude)"""
+    if source == "csv":
+        df = pd.read_csv(csv_path)
+    else:
+        import event_store
+
+        # 앱은 규모 4.5 이상만 동기화하므로 학습 기준(3.5)까지 저장소를 넓힌 뒤 조회 (라벨 0 확보)
+        start = datetime.now(timezone.utc) - timedelta(days=event_store.USGS_DEFAULT_DAYS)
+        event_store.sync(start, EVENTS_MIN_MAGNITUDE)
+        df = event_store.query(min_magnitude=EVENTS_MIN_MAGNITUDE, limit=EVENTS_LIMIT,
+                               columns=("magnitude", "lat", "lon", "depth"))
+    return df.dropna(subset=FEATURE_COLUMNS + ["magnitude"]).reset_index(drop=True)
+
+
+def dataset_hash(X, y):
+    """특징·라벨 배열의 해시 (같은 데이터로 학습했는지 확인)"""
+    return joblib.hash((np.ascontiguousarray(X, dtype=np.float64), np.ascontiguousarray(y)))
+
+
+# ✅ 2. 균형 맞추기 (소수 클래스를 복원 추출해 다수 클래스 개수에 맞춤)
+def oversample(indices, y, seed=SEED):
+    """indices 중 클래스별 개수를 가장 많은 클래스에 맞춘 (중복 포함) 행 번호"""
+    rng = np.random.default_rng(seed)
+    labels = y[indices]
+    classes, counts = np.unique(labels, return_counts=True)
+    parts = [indices]
+    for label, count in zip(classes, counts):
+        if count < counts.max():
+            parts.append(rng.choice(indices[labels == label], size=counts.max() - count, replace=True))
+    return np.sort(np.concatenate(parts))
+
+
+def _make_folds(y, n_splits, seed):
+    skf = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=seed)
+    return [(oversample(train, y, seed + i), test)
+            for i, (train, test) in enumerate(skf.split(np.zeros(len(y)), y))]
+
+
+# 같은 라벨 배열 / 폴드 수 / 시드면 디스크에 저장된 폴드를 재사용
+make_folds = _memory.cache(_make_folds)
+
+
+# ✅ 3. 교차 검증 하이퍼파라미터 탐색 + 최종 학습
+def _pipeline(seed, **params):
+    return Pipeline([
+        ("scaler", StandardScaler()),
+        ("model", RandomForestClassifier(random_state=seed, **params)),
+    ])
+
+
+def train(df, search=True, n_jobs=-1, cv=CV_FOLDS, seed=SEED):
+    """
+    검증용 데이터를 먼저 떼어 둔 뒤(중복 추출된 행이 검증에 섞이지 않도록)
+    학습 데이터의 각 폴드 안에서만 오버샘플링해 교차 검증하고,
+    가장 좋은 설정으로 전체 학습 데이터를 다시 학습
+    """
+    X = df[FEATURE_COLUMNS]
+    y = (df["magnitude"] >= LABEL_MAGNITUDE).astype(int).to_numpy()
+    classes, counts = np.unique(y, return_counts=True)
+    min_count = max(cv if search else 1, 2)
+    if classes.size < 2 or counts.min() < min_count / (1 - TEST_SIZE):
+        n_small, n_large = int((y == 0).sum()), int((y == 1).sum())
+        raise ValueError(
+            f"규모 {LABEL_MAGNITUDE} 미만({n_small}개)과 이상({n_large}개) 이벤트가 모두 충분히 있어야 학습할 수 있습니다. "
+            f"규모 {EVENTS_MIN_MAGNITUDE} 이상 이벤트가 담긴 데이터를 사용하세요."
+        )
+
+    train_idx, test_idx = train_test_split(np.arange(len(y)), test_size=TEST_SIZE, random_state=seed, stratify=y)
+    X_train, y_train = X.iloc[train_idx].reset_index(drop=True), y[train_idx]
+
+    params, cv_score = dict(DEFAULT_PARAMS), None
+    if search:
+        folds = make_folds(y_train, cv, seed)
+        grid = GridSearchCV(_pipeline(seed), {f"model__{k}": v for k, v in PARAM_GRID.items()},
+                            scoring="roc_auc", cv=folds, n_jobs=n_jobs, refit=False)
+        grid.fit(X_train, y_train)
+        params = {k.split("__", 1)[1]: v for k, v in grid.best_params_.items()}
+        cv_score = float(grid.best_score_)
+
+    balanced = oversample(np.arange(len(y_train)), y_train, seed)
+    pipeline = _pipeline(seed, n_jobs=n_jobs, **params)
+    pipeline.fit(X_train.iloc[balanced], y_train[balanced])
+    scaler, model = pipeline.named_steps["scaler"], pipeline.named_steps["model"]
+    model.set_params(n_jobs=None)  # 앱에서는 요청마다 단일 스레드로 예측
+
+    probs = pipeline.predict_proba(X.iloc[test_idx])[:, 1]
+    preds = (probs >= 0.5).astype(int)
+    metrics = {
+        "cv_roc_auc": round(cv_score, 4) if cv_score is not None else None,
+        "test_accuracy": round(float(accuracy_score(y[test_idx], preds)), 4),
+        "test_f1": round(float(f1_score(y[test_idx], preds)), 4),
+        "test_roc_auc": round(float(roc_auc_score(y[test_idx], probs)), 4),
+    }
+    info = {
+        "params": params,
+        "metrics": metrics,
+        "data_hash": dataset_hash(X.to_numpy(), y),
+        "n_events": int(len(y)),
+        "n_positive": int(y.sum()),
+        "seed": seed,
+        "cv_folds": cv if search else None,
+    }
+    return model, scaler, info
+
+
+# ✅ 4. 버전별 아티팩트 저장 (models/<내용 해시>/)
+def save_version(model, scaler, info, model_dir=model_registry.MODEL_DIR):
+    """
+    모델·스케일러·metrics.json을 임시 디렉터리에 쓴 뒤 내용 해시 이름으로 옮김
+    (같은 데이터·설정이면 같은 버전 이름)
+    """
+    os.makedirs(model_dir, exist_ok=True)
+    tmp_dir = os.path.join(model_dir, f".tmp-{os.getpid()}")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    artifacts = {"model": model, "scaler": scaler}
+    paths = [os.path.join(tmp_dir, os.path.basename(model_registry.ARTIFACT_PATHS[name])) for name in artifacts]
+    for path, artifact in zip(paths, artifacts.values()):
+        joblib.dump(artifact, path)
+    version = model_registry.content_hash(paths)
+
+    info = dict(info, version=version, sklearn_version=sklearn.__version__,
+                created_at=datetime.now(timezone.utc).isoformat(timespec="seconds"))
+    with open(os.path.join(tmp_dir, "metrics.json"), "w", encoding="utf-8") as f:
+        json.dump(info, f, indent=2, ensure_ascii=False)
+
+    version_dir = os.path.join(model_dir, version)
+    if os.path.isdir(version_dir):  # 이미 있는 버전 (같은 결과물)
+        shutil.rmtree(tmp_dir)
+    else:
+        os.replace(tmp_dir, version_dir)
+    return version_dir, info
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="지진 발생 확률 모델 학습 (map.ipynb 최종 모델 재현)")
+    parser.add_argument("--source", choices=["csv", "events"], default="csv", help="학습 데이터 (CSV 또는 로컬 이벤트 저장소)")
+    parser.add_argument("--csv", default="global_earthquakes.csv")
+    parser.add_argument("--no-search", action="store_true", help="탐색 없이 노트북 설정(n_estimators=100)으로 학습")
+    parser.add_argument("--cv", type=int, default=CV_FOLDS)
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--activate", action="store_true", help="학습한 버전을 앱에서 바로 사용 (models/active.json)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        events = load_events(args.source, args.csv)
+        model, scaler, info = train(events, search=not args.no_search, n_jobs=args.n_jobs, cv=args.cv, seed=args.seed)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        parser.error(str(e))
+    info.update(source=args.source if args.source == "events" else args.csv,
+                train_seconds=round(time.perf_counter() - start, 2))
+
+    version_dir, info = save_version(model, scaler, info)
+    if args.activate:
+        model_registry.activate(version_dir)
+    print(json.dumps(info, indent=2, ensure_ascii=False))
+    print(f"저장: {version_dir}" + (" (사용 버전으로 지정)" if args.activate else ""))
@@ -0,0 +1,159 @@
+import codecs
+import json
+from array import array
+
+import numpy as np
+import pandas as pd
+import requests
+
+USGS_URL = "https://earthquake.usgs.gov/fdsnws/event/1/query"
+
+# FDSN 서비스가 한 번에 허용하는 최대 건수
+PAGE_SIZE = 20000
+CHUNK_BYTES = 64 * 1024
+
+_decoder = json.JSONDecoder()
+
+
+# ✅ 1. GeoJSON 응답을 feature 단위로 스트리밍 파싱
+def iter_features(chunks):
+    """
+    바이트 청크를 받아 "features" 배열의 각 feature를 하나씩 반환
+    (응답 전체를 메모리에 올리지 않고 청크 버퍼만 유지)
+    """
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buffer = ""
+    pos = 0
+    in_features = False
+    eof = False
+
+    def read_more():
+        nonlocal buffer, pos, eof
+        chunk = next(chunks, None)
+        if chunk is None:
+            eof = True
+            buffer = buffer[pos:] + text_decoder.decode(b"", final=True)
+        else:
+            buffer = buffer[pos:] + text_decoder.decode(chunk)
+        pos = 0
+
+    while True:
+        if not in_features:
+            start = buffer.find('"features"', pos)
+            bracket = buffer.find("[", start) if start != -1 else -1
+            if bracket == -1:
+                if eof:
+                    return
+                # 키가 청크 경계에 걸릴 수 있으므로 끝부분은 남겨둠
+                pos = start if start != -1 else max(pos, len(buffer) - 16)
+                read_more()
+                continue
+            pos = bracket + 1
+            in_features = True
+
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= len(buffer):
+            if eof:
+                raise ValueError("USGS 응답이 features 배열 도중에 끝났습니다.")
+            read_more()
+            continue
+        if buffer[pos] == "]":
+            return
+
+        try:
+            feature, end = _decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            read_more()
+            continue
+        pos = end
+        yield feature
+
+
+# ✅ 2. 타입이 고정된 컬럼 배열에 바로 추가
+class _Columns:
+    def __init__(self, with_ids, float_code="f"):
+        self.with_ids = with_ids
+        self.float_dtype = np.float32 if float_code == "f" else np.float64
+        self.time = array("q")
+        self.magnitude = array(float_code)
+        self.lat = array(float_code)
+        self.lon = array(float_code)
+        self.depth = array(float_code)
+        if with_ids:
+            self.id = []
+            self.updated = array("q")
+            self.place = []
+
+    def append(self, feature):
+        properties = feature["properties"]
+        coordinates = feature["geometry"]["coordinates"]
+        mag = properties.get("mag")
+        depth = coordinates[2] if len(coordinates) > 2 else None
+
+        self.time.append(properties["time"])
+        self.magnitude.append(np.nan if mag is None else mag)
+        self.lat.append(coordinates[1])
+        self.lon.append(coordinates[0])
+        self.depth.append(np.nan if depth is None else depth)
+        if self.with_ids:
+            self.id.append(feature["id"])
+            self.updated.append(properties.get("updated") or properties["time"])
+            self.place.append(properties.get("place"))
+
+    def __len__(self):
+        return len(self.time)
+
+    def to_frame(self):
+        data = {
+            "time": np.frombuffer(self.time, dtype=np.int64),
+            "magnitude": np.frombuffer(self.magnitude, dtype=self.float_dtype),
+            "lat": np.frombuffer(self.lat, dtype=self.float_dtype),
+            "lon": np.frombuffer(self.lon, dtype=self.float_dtype),
+            "depth": np.frombuffer(self.depth, dtype=self.float_dtype),
+        }
+        if self.with_ids:
+            data = {
+                "id": self.id,
+                "time": data["time"],
+                "updated": np.frombuffer(self.updated, dtype=np.int64),
+                "magnitude": data["magnitude"],
+                "place": self.place,
+                "lat": data["lat"],
+                "lon": data["lon"],
+                "depth": data["depth"],
+            }
+        return pd.DataFrame(data)
+
+
+# ✅ 3. offset / limit 페이지 단위로 전체 결과 수집
+def fetch_earthquakes(params, with_ids=False, float_code="f", page_size=PAGE_SIZE, max_events=None,
+                      timeout=15, session=None):
+    """
+    USGS FDSN 쿼리 결과를 페이지 단위로 스트리밍하여 DataFrame으로 반환
+    기본 컬럼: time(int64), magnitude / lat / lon / depth(float32, float_code="d"이면 float64)
+    with_ids=True이면 id, updated, place 컬럼을 함께 반환
+    """
+    http = session or requests
+    columns = _Columns(with_ids, float_code)
+    offset = 1  # FDSN offset은 1부터 시작
+
+    while max_events is None or len(columns) < max_events:
+        limit = page_size if max_events is None else min(page_size, max_events - len(columns))
+        query = {**params, "format": "geojson", "offset": offset, "limit": limit}
+
+        with http.get(USGS_URL, params=query, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            count = 0
+            for feature in iter_features(response.iter_content(chunk_size=CHUNK_BYTES)):
+                columns.append(feature)
+                count += 1
+
+        if count < limit:
+            break
+        offset += count
+
+    return columns.to_frame()